@@ -20,6 +20,7 @@ const OrderFoodModal: FC<OrderFoodModalProps> = ({ bookingId, isOpen, onClose })
     const [paymentScreenshot, setPaymentScreenshot] = useState<File | null>(null);
     const [paymentPreview, setPaymentPreview] = useState<string | null>(null);
     const fileInputRef = useRef<HTMLInputElement>(null);
+    const orderKeyRef = useRef<string>("");
 
     const { data: foodData, isLoading, isError } = useQuery({
         queryKey: ["craveOnFoods"],
@@ -27,11 +28,11 @@ const OrderFoodModal: FC<OrderFoodModalProps> = ({ bookingId, isOpen, onClose })
     });
 
     const placeOrderMutation = useMutation({
-        mutationFn: (orderData: { booking_id: number; items: any; payment_ss?: File }) => {
+        mutationFn: (orderData: { booking_id: number; items: any; payment_ss?: File; idempotency_key?: string }) => {
             return placeFoodOrder(orderData);
         },
         onSuccess: (response) => {
-            if (response.success && response.user_id && response.order_id) {
+            if (response.success && response.order_reference) {
                 toast.success(response.message || "Food order placed successfully!");
                 setCart([]);
                 setShowPaymentSection(false);
@@ -61,6 +62,7 @@ const OrderFoodModal: FC<OrderFoodModalProps> = ({ bookingId, isOpen, onClose })
             toast.error("Please upload a payment screenshot.");
             return;
         }
+        orderKeyRef.current = crypto.randomUUID();
         setShowFinalConfirmModal(true);
     };
 
@@ -78,7 +80,8 @@ const OrderFoodModal: FC<OrderFoodModalProps> = ({ bookingId, isOpen, onClose })
         const orderPayload = {
             booking_id: bookingId!,
             items: orderItems,
-            payment_ss: paymentScreenshot
+            payment_ss: paymentScreenshot,
+            idempotency_key: orderKeyRef.current
         };
 
         placeOrderMutation.mutate(orderPayload);
@@ -117,7 +120,6 @@ const OrderFoodModal: FC<OrderFoodModalProps> = ({ bookingId, isOpen, onClose })
             name: item.name,
             price: item.price,
             image: item.image,
-            image_mime: item.image_mime,
             category_id: item.category_id,
             category_name: item.category_name,
             quantity: item.quantity
@@ -350,7 +352,7 @@ const OrderFoodModal: FC<OrderFoodModalProps> = ({ bookingId, isOpen, onClose })
                                                             >
                                                                 <div className="relative">
                                                                     <img
-                                                                        src={`data:${item.image_mime};base64,${item.image}`}
+                                                                        src={item.image}
                                                                         alt={item.name}
                                                                         className="w-full h-36 object-cover"
                                                                     />
@@ -54,11 +54,6 @@ const AdminSidebar: FC<AdminSidebarProps> = ({ collapsed, setCollapsed }) => {
         }
       }
     },
-    bookings_data_update: (data: WebSocketEvent) => {
-      if (data.type === "bookings_data_update") {
-        setActiveBookingCount(data.count);
-      }
-    },
   });
 
   const requestActiveCount = useCallback(() => {
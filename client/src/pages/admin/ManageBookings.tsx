@@ -41,17 +41,28 @@ const ManageBookings: FC = () => {
   useWebSockets(webSocketAdminActives, userDetails?.id, {
     bookings_data_update: (data: WebSocketEvent) => {
       if (data.type === "bookings_data_update") {
-        queryClient.setQueryData(['adminBookings', currentPage, pageSize], (oldData: BookingQuery | undefined) => ({
-          ...oldData!,
-          data: data.bookings,
-          pagination: {
-            ...oldData?.pagination,
-            total_items: data.count,
-            total_pages: Math.ceil(data.count / pageSize),
-          }
+        // New or removed bookings and status moves under a filter change which rows
+        // belong on a page, so those refetch; everything else is patched in place
+        const reshapesPages = data.changes.some((change) =>
+          change.op === "created" || change.op === "deleted" || (change.op === "status_changed" && statusFilter !== "all")
+        );
+        if (reshapesPages) {
+          queryClient.invalidateQueries({ queryKey: ["adminBookings"] });
+          return;
+        }
+        const patches = new Map<number, Record<string, any>>();
+        data.changes.forEach((change) => {
+          patches.set(change.booking_id, { ...patches.get(change.booking_id), ...change.fields });
+        });
+        queryClient.setQueriesData<BookingQuery>({ queryKey: ["adminBookings"] }, (oldData) => oldData && ({
+          ...oldData,
+          data: oldData.data.map((booking) => patches.has(booking.id) ? { ...booking, ...patches.get(booking.id) } : booking),
         }));
       }
-    }
+    },
+    resync_required: () => {
+      queryClient.invalidateQueries({ queryKey: ["adminBookings"] });
+    },
   })
 
   const updateBookingStatusMutation = useMutation({
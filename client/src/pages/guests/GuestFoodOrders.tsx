@@ -312,7 +312,7 @@ const GuestFoodOrders = () => {
                                                         <div className="flex items-center gap-2 flex-1 min-w-0">
                                                             {item.image && item.image.trim() !== '' ? (
                                                                 <img
-                                                                    src={`data:${item.image_mime};base64,${item.image}`}
+                                                                    src={item.image}
                                                                     alt={item.name}
                                                                     className="w-8 h-8 rounded object-cover flex-shrink-0"
                                                                     onError={(e) => {
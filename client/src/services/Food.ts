@@ -39,6 +39,7 @@ export const placeFoodOrder = async (
       {
         headers: {
           "Content-Type": "multipart/form-data",
+          ...(orderData.idempotency_key && { "Idempotency-Key": orderData.idempotency_key }),
         },
         withCredentials: true,
       }
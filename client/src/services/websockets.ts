@@ -8,6 +8,13 @@ export interface NotificationMessage {
   booking_id?: string;
 }
 
+export interface BookingChange {
+  seq: number;
+  op: "created" | "updated" | "status_changed" | "deleted";
+  booking_id: number;
+  fields: Record<string, any>;
+}
+
 export type WebSocketEvent =
   | { type: "initial_count"; count: number }
   | { type: "unread_update"; count: number }
@@ -15,7 +22,9 @@ export type WebSocketEvent =
   | { type: "auth_response"; success: boolean; message?: string }
   | { type: "active_count"; count: number }
   | { type: "initial_data"; count: number; bookings: any[] }
-  | { type: "bookings_data_update"; count: number; bookings: any[] }
+  | { type: "bookings_data_update"; changes: BookingChange[]; last_seq: number }
+  | { type: "stream_position"; last_seq: number }
+  | { type: "resync_required"; last_seq: number }
   | { type: "active_count_update"; count: number }
   | { type: "connection_test"; message: string };
 
@@ -31,6 +40,11 @@ export class WebSocketService {
   private connecting: boolean = false;
   private reconnectTimer?: NodeJS.Timeout;
   private lastConnectTime: number = 0;
+  private lastSeq: number = 0;
+  // Booking changes already delivered. A change can commit after one with a higher
+  // seq, so resuming replays a short lookback before lastSeq and this skips repeats
+  private seenSeqs: Set<number> = new Set();
+  private static readonly SEEN_SEQS_LIMIT = 2000;
 
   constructor(public socketPath: string) {
     this.reconnect = this.reconnect.bind(this);
@@ -81,12 +95,33 @@ export class WebSocketService {
     this.retries = 0;
     this.startHeartbeat();
     this.send({ type: "authenticate", userId: this.currentUserId });
+    // Replay the booking changes missed while disconnected
+    if (this.lastSeq > 0) this.send({ type: "resume", since: this.lastSeq });
+  }
+
+  private trackSequence(data: WebSocketEvent): WebSocketEvent | null {
+    if (data.type === "bookings_data_update") {
+      const changes = data.changes.filter((change) => !this.seenSeqs.has(change.seq));
+      changes.forEach((change) => this.seenSeqs.add(change.seq));
+      while (this.seenSeqs.size > WebSocketService.SEEN_SEQS_LIMIT) {
+        this.seenSeqs.delete(this.seenSeqs.values().next().value as number);
+      }
+      this.lastSeq = Math.max(this.lastSeq, data.last_seq);
+      return changes.length ? { ...data, changes } : null;
+    }
+    if (data.type === "resync_required") {
+      this.seenSeqs.clear();
+      this.lastSeq = data.last_seq;
+    } else if (data.type === "stream_position" && this.lastSeq === 0) {
+      this.lastSeq = data.last_seq;
+    }
+    return data;
   }
 
   private handleMessage(event: MessageEvent) {
     try {
-      const data: WebSocketEvent = JSON.parse(event.data);
-      this.triggerEvent(data.type, data);
+      const data = this.trackSequence(JSON.parse(event.data));
+      if (data) this.triggerEvent(data.type, data);
     } catch (error) {
       console.error(`WebSocket: Message parsing error: ${error}`);
     }
@@ -190,6 +225,8 @@ export class WebSocketService {
     this.callbacks.clear();
     this.connecting = false;
     this.retries = 0;
+    this.lastSeq = 0;
+    this.seenSeqs.clear();
   }
 
   getCurrentUserId(): string {
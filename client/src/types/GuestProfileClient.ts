@@ -3,7 +3,7 @@ export interface FoodItem {
   name: string;
   price: number;
   image: string;
-  image_mime: string;
+  image_full?: string;
   quantity: number;
   category_id: number;
   category_name: string;
@@ -13,6 +13,7 @@ export interface PlaceFoodOrderData {
   booking_id: number;
   items: FoodItem[];
   payment_ss?: File;
+  idempotency_key?: string;
 }
 
 export interface FoodOrder {
@@ -36,8 +37,8 @@ export interface FoodOrder {
 export interface PlaceFoodOrderResponse {
   message: string;
   success: boolean;
-  user_id: number;
-  order_id: number;
+  order_reference: string;
+  order_id: number | null;
   total_amount: number;
   hotel_booking_info: {
     hotel_booking_id: number;
@@ -49,8 +50,7 @@ export interface PlaceFoodOrderResponse {
     check_out_date: string;
   };
   craveon_order_info: {
-    craveon_user_id: number;
-    craveon_order_id: number;
+    craveon_order_id: number | null;
     items_count: number;
     status: string;
   };
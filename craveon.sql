@@ -54,9 +54,12 @@ CREATE TABLE orders(
 	hotel_room_area VARCHAR(100) NULL,
 	guest_email VARCHAR(100) NULL,
 	guest_name VARCHAR(100) NULL,
+	idempotency_key VARCHAR(64) NULL UNIQUE,
     FOREIGN KEY (user_id) REFERENCES users(user_id)
 );
 
+CREATE INDEX orders_booking_ordered_idx ON orders (booking_id, ordered_at);
+
 CREATE TABLE order_items(
     order_item_id INT AUTO_INCREMENT PRIMARY KEY,
 	order_id INT ,
@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+from booking.models import Bookings
+from booking.rows import STREAMED_FIELDS, booking_row, booking_delta
+from .models import BookingChange
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ['pending', 'reserved', 'checked_in']
+
+def _stream_config():
+    config = getattr(settings, 'BOOKING_CHANGE_STREAM', {})
+    return {
+        'WINDOW_SECONDS': config.get('WINDOW_SECONDS', 0.1),
+        'REPLAY_LIMIT': config.get('REPLAY_LIMIT', 500),
+        'RETENTION_HOURS': config.get('RETENTION_HOURS', 24),
+        'RESUME_LOOKBACK_SECONDS': config.get('RESUME_LOOKBACK_SECONDS', 30),
+    }
+
+class CoalescedBroadcast(ABC):
+    """
+    Coalesces requests for a broadcast to the admin_notifications group.
+
+    The first request schedules a broadcast ``window()`` seconds later on a
+    background thread; requests arriving before it fires ride along with it, so
+    the broadcast runs at most once per window, however many bookings a request or
+    a bulk update touches, and never on the request thread. A process that exits
+    inside the window drops its broadcast; consumers catch up when they reconnect.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer = None
+        self.requested = 0
+        self.sent = 0
+
+    @abstractmethod
+    def window(self):
+        """Seconds between the first request and the broadcast."""
+
+    @abstractmethod
+    def broadcast(self):
+        """Send the coalesced update; runs on the timer thread."""
+
+    def request(self):
+        with self._lock:
+            self.requested += 1
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.window(), self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.broadcast()
+            self.sent += 1
+        except Exception as e:
+            logger.error(f"Error in {type(self).__name__}: {e}")
+        finally:
+            connections.close_all()
+
+    def group_send(self, message):
+        async_to_sync(get_channel_layer().group_send)('admin_notifications', message)
+
+class ActiveCountBroadcaster(CoalescedBroadcast):
+    """Pushes the active booking count, queried once per ACTIVE_COUNT_BROADCAST_SECONDS."""
+
+    def window(self):
+        return getattr(settings, 'ACTIVE_COUNT_BROADCAST_SECONDS', 0.25)
+
+    def broadcast(self):
+        count = Bookings.objects.filter(status__in=ACTIVE_STATUSES).count()
+        self.group_send({
+            'type': 'active_count_update',
+            'count': count
+        })
+
+class BookingChangeBroadcaster(CoalescedBroadcast):
+    """
+    Pushes committed booking changes as one bookings_data_update per window, and
+    prunes changes older than RETENTION_HOURS every ten minutes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._pending = []
+        self._next_prune = 0
+
+    def window(self):
+        return _stream_config()['WINDOW_SECONDS']
+
+    def add(self, change):
+        with self._lock:
+            self._pending.append(change)
+        self.request()
+
+    def broadcast(self):
+        with self._lock:
+            changes, self._pending = sorted(self._pending, key=lambda change: change['seq']), []
+        if changes:
+            self.group_send({
+                'type': 'bookings_data_update',
+                'changes': changes,
+                'last_seq': changes[-1]['seq'],
+            })
+        if time.monotonic() >= self._next_prune:
+            self._next_prune = time.monotonic() + 600
+            cutoff = timezone.now() - timedelta(hours=_stream_config()['RETENTION_HOURS'])
+            BookingChange.objects.filter(created_at__lt=cutoff).delete()
+
+active_count_broadcaster = ActiveCountBroadcaster()
+booking_change_broadcaster = BookingChangeBroadcaster()
+
+def _change_message(change):
+    return {
+        'seq': change.id,
+        'op': change.operation,
+        'booking_id': change.booking_id,
+        'fields': change.fields,
+    }
+
+def _changed(field, previous, booking):
+    model_field = Bookings._meta.get_field(field)
+    return model_field.get_prep_value(previous[field]) != model_field.get_prep_value(getattr(booking, model_field.attname))
+
+def record_booking_change(booking, created=False, previous=None, deleted=False):
+    """
+    Store the row-level change a save or delete made to ``booking`` and return it as
+    a stream message, or None when no streamed field changed. ``previous`` holds the
+    field values from before the save.
+    """
+    if deleted:
+        change = BookingChange.objects.create(booking_id=booking.id, operation='deleted')
+    elif created or previous is None:
+        change = BookingChange.objects.create(
+            booking_id=booking.id, operation='created', fields=booking_row(booking)
+        )
+    else:
+        changed = [field for field in STREAMED_FIELDS if _changed(field, previous, booking)]
+        if not changed:
+            return None
+        change = BookingChange.objects.create(
+            booking_id=booking.id,
+            operation='status_changed' if 'status' in changed else 'updated',
+            fields=booking_delta(booking, changed),
+        )
+    return _change_message(change)
+
+def stream_position():
+    """Sequence number of the latest booking change."""
+    return BookingChange.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+def booking_changes_since(since):
+    """
+    Changes after sequence number ``since``, oldest first, or None when some of them
+    are no longer retained (or there are more than REPLAY_LIMIT) and the admin screen
+    has to reload instead.
+
+    Sequence numbers are assigned when a change is written, not when it commits, so a
+    change can become visible after one with a higher number has been sent. Changes
+    written up to RESUME_LOOKBACK_SECONDS before change ``since`` are therefore sent
+    again too; clients skip the ones they already have.
+    """
+    config = _stream_config()
+    oldest = BookingChange.objects.order_by('id').values_list('id', flat=True).first()
+    if oldest is None:
+        return []
+    if oldest > since + 1:
+        return None
+    replay = Q(id__gt=since)
+    anchor = BookingChange.objects.filter(id__lte=since).order_by('-id').values_list('created_at', flat=True).first()
+    if anchor is not None:
+        replay |= Q(created_at__gte=anchor - timedelta(seconds=config['RESUME_LOOKBACK_SECONDS']))
+    limit = config['REPLAY_LIMIT']
+    changes = list(BookingChange.objects.filter(replay).order_by('id')[:limit + 1])
+    if len(changes) > limit:
+        return None
+    return [_change_message(change) for change in changes]
@@ -2,6 +2,7 @@ import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from booking.models import Bookings
+from .broadcasts import ACTIVE_STATUSES, stream_position, booking_changes_since
 
 class PendingBookingConsumer(AsyncWebsocketConsumer):
     async def connect(self):
@@ -16,16 +17,31 @@ class PendingBookingConsumer(AsyncWebsocketConsumer):
             'type': 'active_count_update',
             'count': count,
         }))
+        await self.send(text_data=json.dumps({
+            'type': 'stream_position',
+            'last_seq': await database_sync_to_async(stream_position)(),
+        }))
 
     async def bookings_data_update(self, event):
-        bookings = event['bookings']
-        count = event['count']
         await self.send(text_data=json.dumps({
             'type': 'bookings_data_update',
-            'count': count,
-            'bookings': bookings
+            'changes': event['changes'],
+            'last_seq': event['last_seq']
         }))
 
+    async def resume_booking_changes(self, since):
+        # A since the server cannot use is answered like a pruned one: reload
+        changes = None
+        if since is not None and since >= 0:
+            changes = await database_sync_to_async(booking_changes_since)(since)
+        if changes is None:
+            await self.send(text_data=json.dumps({
+                'type': 'resync_required',
+                'last_seq': await database_sync_to_async(stream_position)(),
+            }))
+        elif changes:
+            await self.bookings_data_update({'changes': changes, 'last_seq': changes[-1]['seq']})
+
     async def active_count_update(self, event):
         count = event['count']
         await self.send(text_data=json.dumps({
@@ -64,6 +80,13 @@ class PendingBookingConsumer(AsyncWebsocketConsumer):
                     'count': count,
                 }))
                 
+            elif message_type == 'resume':
+                try:
+                    since = int(text_data_json.get('since'))
+                except (TypeError, ValueError):
+                    since = None
+                await self.resume_booking_changes(since)
+                
             elif message_type == 'heartbeat':
                 pass
                 
@@ -73,8 +96,7 @@ class PendingBookingConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def get_active_count(self):
         try:
-            include_statuses = ['pending', 'reserved', 'checked_in']
-            count = Bookings.objects.filter(status__in=include_statuses).count()
+            count = Bookings.objects.filter(status__in=ACTIVE_STATUSES).count()
             return count
         except Exception as e:
             raise f"Error in the get_active_count: {e}"
\ No newline at end of file
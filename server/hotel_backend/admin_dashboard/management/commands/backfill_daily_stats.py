@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min, Max
+from django.utils import timezone
+from booking.models import Bookings, Transactions
+from admin_dashboard.stats import refresh_daily_stats, local_date
+
+class Command(BaseCommand):
+    help = 'Backfill the daily_stats table from existing bookings and transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First date to roll up (YYYY-MM-DD), defaults to the earliest booking or transaction')
+        parser.add_argument('--end', help='Last date to roll up (YYYY-MM-DD), defaults to the latest check-out or today')
+        parser.add_argument('--chunk-days', type=int, default=31, help='Number of days recomputed per batch')
+
+    def _parse(self, value):
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise CommandError(f"Invalid date '{value}'. Use YYYY-MM-DD")
+
+    def _history_bounds(self):
+        bookings = Bookings.objects.aggregate(
+            first_created=Min('created_at'),
+            first_check_in=Min('check_in_date'),
+            last_check_out=Max('check_out_date'),
+        )
+        first_transaction = Transactions.objects.aggregate(first=Min('transaction_date'))['first']
+        starts = [
+            local_date(bookings['first_created']),
+            bookings['first_check_in'],
+            local_date(first_transaction),
+        ]
+        today = timezone.localdate()
+        starts = [day for day in starts if day is not None]
+        end = max(filter(None, [bookings['last_check_out'], today]))
+        return (min(starts) if starts else today), end
+
+    def handle(self, *args, **options):
+        start, end = self._history_bounds()
+        if options['start']:
+            start = self._parse(options['start'])
+        if options['end']:
+            end = self._parse(options['end'])
+        if end < start:
+            raise CommandError("--end must be on or after --start")
+        if options['chunk_days'] <= 0:
+            raise CommandError("--chunk-days must be positive")
+
+        written = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=options['chunk_days'] - 1), end)
+            written += refresh_daily_stats(chunk_start, chunk_end)
+            chunk_start = chunk_end + timedelta(days=1)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rolled up {written} days of stats from {start} to {end}")
+        )
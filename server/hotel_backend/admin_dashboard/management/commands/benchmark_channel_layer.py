@@ -0,0 +1,118 @@
+import asyncio
+import multiprocessing
+import queue
+import statistics
+import time
+from channels.layers import channel_layers
+from django.core.management.base import BaseCommand, CommandError
+
+def _receive_group(alias, group, receivers, messages, timeout, ready, results):
+    """One worker process: ``receivers`` consumers in ``group`` draining ``messages`` each."""
+    async def run():
+        layer = channel_layers.make_backend(alias)
+        channels = [await layer.new_channel() for _ in range(receivers)]
+        for channel in channels:
+            await layer.group_add(group, channel)
+        ready.release()
+
+        latencies, out_of_order = [], 0
+
+        async def drain(channel):
+            nonlocal out_of_order
+            received = 0
+            last_seq = -1
+            while received < messages:
+                try:
+                    message = await asyncio.wait_for(layer.receive(channel), timeout)
+                except asyncio.TimeoutError:
+                    break
+                latencies.append(time.time() - message['sent_at'])
+                out_of_order += message['seq'] <= last_seq
+                last_seq = message['seq']
+                received += 1
+            return received
+
+        received = await asyncio.gather(*(drain(channel) for channel in channels))
+        for channel in channels:
+            await layer.group_discard(group, channel)
+        return sum(received), out_of_order, latencies
+
+    results.put(asyncio.run(run()))
+
+class Command(BaseCommand):
+    help = 'Measure group_send throughput and fan-out latency of the channel layer across worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Receiving processes, like Daphne workers')
+        parser.add_argument('--receivers', type=int, default=10, help='Group members (websocket consumers) per worker')
+        parser.add_argument('--messages', type=int, default=200, help='group_send calls')
+        parser.add_argument('--group', default='benchmark_notifications', help='Use a group no real consumer is in')
+        parser.add_argument('--layer', default='default', help='CHANNEL_LAYERS alias')
+        parser.add_argument('--timeout', type=float, default=5.0, help='Seconds a receiver waits for the next message')
+
+    def handle(self, *args, **options):
+        workers, receivers, messages = options['workers'], options['receivers'], options['messages']
+        if workers <= 0 or receivers <= 0 or messages <= 0:
+            raise CommandError("--workers, --receivers and --messages must be positive")
+        layer = channel_layers.make_backend(options['layer'])
+        if 'groups' not in layer.extensions:
+            raise CommandError(f"{type(layer).__name__} does not support groups")
+
+        context = multiprocessing.get_context('fork')
+        ready = context.Semaphore(0)
+        results = context.Queue()
+        processes = [
+            context.Process(target=_receive_group, args=(
+                options['layer'], options['group'], receivers, messages, options['timeout'], ready, results,
+            ))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            if not ready.acquire(timeout=30):
+                raise CommandError("Workers did not join the group in time")
+
+        async def send_all():
+            for seq in range(messages):
+                await layer.group_send(options['group'], {
+                    'type': 'benchmark.message',
+                    'seq': seq,
+                    'sent_at': time.time(),
+                })
+
+        began = time.perf_counter()
+        asyncio.run(send_all())
+        send_seconds = time.perf_counter() - began
+
+        received, out_of_order, latencies = 0, 0, []
+        try:
+            for _ in processes:
+                worker_received, worker_out_of_order, worker_latencies = results.get(
+                    timeout=options['timeout'] * messages + 30
+                )
+                received += worker_received
+                out_of_order += worker_out_of_order
+                latencies.extend(worker_latencies)
+        except queue.Empty:
+            raise CommandError("A worker did not report back")
+        finally:
+            for process in processes:
+                process.join(5)
+        drain_seconds = time.perf_counter() - began
+
+        expected = workers * receivers * messages
+        self.stdout.write(f"{type(layer).__name__}: {workers} workers x {receivers} receivers, {messages} group_send calls")
+        self.stdout.write(f"group_send: {messages / send_seconds:.0f} calls/s ({send_seconds * 1000 / messages:.2f} ms each)")
+        self.stdout.write(f"delivered: {received}/{expected} messages, {received / drain_seconds:.0f} deliveries/s")
+        if latencies:
+            latencies.sort()
+            self.stdout.write(
+                f"latency: p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms, "
+                f"max {latencies[-1] * 1000:.1f} ms"
+            )
+
+        if received != expected or out_of_order:
+            raise CommandError(f"{expected - received} messages lost, {out_of_order} out of order")
+        self.stdout.write(self.style.SUCCESS("Successfully benchmarked the channel layer; every group member got every message in order"))
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from admin_dashboard.stats import refresh_dirty_daily_stats
+
+class Command(BaseCommand):
+    help = 'Recompute the daily_stats rows made stale by booking and transaction writes; run it every few minutes'
+
+    def handle(self, *args, **options):
+        count = refresh_dirty_daily_stats()
+        self.stdout.write(self.style.SUCCESS(f"Successfully refreshed {count} days of stats"))
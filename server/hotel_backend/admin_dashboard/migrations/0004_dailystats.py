@@ -0,0 +1,35 @@
+# Generated by Django 5.2.2 on 2026-10-17 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0003_delete_commissions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('bookings_created', models.PositiveIntegerField(default=0)),
+                ('check_ins', models.PositiveIntegerField(default=0)),
+                ('check_outs', models.PositiveIntegerField(default=0)),
+                ('cancellations', models.PositiveIntegerField(default=0)),
+                ('no_shows', models.PositiveIntegerField(default=0)),
+                ('rejections', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('room_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('venue_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('occupied_rooms', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'daily_stats',
+                'ordering': ['date'],
+            },
+        ),
+    ]
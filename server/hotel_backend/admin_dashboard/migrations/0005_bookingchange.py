@@ -0,0 +1,28 @@
+# Generated by Django 5.2.2 on 2026-10-17 05:00
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0004_dailystats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_id', models.IntegerField()),
+                ('operation', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('status_changed', 'Status Changed'), ('deleted', 'Deleted')], max_length=20)),
+                ('fields', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'booking_changes',
+                'indexes': [models.Index(fields=['created_at'], name='booking_changes_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-17 05:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0005_bookingchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailystats',
+            name='dirty_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from property.models import Rooms, Areas
 
 # Create your models here.
@@ -13,3 +14,49 @@ class ArchivedUser(models.Model):
     
     class Meta:
         db_table = 'archived_users'
+
+class DailyStats(models.Model):
+    date = models.DateField(unique=True)
+    bookings_created = models.PositiveIntegerField(default=0)
+    check_ins = models.PositiveIntegerField(default=0)
+    check_outs = models.PositiveIntegerField(default=0)
+    cancellations = models.PositiveIntegerField(default=0)
+    no_shows = models.PositiveIntegerField(default=0)
+    rejections = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    room_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    venue_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    occupied_rooms = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    # When a booking or transaction write last made this row stale; cleared by refresh_dirty_daily_stats
+    dirty_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        db_table = 'daily_stats'
+        ordering = ['date']
+
+    def __str__(self):
+        return f"Daily stats for {self.date}"
+
+class BookingChange(models.Model):
+    OPERATION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('status_changed', 'Status Changed'),
+        ('deleted', 'Deleted'),
+    ]
+    
+    # The id doubles as the stream sequence number admin screens resume from
+    booking_id = models.IntegerField()
+    operation = models.CharField(max_length=20, choices=OPERATION_CHOICES)
+    fields = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'booking_changes'
+        indexes = [
+            models.Index(fields=['created_at'], name='booking_changes_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} Booking {self.booking_id} {self.operation}"
@@ -1,22 +1,98 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from booking.models import Bookings
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from booking.models import Bookings, Transactions
+from property.models import Rooms
+from .stats import invalidate_dashboard_stats, mark_daily_stats_dirty, booking_stat_dates, local_date
+from .status_counter import booking_status_counter
+from .broadcasts import active_count_broadcaster, booking_change_broadcaster, record_booking_change
+from booking.rows import STREAMED_FIELDS
 
 @receiver(post_save, sender=Bookings)
-def send_active_count_update(sender, instance, created, **kwargs):
-    try:
-        channel_layer = get_channel_layer()
-        include_statuses = ['pending', 'reserved', 'checked_in']
-        count = Bookings.objects.filter(status__in=include_statuses).count()
-        
-        async_to_sync(channel_layer.group_send)(
-            'admin_notifications',
-            {
-                'type': 'active_count_update',
-                'count': count
-            }
-        )
-    except Exception as e:
-        raise f"Error in send_active_count_update: {e}"
\ No newline at end of file
+@receiver(post_delete, sender=Bookings)
+def send_active_count_update(sender, instance, **kwargs):
+    transaction.on_commit(active_count_broadcaster.request)
+
+@receiver(post_save, sender=Bookings)
+def stream_booking_change(sender, instance, created, **kwargs):
+    change = record_booking_change(instance, created, getattr(instance, '_previous_stat_values', None))
+    if change:
+        transaction.on_commit(lambda: booking_change_broadcaster.add(change))
+
+@receiver(post_delete, sender=Bookings)
+def stream_booking_deletion(sender, instance, **kwargs):
+    change = record_booking_change(instance, deleted=True)
+    transaction.on_commit(lambda: booking_change_broadcaster.add(change))
+
+@receiver(post_save, sender=Bookings)
+@receiver(post_delete, sender=Bookings)
+@receiver(post_save, sender=Transactions)
+@receiver(post_delete, sender=Transactions)
+@receiver(post_save, sender=Rooms)
+@receiver(post_delete, sender=Rooms)
+def expire_dashboard_stats(sender, instance, **kwargs):
+    invalidate_dashboard_stats()
+
+@receiver(post_save, sender=Bookings)
+def count_booking_status(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_stat_values', None)
+    old_status, new_status = previous['status'] if previous else None, instance.status
+    transaction.on_commit(lambda: booking_status_counter.apply(old_status, new_status))
+
+@receiver(post_delete, sender=Bookings)
+def uncount_booking_status(sender, instance, **kwargs):
+    old_status = instance.status
+    transaction.on_commit(lambda: booking_status_counter.discard(old_status))
+
+_BOOKING_STAT_FIELDS = ('created_at', 'cancellation_date', 'updated_at', 'check_in_date', 'check_out_date', 'status', 'is_venue_booking')
+# One pre_save read serves both the stats roll-up and the admin change stream
+_BOOKING_TRACKED_FIELDS = tuple(dict.fromkeys(_BOOKING_STAT_FIELDS + STREAMED_FIELDS))
+
+_BOOKING_TRACKED_ATTNAMES = {field: Bookings._meta.get_field(field).attname for field in _BOOKING_TRACKED_FIELDS}
+
+@receiver(pre_save, sender=Bookings)
+def remember_booking_stat_dates(sender, instance, **kwargs):
+    instance._previous_stat_values = None
+    if not instance.pk:
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is not None and all(attname in loaded for attname in _BOOKING_TRACKED_ATTNAMES.values()):
+        # Loaded (or last saved) by this process, so the row need not be read again
+        instance._previous_stat_values = {field: loaded[attname] for field, attname in _BOOKING_TRACKED_ATTNAMES.items()}
+    else:
+        instance._previous_stat_values = Bookings.objects.filter(pk=instance.pk).values(*_BOOKING_TRACKED_FIELDS).first()
+
+@receiver(post_save, sender=Bookings)
+@receiver(post_delete, sender=Bookings)
+def roll_up_booking_stats(sender, instance, **kwargs):
+    dates = booking_stat_dates(instance)
+    previous = getattr(instance, '_previous_stat_values', None)
+    if previous:
+        dates |= booking_stat_dates(previous)
+        if previous['is_venue_booking'] != instance.is_venue_booking:
+            dates.update(
+                local_date(value) for value in
+                instance.transactions.filter(status='completed').values_list('transaction_date', flat=True)
+            )
+    mark_daily_stats_dirty(dates)
+
+@receiver(pre_save, sender=Transactions)
+def remember_transaction_date(sender, instance, **kwargs):
+    instance._previous_transaction_date = None
+    if instance.pk:
+        instance._previous_transaction_date = Transactions.objects.filter(
+            pk=instance.pk
+        ).values_list('transaction_date', flat=True).first()
+
+@receiver(post_save, sender=Transactions)
+@receiver(post_delete, sender=Transactions)
+def roll_up_transaction_stats(sender, instance, **kwargs):
+    mark_daily_stats_dirty([
+        local_date(instance.transaction_date),
+        local_date(getattr(instance, '_previous_transaction_date', None)),
+    ])
+
+# Connected last, after every receiver that compares against the previous values
+@receiver(post_save, sender=Bookings)
+def remember_saved_booking_values(sender, instance, **kwargs):
+    instance._loaded_values = {attname: getattr(instance, attname) for attname in _BOOKING_TRACKED_ATTNAMES.values()}
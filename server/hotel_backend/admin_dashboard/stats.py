@@ -0,0 +1,448 @@
+import threading
+import numpy as np
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction, connections
+from django.utils import timezone
+from django.db.models import Q, F, Sum, Count, DateTimeField, DecimalField, Value
+from django.db.models.functions import TruncDate, Coalesce
+from property.models import Rooms, Areas
+from booking.models import Bookings, Transactions, OCCUPYING_STATUSES
+from .models import DailyStats
+
+GENERATION_KEY = 'dashboard_stats:generation'
+
+def _snapshot_ttl():
+    return getattr(settings, 'DASHBOARD_STATS_CACHE_SECONDS', 30)
+
+def _generation():
+    return cache.get_or_set(GENERATION_KEY, 1, None)
+
+def invalidate_dashboard_stats():
+    """Drop every cached dashboard snapshot by moving to a new cache generation."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+def _checked_in_rooms(start_date, end_date):
+    return Q(status='checked_in') & Q(is_venue_booking=False) & \
+        Q(check_in_date__lte=end_date.date()) & Q(check_out_date__gte=start_date.date())
+
+def checked_in_room_ids(start_date, end_date):
+    """Ids of the rooms checked in at some point of the period."""
+    return Bookings.objects.filter(_checked_in_rooms(start_date, end_date), room__isnull=False).values('room_id')
+
+def dashboard_bookings(start_date, end_date):
+    """
+    The bookings any Bookings counter of compute_dashboard_stats can count, so its
+    aggregate reads them through the status and created_at indexes, not the whole table.
+    """
+    return Bookings.objects.filter(
+        Q(created_at__range=(start_date, end_date)) |
+        _checked_in_rooms(start_date, end_date) |
+        Q(status='checked_in') & Q(check_in_date__range=(start_date.date(), end_date.date())) |
+        Q(status__in=['confirmed', 'reserved']) & Q(is_venue_booking=True) & Q(check_in_date__gte=start_date.date())
+    )
+
+def compute_dashboard_stats(start_date, end_date):
+    """
+    Dashboard counters for the period, computed with one conditional aggregate
+    per table (Rooms, Bookings, Transactions) no matter how much data there is.
+    """
+    in_period = Q(created_at__range=(start_date, end_date))
+    checked_in_rooms = _checked_in_rooms(start_date, end_date)
+    room_stats = Rooms.objects.aggregate(
+        total_rooms=Count('id'),
+        available_rooms=Count('id', filter=Q(status='available') & ~Q(id__in=checked_in_room_ids(start_date, end_date))),
+        maintenance_rooms=Count('id', filter=Q(status='maintenance')),
+    )
+
+    booking_stats = dashboard_bookings(start_date, end_date).aggregate(
+        occupied_rooms=Count('id', filter=checked_in_rooms),
+        active_bookings=Count('id', filter=Q(status__in=['confirmed', 'reserved', 'checked_in']) & in_period),
+        pending_bookings=Count('id', filter=Q(status='pending') & in_period),
+        unpaid_bookings=Count('id', filter=Q(payment_status='unpaid') & in_period),
+        checked_in_count=Count('id', filter=Q(status='checked_in') & Q(check_in_date__range=(start_date.date(), end_date.date()))),
+        total_bookings=Count('id', filter=in_period),
+        upcoming_reservations=Count('id', filter=Q(is_venue_booking=True) & Q(status__in=['confirmed', 'reserved']) & Q(check_in_date__gte=start_date.date())),
+    )
+
+    revenue_stats = Transactions.objects.filter(
+        transaction_date__range=(start_date, end_date),
+        status='completed'
+    ).aggregate(
+        revenue=Sum('amount'),
+        room_revenue=Sum('amount', filter=Q(booking__isnull=False) & Q(booking__is_venue_booking=False)),
+        venue_revenue=Sum('amount', filter=Q(booking__isnull=False) & Q(booking__is_venue_booking=True)),
+    )
+    revenue_stats = {key: value or 0 for key, value in revenue_stats.items()}
+
+    return {**room_stats, **booking_stats, **revenue_stats}
+
+# Statuses reported by booking_status_counts, in response order
+STATUS_COUNT_KEYS = ['pending', 'reserved', 'checked_in', 'checked_out', 'cancelled', 'no_show', 'rejected']
+
+def count_booking_statuses(counts=None, **filters):
+    """
+    Bookings per status for STATUS_COUNT_KEYS. Counted with one grouped query over
+    ``filters`` unless precomputed ``counts`` are passed in.
+    """
+    if counts is None:
+        counts = dict(
+            Bookings.objects.filter(**filters).values('status').annotate(
+                total=Count('id')
+            ).order_by().values_list('status', 'total')
+        )
+    return {key: counts.get(key, 0) for key in STATUS_COUNT_KEYS}
+
+def get_dashboard_stats(month, year, start_date, end_date):
+    """Cached per-(month, year) snapshot of compute_dashboard_stats."""
+    key = f"dashboard_stats:{_generation()}:{year}:{month}"
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_dashboard_stats(start_date, end_date)
+        cache.set(key, stats, _snapshot_ttl())
+    return stats
+
+GRANULARITIES = ('day', 'week', 'month')
+
+def daily_occupied_rooms(start, end):
+    """
+    Number of occupying room bookings on each date of [start, end], inclusive of both
+    the check-in and the check-out date. All overlapping intervals are fetched in one
+    query and swept with a difference array.
+    """
+    days = (end - start).days + 1
+    if days <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    intervals = np.array(list(Bookings.objects.filter(
+        check_in_date__lte=end,
+        check_out_date__gte=start,
+        status__in=OCCUPYING_STATUSES,
+        is_venue_booking=False
+    ).values_list('check_in_date', 'check_out_date')), dtype='datetime64[D]').reshape(-1, 2)
+
+    origin = np.datetime64(start, 'D')
+    first = np.clip((intervals[:, 0] - origin).astype(np.int64), 0, days)
+    last = np.clip((intervals[:, 1] - origin).astype(np.int64), -1, days - 1)
+
+    diff = np.zeros(days + 1, dtype=np.int64)
+    np.add.at(diff, first, 1)
+    np.add.at(diff, last + 1, -1)
+    return np.cumsum(diff[:-1])
+
+def _bucket_start(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+def occupancy_series(start, end, granularity='day', total_rooms=None):
+    """
+    Occupancy rate (percent of all rooms) for [start, end], one value per day, ISO week
+    or calendar month. Week and month values are the mean of their daily rates.
+    Returns (labels, rates) where labels are the first date of each bucket.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Invalid granularity. Valid values are: {', '.join(GRANULARITIES)}")
+    if total_rooms is None:
+        total_rooms = Rooms.objects.count()
+
+    occupied = [row.occupied_rooms for row in daily_stats(start, end)]
+    if total_rooms == 0:
+        daily_rates = [0] * len(occupied)
+    else:
+        daily_rates = [round((int(count) / total_rooms) * 100, 2) for count in occupied]
+
+    if granularity == 'day':
+        return [start + timedelta(days=i) for i in range(len(daily_rates))], daily_rates
+
+    buckets = {}
+    for i, rate in enumerate(daily_rates):
+        buckets.setdefault(_bucket_start(start + timedelta(days=i), granularity), []).append(rate)
+    labels = list(buckets)
+    return labels, [round(sum(rates) / len(rates), 2) for rates in buckets.values()]
+
+def daily_totals(queryset, date_field, start, days, **aggregates):
+    """
+    Per-day values of each named aggregate over ``queryset``, bucketed by ``date_field``
+    for the ``days`` days from ``start`` in one grouped query. DateTimeFields are
+    bucketed by their local date. Returns {name: [value per day]}.
+    """
+    field = queryset.model._meta.get_field(date_field)
+    day = TruncDate(date_field) if isinstance(field, DateTimeField) else F(date_field)
+    rows = queryset.annotate(day=day).values('day').annotate(**aggregates).order_by()
+
+    series = {name: [0] * days for name in aggregates}
+    for row in rows:
+        if row['day'] is None:
+            continue
+        idx = (row['day'] - start).days
+        if 0 <= idx < days:
+            for name in aggregates:
+                series[name][idx] += row[name] or 0
+    return series
+
+def daily_series(queryset, date_field, start, days, aggregate=None):
+    """Per-day totals of ``queryset`` by ``date_field`` (COUNT by default); see daily_totals."""
+    return daily_totals(
+        queryset, date_field, start, days,
+        total=aggregate if aggregate is not None else Count('id')
+    )['total']
+
+def _local_day_range(start, end):
+    """Aware datetimes bounding the local dates [start, end] as a half-open range."""
+    return (
+        timezone.make_aware(datetime.combine(start, time.min)),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)),
+    )
+
+def compute_daily_stats(start, end):
+    """Build (unsaved) DailyStats rows for every date in [start, end] from Bookings and Transactions."""
+    days = (end - start).days + 1
+    if days <= 0:
+        return []
+    day_start, day_end = _local_day_range(start, end)
+
+    created = daily_series(
+        Bookings.objects.filter(created_at__gte=day_start, created_at__lt=day_end),
+        'created_at', start, days
+    )
+    check_ins = daily_series(
+        Bookings.objects.filter(status__in=['checked_in', 'checked_out'], check_in_date__range=(start, end)),
+        'check_in_date', start, days
+    )
+    check_outs = daily_series(
+        Bookings.objects.filter(status='checked_out', check_out_date__range=(start, end)),
+        'check_out_date', start, days
+    )
+    cancellations = daily_series(
+        Bookings.objects.filter(status='cancelled', cancellation_date__gte=day_start, cancellation_date__lt=day_end),
+        'cancellation_date', start, days
+    )
+    closed = daily_totals(
+        Bookings.objects.filter(status__in=['missed_reservation', 'rejected'], updated_at__gte=day_start, updated_at__lt=day_end),
+        'updated_at', start, days,
+        no_shows=Count('id', filter=Q(status='missed_reservation')),
+        rejections=Count('id', filter=Q(status='rejected')),
+    )
+    revenue = daily_totals(
+        Transactions.objects.filter(status='completed', transaction_date__gte=day_start, transaction_date__lt=day_end),
+        'transaction_date', start, days,
+        revenue=Sum('amount'),
+        room_revenue=Sum('amount', filter=Q(booking__isnull=False) & Q(booking__is_venue_booking=False)),
+        venue_revenue=Sum('amount', filter=Q(booking__isnull=False) & Q(booking__is_venue_booking=True)),
+    )
+    occupied = daily_occupied_rooms(start, end)
+
+    return [
+        DailyStats(
+            date=start + timedelta(days=i),
+            bookings_created=created[i],
+            check_ins=check_ins[i],
+            check_outs=check_outs[i],
+            cancellations=cancellations[i],
+            no_shows=closed['no_shows'][i],
+            rejections=closed['rejections'][i],
+            revenue=revenue['revenue'][i],
+            room_revenue=revenue['room_revenue'][i],
+            venue_revenue=revenue['venue_revenue'][i],
+            occupied_rooms=int(occupied[i]),
+        )
+        for i in range(days)
+    ]
+
+DAILY_STATS_FIELDS = [
+    'bookings_created', 'check_ins', 'check_outs', 'cancellations', 'no_shows', 'rejections',
+    'revenue', 'room_revenue', 'venue_revenue', 'occupied_rooms', 'updated_at',
+]
+
+def _conflict_target():
+    # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target; PostgreSQL and SQLite require one
+    features = connections[DailyStats.objects.db].features
+    return {'unique_fields': ['date']} if features.supports_update_conflicts_with_target else {}
+
+def refresh_daily_stats(start, end):
+    """Recompute and upsert the DailyStats rows for [start, end]. Returns the number of rows written."""
+    rows = compute_daily_stats(start, end)
+    now = timezone.now()
+    for row in rows:
+        row.updated_at = now
+    with transaction.atomic():
+        DailyStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            update_fields=DAILY_STATS_FIELDS,
+            **_conflict_target()
+        )
+    return len(rows)
+
+def refresh_daily_stats_dates(dates, max_gap=31):
+    """
+    Recompute the DailyStats rows of the given dates. Dates less than ``max_gap`` days
+    apart are refreshed as one range so a booking costs a handful of grouped queries.
+    """
+    ordered = sorted({day for day in dates if day is not None})
+    if not ordered:
+        return
+    first = last = ordered[0]
+    for day in ordered[1:]:
+        if (day - last).days > max_gap:
+            refresh_daily_stats(first, last)
+            first = day
+        last = day
+    refresh_daily_stats(first, last)
+
+_dirty_dates = threading.local()
+
+def _record_dirty_dates():
+    dates = getattr(_dirty_dates, 'dates', None)
+    _dirty_dates.dates = None
+    if dates:
+        now = timezone.now()
+        DailyStats.objects.bulk_create(
+            [DailyStats(date=day, dirty_at=now) for day in sorted(dates)],
+            update_conflicts=True,
+            update_fields=['dirty_at'],
+            **_conflict_target()
+        )
+
+def mark_daily_stats_dirty(dates):
+    """
+    Flag the DailyStats rows of ``dates`` as stale once the current transaction commits.
+    Nothing is recomputed on the write path: daily_stats() computes flagged dates from
+    the raw tables until refresh_dirty_daily_stats stores them again. Dates marked during
+    one transaction are flagged with one upsert; dates left over from a rolled back
+    transaction are flagged with the next commit.
+    """
+    dates = {day for day in dates if day is not None}
+    if not dates:
+        return
+    pending = getattr(_dirty_dates, 'dates', None)
+    if pending is None:
+        pending = _dirty_dates.dates = set()
+    pending |= dates
+    transaction.on_commit(_record_dirty_dates)
+
+def refresh_dirty_daily_stats():
+    """
+    Recompute the DailyStats rows flagged by mark_daily_stats_dirty and return how many
+    dates were refreshed. A flag set after this run started is kept, so a write that
+    commits while the rows are being computed is picked up by the next run.
+    """
+    started = timezone.now()
+    dates = list(DailyStats.objects.filter(dirty_at__isnull=False).values_list('date', flat=True))
+    if dates:
+        refresh_daily_stats_dates(dates)
+        DailyStats.objects.filter(date__in=dates, dirty_at__lt=started).update(dirty_at=None)
+    return len(dates)
+
+# Longest range the chart endpoints read, so a request cannot make the server roll up years of data
+MAX_STATS_RANGE_DAYS = 366
+
+def daily_stats(start, end):
+    """
+    DailyStats rows for every date in [start, end], in date order. Dates that have not
+    been rolled up yet, or are flagged as stale, are computed from the raw tables for this
+    call only; refresh_dirty_daily_stats and backfill_daily_stats store them. Ranges over
+    MAX_STATS_RANGE_DAYS raise ValueError.
+    """
+    days = (end - start).days + 1
+    if days <= 0:
+        return []
+    if days > MAX_STATS_RANGE_DAYS:
+        raise ValueError(f"Date range cannot exceed {MAX_STATS_RANGE_DAYS} days")
+    rows = list(DailyStats.objects.filter(date__range=(start, end), dirty_at__isnull=True).order_by('date'))
+    if len(rows) < days:
+        present = {row.date for row in rows}
+        missing = [start + timedelta(days=i) for i in range(days) if start + timedelta(days=i) not in present]
+        computed = [row for row in compute_daily_stats(missing[0], missing[-1]) if row.date not in present]
+        rows = sorted(rows + computed, key=lambda row: row.date)
+    return rows
+
+def local_date(value):
+    """Local calendar date of a datetime (naive values are taken as local already)."""
+    if value is None:
+        return None
+    return value.date() if timezone.is_naive(value) else timezone.localdate(value)
+
+def booking_stat_dates(booking):
+    """Dates whose DailyStats row depends on this booking (``booking`` may be a model or a values() dict)."""
+    get = booking.get if isinstance(booking, dict) else lambda field: getattr(booking, field)
+    check_in, check_out = get('check_in_date'), get('check_out_date')
+    dates = {
+        local_date(get('created_at')),
+        local_date(get('cancellation_date')),
+        local_date(get('updated_at')),
+        check_in,
+        check_out,
+    }
+    if check_in and check_out and get('status') in OCCUPYING_STATUSES and not get('is_venue_booking'):
+        dates.update(check_in + timedelta(days=i) for i in range((check_out - check_in).days + 1))
+    dates.discard(None)
+    return dates
+
+RANKING_SORTS = ('asc', 'desc')
+
+def parse_ranking_params(query_params):
+    """
+    Read the optional ``sort`` (asc/desc by value) and ``top_n`` query parameters.
+    Asking for ``top_n`` without a sort ranks from the highest value down.
+    """
+    sort = query_params.get('sort')
+    top_n = query_params.get('top_n')
+    if sort and sort not in RANKING_SORTS:
+        raise ValueError(f"Invalid sort value. Valid values are: {', '.join(RANKING_SORTS)}")
+    if top_n is not None:
+        try:
+            top_n = int(top_n)
+        except (ValueError, TypeError):
+            raise ValueError("top_n must be a positive integer")
+        if top_n <= 0:
+            raise ValueError("top_n must be a positive integer")
+        sort = sort or 'desc'
+    return sort, top_n
+
+def _ranked(queryset, value, sort, top_n):
+    if sort == 'desc':
+        queryset = queryset.order_by(F(value).desc(), 'id')
+    elif sort == 'asc':
+        queryset = queryset.order_by(F(value).asc(), 'id')
+    else:
+        queryset = queryset.order_by('id')
+    return queryset[:top_n] if top_n else queryset
+
+def property_revenue(is_venue_booking, start_date, end_date, sort=None, top_n=None):
+    """(name, revenue) for every room or area in one grouped query over completed transactions."""
+    model, name_field, relation = (Areas, 'area_name', 'area_bookings') if is_venue_booking else (Rooms, 'room_name', 'bookings')
+    revenue = Coalesce(
+        Sum(f"{relation}__transactions__amount", filter=Q(
+            **{
+                f"{relation}__transactions__transaction_date__gte": start_date,
+                f"{relation}__transactions__transaction_date__lte": end_date,
+                f"{relation}__transactions__status": 'completed',
+                f"{relation}__is_venue_booking": is_venue_booking,
+            }
+        )),
+        Value(0),
+        output_field=DecimalField(max_digits=12, decimal_places=2)
+    )
+    rows = _ranked(model.objects.annotate(revenue=revenue), 'revenue', sort, top_n)
+    return [(name, float(amount)) for name, amount in rows.values_list(name_field, 'revenue')]
+
+def property_booking_counts(is_venue_booking, start_date, end_date, sort=None, top_n=None):
+    """(name, bookings created in the period) for every room or area in one grouped query."""
+    model, name_field, relation = (Areas, 'area_name', 'area_bookings') if is_venue_booking else (Rooms, 'room_name', 'bookings')
+    booking_count = Count(f"{relation}__id", filter=Q(
+        **{
+            f"{relation}__created_at__gte": start_date,
+            f"{relation}__created_at__lte": end_date,
+            f"{relation}__is_venue_booking": is_venue_booking,
+        }
+    ))
+    rows = _ranked(model.objects.annotate(booking_count=booking_count), 'booking_count', sort, top_n)
+    return list(rows.values_list(name_field, 'booking_count'))
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.db.models import Count
+from booking.models import Bookings
+
+class BookingStatusCounter:
+    """
+    In-process count of bookings per status.
+
+    Built with one grouped COUNT on first use, then kept current by the Bookings
+    post_save/post_delete signals: each save moves one booking from its previous
+    status to its new one. Only the per-status totals are held, and the grouped
+    COUNT is rerun every REBUILD_SECONDS to pick up writes made by other workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._counts = Counter()
+        self._built_at = None
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    def _config(self):
+        config = getattr(settings, 'BOOKING_STATUS_COUNTER', {})
+        return config.get('ENABLED', True), config.get('REBUILD_SECONDS', 10)
+
+    @property
+    def enabled(self):
+        return self._config()[0]
+
+    def build(self):
+        counts = Counter(dict(
+            Bookings.objects.values('status').annotate(total=Count('id')).order_by().values_list('status', 'total')
+        ))
+        with self._lock:
+            self._counts = counts
+            self._built_at = time.monotonic()
+
+    def apply(self, old_status, new_status):
+        """
+        Move a saved booking from ``old_status`` (None for a new booking) to
+        ``new_status``. A no-op until built.
+        """
+        with self._lock:
+            if not self.is_built or old_status == new_status:
+                return
+            if old_status is not None:
+                self._counts[old_status] -= 1
+            self._counts[new_status] += 1
+
+    def discard(self, old_status):
+        with self._lock:
+            if self.is_built:
+                self._counts[old_status] -= 1
+
+    def counts(self):
+        """Current {status: count} for every status seen, rebuilding first when stale."""
+        _, rebuild_seconds = self._config()
+        with self._lock:
+            if self._built_at is None or time.monotonic() - self._built_at >= rebuild_seconds:
+                self.build()
+            return {key: value for key, value in self._counts.items() if value}
+
+booking_status_counter = BookingStatusCounter()
@@ -5,6 +5,7 @@ from . import views
 urlpatterns = [
     path('stats', views.dashboard_stats, name='dashboard_stats'),
     path('booking_status_counts', views.booking_status_counts, name='booking_status_counts'),
+    path('craveon_health', views.craveon_health, name='craveon_health'),
     
     # Analytics
     path('daily_revenue', views.daily_revenue, name='daily_revenue'),
@@ -8,13 +8,28 @@ from rest_framework.permissions import IsAuthenticated
 from property.models import Areas, Rooms, Amenities, RoomImages, AreaImages
 from property.serializers import AreaSerializer, RoomSerializer, AmenitySerializer
 from booking.models import Bookings, Transactions
-from booking.serializers import BookingSerializer
+from booking.serializers import BookingSerializer, sparse_fieldset_options
+from booking.rows import listing_data
+from booking.craveon_health import craveon_breaker, connection_metrics
+from booking.craveon_integration import MENU_CACHE_KEY
 from user_roles.models import CustomUsers, Notification
 from user_roles.serializers import CustomUserSerializer
 from user_roles.views import create_booking_notification
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from django.core.cache import cache
 from django.db.models import Q, Sum, Count, Avg, Max
 from datetime import datetime, date, timedelta
+from .stats import (
+    get_dashboard_stats,
+    occupancy_series,
+    daily_stats,
+    parse_ranking_params,
+    property_revenue,
+    property_booking_counts,
+    count_booking_statuses,
+)
+from .status_counter import booking_status_counter
+from hotel_backend.pagination import paginate_by_cursor
 from .email.booking import send_booking_confirmation_email, send_booking_rejection_email, send_checkout_e_receipt
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
@@ -69,95 +84,17 @@ def dashboard_stats(request):
         
         end_date = end_date.replace(hour=23, minute=59, second=59)
         
-        total_rooms = Rooms.objects.count()
-        
-        checked_in_room_ids = Bookings.objects.filter(
-            Q(status='checked_in') & 
-            Q(is_venue_booking=False) & 
-            Q(check_in_date__lte=end_date.date()) &
-            Q(check_out_date__gte=start_date.date())
-        ).values_list('room_id', flat=True).distinct()
-        
-        available_rooms = Rooms.objects.filter(
-            status='available'
-        ).exclude(
-            id__in=checked_in_room_ids
-        ).count()
-        
-        occupied_rooms = Bookings.objects.filter(
-            Q(status='checked_in') & 
-            Q(is_venue_booking=False) & 
-            Q(check_in_date__lte=end_date.date()) &
-            Q(check_out_date__gte=start_date.date())
-        ).count()
-        
-        maintenance_rooms = Rooms.objects.filter(status='maintenance').count()
-        
-        active_bookings = Bookings.objects.filter(
-            Q(status__in=['confirmed', 'reserved', 'checked_in']) &
-            Q(created_at__range=(start_date, end_date))
-        ).count()
-        
-        pending_bookings = Bookings.objects.filter(
-            Q(status='pending') &
-            Q(created_at__range=(start_date, end_date))
-        ).count()
-        
-        unpaid_bookings = Bookings.objects.filter(
-            Q(payment_status='unpaid') &
-            Q(created_at__range=(start_date, end_date))
-        ).count()
-        
-        checked_in_count = Bookings.objects.filter(
-            Q(status='checked_in') &
-            Q(check_in_date__range=(start_date.date(), end_date.date()))
-        ).count()
-        
-        total_bookings = Bookings.objects.filter(
-            created_at__range=(start_date, end_date)
-        ).count()
-        
-        upcoming_reservations = Bookings.objects.filter(
-            Q(is_venue_booking=True) &
-            Q(status__in=['confirmed', 'reserved']) &
-            Q(check_in_date__gte=start_date.date())
-        ).count()
-        
-        transactions_this_month = Transactions.objects.filter(
-            transaction_date__range=(start_date, end_date),
-            status='completed'
-        )
-        
-        revenue = transactions_this_month.aggregate(Sum('amount'))['amount__sum'] or 0
-        
-        room_revenue = transactions_this_month.filter(
-            Q(booking__isnull=False) & 
-            Q(booking__is_venue_booking=False)
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-        
-        venue_revenue = transactions_this_month.filter(
-            Q(booking__isnull=False) & 
-            (Q(booking__is_venue_booking=True))
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
+        stats = get_dashboard_stats(month, year, start_date, end_date)
+        revenue = stats['revenue']
+        room_revenue = stats['room_revenue']
+        venue_revenue = stats['venue_revenue']
         
         formatted_revenue = f"₱{revenue:,.2f}"
         formatted_room_revenue = f"₱{room_revenue:,.2f}"
         formatted_venue_revenue = f"₱{venue_revenue:,.2f}"
         
         response_data = {
-            'total_rooms': total_rooms,
-            'available_rooms': available_rooms,
-            'occupied_rooms': occupied_rooms,
-            'maintenance_rooms': maintenance_rooms,
-            'active_bookings': active_bookings,
-            'pending_bookings': pending_bookings,
-            'unpaid_bookings': unpaid_bookings,
-            'checked_in_count': checked_in_count,
-            'total_bookings': total_bookings,
-            'upcoming_reservations': upcoming_reservations,
-            'revenue': revenue,
-            'room_revenue': room_revenue,
-            'venue_revenue': venue_revenue,
+            **stats,
             'formatted_revenue': formatted_revenue,
             'formatted_room_revenue': formatted_room_revenue,
             'formatted_venue_revenue': formatted_venue_revenue,
@@ -280,10 +217,7 @@ def edit_room(request, room_id):
     except Rooms.DoesNotExist:
         return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    has_active_bookings = Bookings.objects.filter(
-        room=room,
-        status__in=['reserved', 'confirmed', 'checked_in']
-    ).exists()
+    has_active_bookings = Bookings.objects.occupying().filter(room=room).exists()
     if has_active_bookings:
         allowed_fields = ['description', 'amenities', 'status', 'max_guests', 'discount_percent']
         filtered_data = {k: v for k, v in request.data.items() if k in allowed_fields}
@@ -364,10 +298,7 @@ def edit_room(request, room_id):
 def delete_room(request, room_id):
     try:
         room = Rooms.objects.get(id=room_id)        
-        active_bookings = Bookings.objects.filter(
-            room=room,
-            status__in=['reserved', 'confirmed', 'checked_in']
-        ).exists()
+        active_bookings = Bookings.objects.occupying().filter(room=room).exists()
         
         if active_bookings:
             return Response({
@@ -527,10 +458,7 @@ def delete_area(request, area_id):
     try:
         area = Areas.objects.get(id=area_id)
         
-        active_bookings = Bookings.objects.filter(
-            area=area,
-            status__in=['reserved', 'confirmed', 'checked_in']
-        ).exists()
+        active_bookings = Bookings.objects.occupying().filter(area=area).exists()
         
         if active_bookings:
             return Response({
@@ -680,13 +608,27 @@ def admin_bookings(request):
         
         status_filter = request.query_params.get('status')
         
-        bookings = Bookings.objects.all().order_by('created_at')
+        bookings = Bookings.objects.for_listing().order_by('created_at')
+        try:
+            fieldset = sparse_fieldset_options(request.query_params)
+        except ValueError as ve:
+            return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
         
         if status_filter and status_filter != "all":
             bookings = bookings.filter(status=status_filter)
         else:
             bookings = bookings.exclude(status__in=exclude_statuses)
         
+        if 'cursor' in request.query_params:
+            try:
+                page_bookings, pagination = paginate_by_cursor(bookings, request.query_params, 9, descending=False)
+            except ValueError as ve:
+                return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                "data": listing_data(page_bookings, fieldset),
+                "pagination": pagination
+            }, status=status.HTTP_200_OK)
+        
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 9)
         paginator = Paginator(bookings, page_size)
@@ -698,10 +640,8 @@ def admin_bookings(request):
         except EmptyPage:
             paginated_bookings = paginator.page(paginator.num_pages)
 
-        serializer = BookingSerializer(paginated_bookings, many=True)
-        
         return Response({
-            "data": serializer.data,
+            "data": listing_data(paginated_bookings, fieldset),
             "pagination": {
                 "total_pages": paginator.num_pages,
                 "current_page": int(page),
@@ -855,24 +795,6 @@ def update_booking_status(request, booking_id):
             room.status = 'available'
             room.save()
     
-    try:
-        channel_layer = get_channel_layer()
-        active_statuses = ['pending', 'reserved', 'confirmed', 'checked_in']
-        active_count = Bookings.objects.filter(status__in=active_statuses).count()
-        
-        print(f"Sending WebSockets update - Active Count: {active_count}")
-        
-        async_to_sync(channel_layer.group_send)(
-            'admin_notifications',
-            {
-                'type': 'active_count_update',
-                'count': active_count
-            }
-        )
-        print(f"📤 WebSocket notification sent with count: {active_count}")
-    except Exception as e:
-        print(f"WebSocket notification error: {str(e)}")
-    
     return Response({
         "message": f"Booking status updated to {status_value}",
         "data": serializer.data
@@ -917,12 +839,31 @@ def record_payment(request, booking_id):
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def craveon_health(request):
+    try:
+        return Response({
+            "breaker": craveon_breaker.metrics(),
+            "connections": connection_metrics(),
+            "menu_cached": cache.get(MENU_CACHE_KEY) is not None,
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def booking_status_counts(request):
     try:
-        month = int(request.query_params.get('month'))
-        year = int(request.query_params.get('year'))
+        month = request.query_params.get('month')
+        year = request.query_params.get('year')
+        
+        if not month and not year:
+            counts = booking_status_counter.counts() if booking_status_counter.enabled else None
+            return Response(count_booking_statuses(counts), status=status.HTTP_200_OK)
+        
+        month = int(month)
+        year = int(year)
         
         start_date = datetime(year, month, 1)
         if month == 12:
@@ -936,23 +877,7 @@ def booking_status_counts(request):
             'created_at__lte': end_date,
         }
         
-        pending_count = Bookings.objects.filter(status='pending', **filters).count()
-        reserved_count = Bookings.objects.filter(status='reserved', **filters).count()
-        checked_in_count = Bookings.objects.filter(status='checked_in', **filters).count()
-        checked_out_count = Bookings.objects.filter(status='checked_out', **filters).count()
-        cancelled_count = Bookings.objects.filter(status='cancelled', **filters).count()
-        no_show_count = Bookings.objects.filter(status='no_show', **filters).count() 
-        rejected_count = Bookings.objects.filter(status='rejected', **filters).count()
-        
-        return Response({
-            "pending": pending_count,
-            "reserved": reserved_count,
-            "checked_in": checked_in_count,
-            "checked_out": checked_out_count,
-            "cancelled": cancelled_count,
-            "no_show": no_show_count,
-            "rejected": rejected_count
-        }, status=status.HTTP_200_OK)
+        return Response(count_booking_statuses(**filters), status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -963,6 +888,17 @@ def fetch_all_users(request):
     try:
         users = CustomUsers.objects.filter(role="guest", is_archived=False)
         
+        if 'cursor' in request.query_params:
+            try:
+                page_users, pagination = paginate_by_cursor(users, request.query_params, 10, field='date_joined', descending=False)
+            except ValueError as ve:
+                return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = CustomUserSerializer(page_users, many=True)
+            return Response({
+                "users": serializer.data,
+                "pagination": pagination
+            }, status=status.HTTP_200_OK)
+        
         page = request.query_params.get('page')
         page_size = request.query_params.get('page_size')
         paginator = Paginator(users, page_size)
@@ -1247,17 +1183,11 @@ def daily_revenue(request):
         
         end_date = end_date.replace(hour=23, minute=59, second=59)        
         days_in_month = (end_date.day)
-        daily_revenue = [0] * days_in_month
         
-        transactions = Transactions.objects.filter(
-            transaction_date__gte=start_date,
-            transaction_date__lte=end_date,
-            status='completed'
-        )
-        
-        for transaction in transactions:
-            day_idx = transaction.transaction_date.day - 1
-            daily_revenue[day_idx] += float(transaction.amount)
+        daily_revenue = [
+            float(row.revenue) if row.revenue else 0
+            for row in daily_stats(start_date.date(), end_date.date())
+        ]
         
         return Response({
             "data": daily_revenue,
@@ -1286,16 +1216,8 @@ def daily_bookings(request):
         
         end_date = end_date.replace(hour=23, minute=59, second=59)        
         days_in_month = (end_date.day)        
-        daily_bookings = [0] * days_in_month
-        
-        bookings = Bookings.objects.filter(
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        )
         
-        for booking in bookings:
-            day_idx = booking.created_at.day - 1
-            daily_bookings[day_idx] += 1
+        daily_bookings = [row.bookings_created for row in daily_stats(start_date.date(), end_date.date())]
         
         return Response({
             "data": daily_bookings,
@@ -1312,6 +1234,32 @@ def daily_bookings(request):
 @permission_classes([IsAuthenticated])
 def daily_occupancy(request):
     try:
+        start_param = request.query_params.get('start_date')
+        end_param = request.query_params.get('end_date')
+        
+        if start_param and end_param:
+            try:
+                start_date = datetime.strptime(start_param, "%Y-%m-%d").date()
+                end_date = datetime.strptime(end_param, "%Y-%m-%d").date()
+            except ValueError:
+                return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
+            if end_date < start_date:
+                return Response({"error": "end_date must be on or after start_date"}, status=status.HTTP_400_BAD_REQUEST)
+            
+            granularity = request.query_params.get('granularity', 'day')
+            try:
+                labels, data = occupancy_series(start_date, end_date, granularity)
+            except ValueError as ve:
+                return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            return Response({
+                "data": data,
+                "labels": [label.isoformat() for label in labels],
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "granularity": granularity
+            }, status=status.HTTP_200_OK)
+        
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))        
         
@@ -1321,29 +1269,7 @@ def daily_occupancy(request):
             end_date = datetime(year, month + 1, 1).date() - timedelta(days=1)
         
         days_in_month = (end_date.day)        
-        daily_occupancy = [0] * days_in_month
-        
-        total_rooms = Rooms.objects.count()
-        if total_rooms == 0:
-            return Response({
-                "data": daily_occupancy,
-                "month": month,
-                "year": year,
-                "days_in_month": days_in_month
-            }, status=status.HTTP_200_OK)
-        
-        for day in range(1, days_in_month + 1):
-            current_date = date(year, month, day)
-            
-            occupied_rooms = Bookings.objects.filter(
-                Q(check_in_date__lte=current_date) & 
-                Q(check_out_date__gte=current_date) &
-                Q(status__in=['reserved', 'confirmed', 'checked_in']) &
-                Q(is_venue_booking=False)
-            ).count()
-            
-            occupancy_rate = (occupied_rooms / total_rooms) * 100
-            daily_occupancy[day - 1] = round(occupancy_rate, 2)
+        _, daily_occupancy = occupancy_series(date(year, month, 1), end_date)
         
         return Response({
             "data": daily_occupancy,
@@ -1363,31 +1289,18 @@ def daily_checkins_checkouts(request):
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))
         
+        start_date = date(year, month, 1)
+        
         if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
+            end_date = date(year + 1, 1, 1) - timedelta(days=1)
         else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-        
-        end_date = end_date.replace(hour=23, minute=59, second=59)
+            end_date = date(year, month + 1, 1) - timedelta(days=1)
         
         days_in_month = (end_date.day)
-        daily_checkins = [0] * days_in_month
-        daily_checkouts = [0] * days_in_month
         
-        bookings = Bookings.objects.all()
-        
-        for booking in bookings:
-            if booking.check_in_date and booking.check_in_date.month == month and booking.check_in_date.year == year:
-                if booking.status == 'checked_in' or booking.status == 'checked_out':
-                    day_idx = booking.check_in_date.day - 1
-                    if 0 <= day_idx < days_in_month:
-                        daily_checkins[day_idx] += 1
-            
-            if booking.check_out_date and booking.check_out_date.month == month and booking.check_out_date.year == year:
-                if booking.status == 'checked_out':
-                    day_idx = booking.check_out_date.day - 1
-                    if 0 <= day_idx < days_in_month:
-                        daily_checkouts[day_idx] += 1
+        rows = daily_stats(start_date, end_date)
+        daily_checkins = [row.check_ins for row in rows]
+        daily_checkouts = [row.check_outs for row in rows]
         
         return Response({
             "checkins": daily_checkins,
@@ -1416,16 +1329,7 @@ def daily_cancellations(request):
         
         end_date = end_date.replace(hour=23, minute=59, second=59)
         days_in_month = (end_date.day)
-        daily_cancellations = [0] * days_in_month        
-        cancelled_bookings = Bookings.objects.filter(
-            status='cancelled',
-            cancellation_date__gte=start_date,
-            cancellation_date__lte=end_date
-        )
-        
-        for booking in cancelled_bookings:
-            day_idx = booking.cancellation_date.day - 1
-            daily_cancellations[day_idx] += 1
+        daily_cancellations = [row.cancellations for row in daily_stats(start_date.date(), end_date.date())]
         
         return Response({
             "data": daily_cancellations,
@@ -1444,6 +1348,10 @@ def area_revenue(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))
+        try:
+            sort, top_n = parse_ranking_params(request.query_params)
+        except ValueError as ve:
+            return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
         start_date = datetime(year, month, 1)
         
         if month == 12:
@@ -1460,19 +1368,9 @@ def area_revenue(request):
             "year": year
         }
         
-        areas = Areas.objects.all()
-        
-        for area in areas:
-            area_revenue = Transactions.objects.filter(
-                booking__area=area,
-                transaction_date__gte=start_date,
-                transaction_date__lte=end_date,
-                status='completed',
-                booking__is_venue_booking=True
-            ).aggregate(Sum('amount'))['amount__sum'] or 0
-            
-            response_data["area_names"].append(area.area_name)
-            response_data["revenue_data"].append(float(area_revenue))
+        for area_name, area_revenue in property_revenue(True, start_date, end_date, sort, top_n):
+            response_data["area_names"].append(area_name)
+            response_data["revenue_data"].append(area_revenue)
         
         return Response(response_data, status=status.HTTP_200_OK)
     except Exception as e:
@@ -1486,6 +1384,10 @@ def area_bookings(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))        
+        try:
+            sort, top_n = parse_ranking_params(request.query_params)
+        except ValueError as ve:
+            return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
         start_date = datetime(year, month, 1)
         
         if month == 12:
@@ -1502,17 +1404,8 @@ def area_bookings(request):
             "year": year
         }
         
-        areas = Areas.objects.all()
-        
-        for area in areas:
-            area_bookings = Bookings.objects.filter(
-                area=area,
-                created_at__gte=start_date,
-                created_at__lte=end_date,
-                is_venue_booking=True
-            ).count()
-            
-            response_data["area_names"].append(area.area_name)
+        for area_name, area_bookings in property_booking_counts(True, start_date, end_date, sort, top_n):
+            response_data["area_names"].append(area_name)
             response_data["booking_counts"].append(area_bookings)
         
         return Response(response_data, status=status.HTTP_200_OK)
@@ -1527,6 +1420,10 @@ def room_revenue(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))        
+        try:
+            sort, top_n = parse_ranking_params(request.query_params)
+        except ValueError as ve:
+            return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
         start_date = datetime(year, month, 1)
         
         if month == 12:
@@ -1543,19 +1440,9 @@ def room_revenue(request):
             "year": year
         }
         
-        rooms = Rooms.objects.all()
-        
-        for room in rooms:
-            room_revenue = Transactions.objects.filter(
-                booking__room=room,
-                transaction_date__gte=start_date,
-                transaction_date__lte=end_date,
-                status='completed',
-                booking__is_venue_booking=False
-            ).aggregate(Sum('amount'))['amount__sum'] or 0
-            
-            response_data["room_names"].append(room.room_name)
-            response_data["revenue_data"].append(float(room_revenue))
+        for room_name, room_revenue in property_revenue(False, start_date, end_date, sort, top_n):
+            response_data["room_names"].append(room_name)
+            response_data["revenue_data"].append(room_revenue)
         
         return Response(response_data, status=status.HTTP_200_OK)
     except Exception as e:
@@ -1569,6 +1456,10 @@ def room_bookings(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))        
+        try:
+            sort, top_n = parse_ranking_params(request.query_params)
+        except ValueError as ve:
+            return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
         start_date = datetime(year, month, 1)
         
         if month == 12:
@@ -1585,17 +1476,8 @@ def room_bookings(request):
             "year": year
         }
         
-        rooms = Rooms.objects.all()
-        
-        for room in rooms:
-            room_bookings = Bookings.objects.filter(
-                room=room,
-                created_at__gte=start_date,
-                created_at__lte=end_date,
-                is_venue_booking=False
-            ).count()
-            
-            response_data["room_names"].append(room.room_name)
+        for room_name, room_bookings in property_booking_counts(False, start_date, end_date, sort, top_n):
+            response_data["room_names"].append(room_name)
             response_data["booking_counts"].append(room_bookings)
         
         return Response(response_data, status=status.HTTP_200_OK)
@@ -1620,28 +1502,9 @@ def daily_no_shows_rejected(request):
         end_date = end_date.replace(hour=23, minute=59, second=59)        
         days_in_month = (end_date.day)
         
-        daily_no_shows = [0] * days_in_month
-        daily_rejected = [0] * days_in_month
-        
-        no_show_bookings = Bookings.objects.filter(
-            status='missed_reservation',
-            updated_at__gte=start_date,
-            updated_at__lte=end_date
-        )
-        
-        rejected_bookings = Bookings.objects.filter(
-            status='rejected',
-            updated_at__gte=start_date,
-            updated_at__lte=end_date
-        )
-        
-        for booking in no_show_bookings:
-            day_idx = booking.updated_at.day - 1
-            daily_no_shows[day_idx] += 1
-        
-        for booking in rejected_bookings:
-            day_idx = booking.updated_at.day - 1
-            daily_rejected[day_idx] += 1
+        rows = daily_stats(start_date.date(), end_date.date())
+        daily_no_shows = [row.no_shows for row in rows]
+        daily_rejected = [row.rejections for row in rows]
         
         return Response({
             "no_shows": daily_no_shows,
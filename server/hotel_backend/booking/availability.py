@@ -0,0 +1,224 @@
+import bisect
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from .models import Bookings, BookingTombstone
+
+logger = logging.getLogger(__name__)
+
+# Bookings in these statuses no longer hold a room or area
+INACTIVE_STATUSES = ['cancelled', 'rejected', 'checked_out', 'no_show']
+
+_INDEX_FIELDS = ('id', 'room_id', 'area_id', 'is_venue_booking', 'check_in_date', 'check_out_date', 'status', 'updated_at')
+
+def _config():
+    config = getattr(settings, 'AVAILABILITY_INDEX', {})
+    return {
+        'SYNC_SECONDS': config.get('SYNC_SECONDS', 5),
+        'REBUILD_SECONDS': config.get('REBUILD_SECONDS', 600),
+        'SYNC_OVERLAP_SECONDS': config.get('SYNC_OVERLAP_SECONDS', 60),
+    }
+
+def _ordinal(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal() if isinstance(value, date) else None
+
+def booked_ids_query(is_venue_booking, arrival, departure):
+    """
+    The ids of the rooms (or areas) with a live booking overlapping [arrival, departure).
+    ``is_venue_booking__in`` compares the column instead of testing it bare, which SQLite
+    cannot match against bookings_venue_dates_idx.
+    """
+    unit_field = 'area_id' if is_venue_booking else 'room_id'
+    return Bookings.objects.filter(
+        ~Q(status__in=INACTIVE_STATUSES),
+        Q(check_in_date__lt=departure) & Q(check_out_date__gt=arrival),
+        is_venue_booking__in=[is_venue_booking]
+    ).exclude(**{f"{unit_field}__isnull": True}).values_list(unit_field, flat=True)
+
+def sql_booked_ids(is_venue_booking, arrival, departure):
+    """
+    Ids of the rooms (or areas) with a live booking overlapping [arrival, departure),
+    straight from the bookings table. This is the reference the index must agree with.
+    """
+    return set(booked_ids_query(is_venue_booking, arrival, departure))
+
+class _UnitIntervals:
+    """
+    Live booking intervals of a single room or area, kept as start-sorted arrays
+    with a running maximum of end dates so an overlap test is one bisect.
+    """
+    __slots__ = ('intervals', 'starts', 'max_ends', 'dirty')
+
+    def __init__(self):
+        self.intervals = {}
+        self.starts = []
+        self.max_ends = []
+        self.dirty = False
+
+    def _rebuild(self):
+        ordered = sorted(self.intervals.values())
+        self.starts = [start for start, _ in ordered]
+        self.max_ends = []
+        running = None
+        for _, end in ordered:
+            running = end if running is None or end > running else running
+            self.max_ends.append(running)
+        self.dirty = False
+
+    def overlaps(self, arrival, departure):
+        if self.dirty:
+            self._rebuild()
+        k = bisect.bisect_left(self.starts, departure)
+        return k > 0 and self.max_ends[k - 1] > arrival
+
+class AvailabilityIndex:
+    """
+    Per-room and per-area interval index of live bookings.
+
+    The index is built from the bookings table on first use and kept current in this
+    process by the Bookings post_save/post_delete signals. Writes made by other workers
+    show up within SYNC_SECONDS: each sync re-reads bookings by ``updated_at`` and
+    deletions by their BookingTombstone, both from SYNC_OVERLAP_SECONDS before the
+    newest value seen, so a transaction that commits after a later one is still picked
+    up as long as it commits within that margin. A full rebuild every REBUILD_SECONDS
+    bounds anything slower. New bookings are still checked against the bookings table
+    by validate_booking_request, so a stale index can never double-book a room.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._units = {False: {}, True: {}}
+        self._locations = {}
+        self._built_at = None
+        self._synced_at = None
+        self._watermark = None
+        self._tombstone_watermark = None
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    def _place(self, booking_id, room_id, area_id, is_venue_booking, check_in, check_out, status):
+        self._remove(booking_id)
+        unit_id = area_id if is_venue_booking else room_id
+        start, end = _ordinal(check_in), _ordinal(check_out)
+        if status in INACTIVE_STATUSES or unit_id is None or start is None or end is None:
+            return
+        unit = self._units[bool(is_venue_booking)].setdefault(unit_id, _UnitIntervals())
+        unit.intervals[booking_id] = (start, end)
+        unit.dirty = True
+        self._locations[booking_id] = (bool(is_venue_booking), unit_id)
+
+    def _remove(self, booking_id):
+        location = self._locations.pop(booking_id, None)
+        if location is None:
+            return
+        is_venue_booking, unit_id = location
+        unit = self._units[is_venue_booking].get(unit_id)
+        if unit is not None:
+            unit.intervals.pop(booking_id, None)
+            unit.dirty = True
+
+    def _advance_watermark(self, updated_at):
+        if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+
+    def build(self, rows=None):
+        """Rebuild the whole index. ``rows`` may be passed to index synthetic data."""
+        if rows is None:
+            rows = Bookings.objects.exclude(status__in=INACTIVE_STATUSES).values_list(*_INDEX_FIELDS)
+        with self._lock:
+            self._units = {False: {}, True: {}}
+            self._locations = {}
+            self._watermark = None
+            # Deletions before this point are already missing from ``rows``
+            self._tombstone_watermark = timezone.now()
+            for row in rows.iterator() if hasattr(rows, 'iterator') else rows:
+                self._place(*row[:7])
+                self._advance_watermark(row[7] if len(row) > 7 else None)
+            self._built_at = self._synced_at = time.monotonic()
+
+    def sync(self):
+        """
+        Apply every booking touched or deleted since the last sync (less the overlap
+        margin), including ones that became inactive.
+        """
+        overlap = timedelta(seconds=_config()['SYNC_OVERLAP_SECONDS'])
+        with self._lock:
+            rows = Bookings.objects.all()
+            if self._watermark is not None:
+                rows = rows.filter(updated_at__gte=self._watermark - overlap)
+            for row in rows.values_list(*_INDEX_FIELDS):
+                self._place(*row[:7])
+                self._advance_watermark(row[7])
+
+            tombstones = BookingTombstone.objects.all()
+            if self._tombstone_watermark is not None:
+                tombstones = tombstones.filter(deleted_at__gte=self._tombstone_watermark - overlap)
+            for booking_id, deleted_at in tombstones.values_list('booking_id', 'deleted_at'):
+                self._remove(booking_id)
+                if self._tombstone_watermark is None or deleted_at > self._tombstone_watermark:
+                    self._tombstone_watermark = deleted_at
+            self._synced_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        config = _config()
+        now = time.monotonic()
+        if self._built_at is None or now - self._built_at >= config['REBUILD_SECONDS']:
+            self.build()
+        elif now - self._synced_at >= config['SYNC_SECONDS']:
+            self.sync()
+
+    def apply(self, booking):
+        """Index a saved booking. A no-op until the index has been built."""
+        with self._lock:
+            if not self.is_built:
+                return
+            self._place(
+                booking.id,
+                booking.room_id,
+                booking.area_id,
+                booking.is_venue_booking,
+                booking.check_in_date,
+                booking.check_out_date,
+                booking.status,
+            )
+
+    def discard(self, booking_id):
+        with self._lock:
+            self._remove(booking_id)
+
+    def booked_ids(self, is_venue_booking, arrival, departure, refresh=True):
+        """Ids of the rooms (or areas) that have a live booking overlapping [arrival, departure)."""
+        arrival, departure = _ordinal(arrival), _ordinal(departure)
+        with self._lock:
+            if refresh:
+                self._ensure_fresh()
+            return {
+                unit_id for unit_id, unit in self._units[bool(is_venue_booking)].items()
+                if unit.overlaps(arrival, departure)
+            }
+
+    def booked_room_ids(self, arrival, departure):
+        return self.booked_ids(False, arrival, departure)
+
+    def booked_area_ids(self, arrival, departure):
+        return self.booked_ids(True, arrival, departure)
+
+def record_deletion(booking_id):
+    """
+    Leave a tombstone for a deleted booking and prune those every index has synced
+    past: a worker rebuilds at least every REBUILD_SECONDS, so older ones are unread.
+    """
+    config = _config()
+    retention = timedelta(seconds=2 * config['REBUILD_SECONDS'] + config['SYNC_OVERLAP_SECONDS'])
+    BookingTombstone.objects.create(booking_id=booking_id)
+    BookingTombstone.objects.filter(deleted_at__lt=timezone.now() - retention).delete()
+
+availability_index = AvailabilityIndex()
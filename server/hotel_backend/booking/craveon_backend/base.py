@@ -0,0 +1,6 @@
+from django.db.backends.mysql import base
+from booking.craveon_health import CircuitBreakerDatabaseMixin
+
+# MySQL backend for the SystemInteg (CraveOn) alias: the stock one, behind craveon_breaker
+class DatabaseWrapper(CircuitBreakerDatabaseMixin, base.DatabaseWrapper):
+    pass
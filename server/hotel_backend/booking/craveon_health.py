@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import OperationalError, InterfaceError
+
+logger = logging.getLogger(__name__)
+
+class CraveOnUnavailable(OperationalError):
+    """Raised instead of touching CraveOn while its circuit breaker is open."""
+
+def _config():
+    config = getattr(settings, 'CRAVEON_CIRCUIT_BREAKER', {})
+    return config.get('FAILURE_THRESHOLD', 5), config.get('RESET_SECONDS', 30)
+
+class CircuitBreaker:
+    """
+    Per-process circuit breaker around the SystemInteg database.
+
+    FAILURE_THRESHOLD consecutive connection or query failures (OperationalError,
+    InterfaceError, OSError: refused connections, timeouts, lost connections) open the
+    circuit, and every call then fails fast with CraveOnUnavailable. After
+    RESET_SECONDS one trial call is let through (half-open); its outcome closes
+    or re-opens the circuit. Errors the database itself reports, such as integrity
+    errors, prove it is reachable and count as successes.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._counters = Counter()
+        self._latency_total = 0.0
+        self._last_error = None
+
+    def _retry_in(self):
+        return max(0.0, self._opened_at + _config()[1] - time.monotonic())
+
+    def available(self):
+        """False while the circuit is open and calls would be rejected."""
+        with self._lock:
+            return self.state != self.OPEN or self._retry_in() == 0
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if self._retry_in() > 0:
+                    self._counters['rejected'] += 1
+                    raise CraveOnUnavailable(
+                        f"{self.name} is unavailable; retrying in {self._retry_in():.0f}s"
+                    )
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    self._counters['rejected'] += 1
+                    raise CraveOnUnavailable(f"{self.name} is unavailable; a trial call is in progress")
+                self._trial_in_flight = True
+            self._counters['calls'] += 1
+
+    def record_success(self, elapsed):
+        with self._lock:
+            self._counters['successes'] += 1
+            self._latency_total += elapsed
+            self._consecutive_failures = 0
+            if self.state != self.CLOSED:
+                logger.info(f"{self.name} circuit closed")
+                self.state = self.CLOSED
+                self._trial_in_flight = False
+
+    def record_failure(self, error):
+        threshold, _ = _config()
+        with self._lock:
+            self._counters['failures'] += 1
+            self._consecutive_failures += 1
+            self._last_error = str(error)
+            if self.state == self.HALF_OPEN or self._consecutive_failures >= threshold:
+                if self.state != self.OPEN:
+                    self._counters['opened'] += 1
+                    logger.error(f"{self.name} circuit opened after: {error}")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    @contextmanager
+    def guard(self):
+        self.before_call()
+        started = time.monotonic()
+        try:
+            yield
+        except (OperationalError, InterfaceError, OSError) as e:
+            self.record_failure(e)
+            raise
+        except Exception:
+            self.record_success(time.monotonic() - started)
+            raise
+        else:
+            self.record_success(time.monotonic() - started)
+
+    def metrics(self):
+        with self._lock:
+            successes = self._counters['successes']
+            return {
+                'state': self.state,
+                'consecutive_failures': self._consecutive_failures,
+                'retry_in_seconds': round(self._retry_in(), 1) if self.state == self.OPEN else 0,
+                'calls': self._counters['calls'],
+                'successes': successes,
+                'failures': self._counters['failures'],
+                'rejected': self._counters['rejected'],
+                'times_opened': self._counters['opened'],
+                'average_latency_ms': round(self._latency_total * 1000 / successes, 2) if successes else None,
+                'last_error': self._last_error,
+            }
+
+craveon_breaker = CircuitBreaker('CraveOn database')
+
+_connection_counters = Counter()
+_connection_lock = threading.Lock()
+
+def count_connection_event(event):
+    with _connection_lock:
+        _connection_counters[event] += 1
+
+def connection_metrics():
+    """Persistent connection lifecycle counts for this process."""
+    with _connection_lock:
+        opened = _connection_counters['opened']
+        closed = _connection_counters['closed']
+        return {
+            'opened': opened,
+            'closed': closed,
+            'open': opened - closed,
+            'health_check_failures': _connection_counters['health_check_failures'],
+        }
+
+class CircuitBreakerDatabaseMixin:
+    """
+    DatabaseWrapper mixin that routes every connect and every query of the
+    connection through craveon_breaker and counts connection lifecycle events.
+    """
+    breaker = craveon_breaker
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.execute_wrappers.append(self._guard_execute)
+
+    def _guard_execute(self, execute, sql, params, many, context):
+        with self.breaker.guard():
+            return execute(sql, params, many, context)
+
+    def connect(self):
+        # ensure_connection() only translates driver errors outside connect(), so
+        # translate here for the breaker to see refused or timed out connects as failures
+        with self.breaker.guard(), self.wrap_database_errors:
+            super().connect()
+        count_connection_event('opened')
+
+    def is_usable(self):
+        usable = super().is_usable()
+        if not usable:
+            count_connection_event('health_check_failures')
+        return usable
+
+    def _close(self):
+        if self.connection is not None:
+            count_connection_event('closed')
+        super()._close()
@@ -1,11 +1,48 @@
-from django.db import connections
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, OperationalError, InterfaceError
+from django.db.models.functions import MD5
 from .models import CraveOnItem
+from .craveon_health import craveon_breaker, CraveOnUnavailable
 from typing import Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+MENU_CACHE_KEY = 'craveon:menu'
+
 class CraveOnIntegration:
+    @staticmethod
+    def get_menu() -> Dict[str, Any]:
+        """
+        Active menu items as plain rows (image BLOBs stay in CraveOn; only their MD5 is
+        read). Every successful read refreshes a long-lived cached copy, which is served
+        instead, flagged as stale, while CraveOn is unreachable or its breaker is open.
+        """
+        if craveon_breaker.available():
+            try:
+                items = CraveOnItem.objects.using('SystemInteg').filter(
+                    is_archived=False
+                ).select_related('category').defer('image').annotate(image_hash=MD5('image'))
+                rows = [{
+                    'item_id': item.item_id,
+                    'item_name': item.item_name,
+                    'price': float(item.price),
+                    'image_hash': item.image_hash,
+                    'category_id': item.category.category_id if item.category else None,
+                    'category_name': item.category.category_name if item.category else "",
+                } for item in items]
+                menu_ttl = getattr(settings, 'CRAVEON_CIRCUIT_BREAKER', {}).get('MENU_CACHE_SECONDS', 86400)
+                cache.set(MENU_CACHE_KEY, rows, menu_ttl)
+                return {'items': rows, 'stale': False}
+            except (OperationalError, InterfaceError) as e:
+                logger.error(f"Falling back to the cached CraveOn menu: {str(e)}")
+        
+        rows = cache.get(MENU_CACHE_KEY)
+        if rows is None:
+            raise CraveOnUnavailable("CraveOn is unavailable and no menu is cached")
+        return {'items': rows, 'stale': True}
+
     @staticmethod
     def get_or_create_craveon_user(hotel_user, booking) -> int:
         """
@@ -50,7 +87,7 @@ class CraveOnIntegration:
             raise
     
     @staticmethod
-    def create_craveon_order(craveon_user_id: int, total_amount: float, payment_ss_data: str, booking_id: int, hotel_user, booking) -> int:
+    def create_craveon_order(craveon_user_id: int, total_amount: float, payment_ss_data: str, booking_id: int, hotel_user, booking, idempotency_key: str = None) -> int:
         """
         Create a new order in CraveOn database with all hotel information.
         Returns the CraveOn order_id.
@@ -65,8 +102,8 @@ class CraveOnIntegration:
             
             cursor.execute(
                 """INSERT INTO orders (user_id, total_amount, status, payment_ss, payment_submitted, 
-                   booking_id, hotel_room_area, guest_email, guest_name, ordered_at) 
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())""",
+                   booking_id, hotel_room_area, guest_email, guest_name, idempotency_key, ordered_at) 
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())""",
                 [
                     craveon_user_id,
                     total_amount,
@@ -76,7 +113,8 @@ class CraveOnIntegration:
                     booking_id,
                     hotel_room_area,
                     hotel_user.email,
-                    guest_name
+                    guest_name,
+                    idempotency_key
                 ]
             )
             
@@ -87,6 +125,19 @@ class CraveOnIntegration:
             print(f"Error creating CraveOn order: {str(e)}")
             raise
     
+    @staticmethod
+    def find_order_by_idempotency_key(idempotency_key: str):
+        """
+        The (order_id, user_id) of the CraveOn order created for ``idempotency_key``,
+        or None when it has not been delivered yet.
+        """
+        cursor = connections['SystemInteg'].cursor()
+        cursor.execute(
+            "SELECT order_id, user_id FROM orders WHERE idempotency_key = %s",
+            [idempotency_key]
+        )
+        return cursor.fetchone()
+    
     @staticmethod
     def add_order_items(order_id: int, cart_items: list):
         """
@@ -95,11 +146,11 @@ class CraveOnIntegration:
         cursor = connections['SystemInteg'].cursor()
         
         try:
-            for item in cart_items:
-                cursor.execute(
-                    "INSERT INTO order_items (order_id, item_id, quantity) VALUES (%s, %s, %s)",
-                    [order_id, item.get('item_id'), item.get('quantity', 1)]
-                )
+            # A single multi-row INSERT instead of one round trip per cart line
+            cursor.executemany(
+                "INSERT INTO order_items (order_id, item_id, quantity) VALUES (%s, %s, %s)",
+                [[order_id, item.get('item_id'), item.get('quantity', 1)] for item in cart_items]
+            )
                         
         except Exception as e:
             print(f"Error adding items to CraveOn order: {str(e)}")
@@ -116,32 +167,59 @@ class CraveOnIntegration:
         validated_items = []
         
         try:
+            lines = []
+            invalid_line = None
             for item in cart_items:
-                item_id = item.get('item_id')
-                quantity = int(item.get('quantity', 1))
-                
-                if not item_id or quantity <= 0:
-                    raise ValueError(f"Invalid item or quantity: {item}")
-                
-                craveon_item = CraveOnItem.objects.using('SystemInteg').filter(
-                    item_id=item_id,
-                    is_archived=False
-                ).first()
+                try:
+                    item_id = item.get('item_id')
+                    quantity = int(item.get('quantity', 1))
+                    if not item_id or quantity <= 0:
+                        raise ValueError(f"Invalid item or quantity: {item}")
+                except Exception as e:
+                    invalid_line = e
+                    break
+                lines.append((item_id, quantity))
+            
+            # Every cart line's item in one query, without the image BLOBs
+            try:
+                craveon_items = {
+                    item.item_id: (item.item_name, float(item.price))
+                    for item in CraveOnItem.objects.using('SystemInteg').filter(
+                        item_id__in={item_id for item_id, _ in lines},
+                        is_archived=False
+                    ).only('item_id', 'item_name', 'price')
+                } if lines else {}
+            except (OperationalError, InterfaceError) as e:
+                # CraveOn is down: price the cart from the cached menu so the order can
+                # still be queued (raises CraveOnUnavailable when nothing is cached)
+                logger.error(f"Validating cart against the cached CraveOn menu: {str(e)}")
+                craveon_items = {
+                    row['item_id']: (row['item_name'], row['price'])
+                    for row in CraveOnIntegration.get_menu()['items']
+                }
+            
+            # Report problems in cart order, as if each line had been checked in turn
+            for item_id, quantity in lines:
+                craveon_item = craveon_items.get(int(item_id))
                 
                 if not craveon_item:
                     raise ValueError(f"Item with ID {item_id} not found or archived")
                 
-                item_total = float(craveon_item.price) * quantity
+                item_name, price = craveon_item
+                item_total = price * quantity
                 total_amount += item_total
                 
                 validated_items.append({
                     'item_id': item_id,
                     'quantity': quantity,
-                    'price': float(craveon_item.price),
+                    'price': price,
                     'item_total': item_total,
-                    'name': craveon_item.item_name
+                    'name': item_name
                 })
             
+            if invalid_line is not None:
+                raise invalid_line
+            
             return {
                 'valid': True,
                 'total_amount': total_amount,
@@ -149,6 +227,8 @@ class CraveOnIntegration:
                 'item_count': len(validated_items)
             }
             
+        except CraveOnUnavailable:
+            raise
         except Exception as e:
             print(f"Cart validation error: {str(e)}")
             return {
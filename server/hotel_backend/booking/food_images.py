@@ -0,0 +1,119 @@
+import hashlib
+import imghdr
+import io
+import logging
+import threading
+from collections import OrderedDict
+from django.conf import settings
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; derivatives are then the original bytes
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+EMPTY_IMAGE_HASH = hashlib.md5(b'').hexdigest()
+
+def _config():
+    config = getattr(settings, 'FOOD_IMAGE_CACHE', {})
+    return {
+        'MAX_BYTES': config.get('MAX_BYTES', 64 * 1024 * 1024),
+        'SIZES': config.get('SIZES', {'thumb': 320, 'full': 1280}),
+        'MAX_AGE': config.get('MAX_AGE', 60 * 60 * 24 * 365),
+    }
+
+def derivative_sizes():
+    return _config()['SIZES']
+
+def image_hash(data):
+    return hashlib.md5(data).hexdigest()
+
+def _mime(data):
+    image_type = imghdr.what(None, h=data)
+    return f"image/{image_type}" if image_type else 'application/octet-stream'
+
+def make_derivative(data, size):
+    """
+    ``data`` scaled down to fit a ``size`` x ``size`` box, in its original format.
+    Images that already fit, formats Pillow cannot re-encode, and a missing Pillow
+    all give back the original bytes.
+    """
+    max_side = derivative_sizes()[size]
+    if Image is None:
+        return data, _mime(data)
+    try:
+        image = Image.open(io.BytesIO(data))
+        image_format = image.format
+        if max(image.size) <= max_side or image_format not in ('JPEG', 'PNG', 'WEBP'):
+            return data, _mime(data)
+        image.thumbnail((max_side, max_side))
+        output = io.BytesIO()
+        if image_format == 'JPEG':
+            image.save(output, image_format, quality=85, optimize=True)
+        else:
+            image.save(output, image_format, optimize=True)
+        return output.getvalue(), Image.MIME[image_format]
+    except Exception as e:
+        logger.warning(f"Could not resize food image: {str(e)}")
+        return data, _mime(data)
+
+class ImageDerivativeCache:
+    """
+    In-process LRU of resized food images keyed by (item_id, content hash, size),
+    bounded by the total size of the cached bytes. A new image gets a new hash, so
+    entries never go stale; old versions simply age out.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def get(self, item_id, content_hash, size):
+        key = (item_id, content_hash, size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, item_id, content_hash, size, entry):
+        key = (item_id, content_hash, size)
+        max_bytes = _config()['MAX_BYTES']
+        if len(entry[0]) > max_bytes:
+            return entry
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            self._entries[key] = entry
+            self._bytes += len(entry[0])
+            while self._bytes > max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[0])
+        return entry
+
+    def get_or_create(self, item_id, data, size):
+        """The (bytes, mime) derivative of ``data``, resized once per content hash."""
+        content_hash = image_hash(data)
+        entry = self.get(item_id, content_hash, size)
+        if entry is None:
+            entry = self.put(item_id, content_hash, size, make_derivative(data, size))
+        return content_hash, entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+image_derivatives = ImageDerivativeCache()
+
+def cache_headers(response, content_hash, size, immutable=True):
+    """Strong ETag for the derivative, cached for a year when the URL names its version."""
+    response['ETag'] = f'"{content_hash}-{size}"'
+    if immutable:
+        response['Cache-Control'] = f"public, max-age={_config()['MAX_AGE']}, immutable"
+    else:
+        response['Cache-Control'] = 'no-cache'
+    return response
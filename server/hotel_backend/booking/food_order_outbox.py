@@ -0,0 +1,179 @@
+import base64
+import logging
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+from .models import Bookings, FoodOrderOutbox
+from .craveon_integration import CraveOnIntegration
+from .craveon_health import craveon_breaker, CraveOnUnavailable
+
+logger = logging.getLogger(__name__)
+
+# Food orders are recorded in the hotel database by place_food_order and delivered to
+# CraveOn afterwards by the process_food_order_outbox worker. Every entry carries an
+# idempotency key that is written to the CraveOn order, so a retry after a delivery
+# whose outcome was lost finds that order instead of creating a second one.
+
+def _config():
+    config = getattr(settings, 'FOOD_ORDER_OUTBOX', {})
+    return {
+        'MAX_ATTEMPTS': config.get('MAX_ATTEMPTS', 8),
+        'RETRY_BASE_SECONDS': config.get('RETRY_BASE_SECONDS', 5),
+        'RETRY_MAX_SECONDS': config.get('RETRY_MAX_SECONDS', 15 * 60),
+        'LEASE_SECONDS': config.get('LEASE_SECONDS', 2 * 60),
+    }
+
+def _namespaced_key(user_id, idempotency_key):
+    # Namespaced per guest so one guest's key can never collide with another's
+    return f"{user_id}-{idempotency_key}"
+
+def max_idempotency_key_length(user_id):
+    """Longest Idempotency-Key ``user_id`` may send; stored keys are never truncated."""
+    return FoodOrderOutbox._meta.get_field('idempotency_key').max_length - len(_namespaced_key(user_id, ''))
+
+class IdempotencyKeyReused(Exception):
+    """An Idempotency-Key was sent again with a different booking or cart."""
+
+def _same_order(entry, booking, items):
+    def lines(order_items):
+        return sorted((int(item['item_id']), int(item['quantity'])) for item in order_items)
+    return entry.booking_id == booking.id and lines(entry.items) == lines(items)
+
+def _replay(idempotency_key, booking, items):
+    existing = FoodOrderOutbox.objects.filter(idempotency_key=idempotency_key).first()
+    if existing and not _same_order(existing, booking, items):
+        raise IdempotencyKeyReused("This Idempotency-Key was already used for a different order")
+    return existing
+
+def enqueue_food_order(hotel_user, booking, items, total_amount, payment_ss, idempotency_key=None):
+    """
+    Record a food order for delivery; ``items`` are the lines returned by
+    CraveOnIntegration.validate_cart_items. Repeating a request with the same
+    ``idempotency_key`` returns the entry recorded the first time, also when the
+    two requests race; repeating it with a different booking or cart raises
+    IdempotencyKeyReused. Keys longer than max_idempotency_key_length raise ValueError.
+    """
+    items = [{'item_id': item['item_id'], 'quantity': item['quantity']} for item in items]
+    if idempotency_key:
+        if len(idempotency_key) > max_idempotency_key_length(hotel_user.id):
+            raise ValueError("Idempotency-Key is too long")
+        idempotency_key = _namespaced_key(hotel_user.id, idempotency_key)
+        existing = _replay(idempotency_key, booking, items)
+        if existing:
+            return existing, False
+    try:
+        with transaction.atomic():
+            entry = FoodOrderOutbox.objects.create(
+                idempotency_key=idempotency_key or uuid.uuid4().hex,
+                booking=booking,
+                user=hotel_user,
+                items=items,
+                total_amount=total_amount,
+                payment_ss=payment_ss,
+            )
+    except IntegrityError:
+        # A concurrent request with the same key got there first
+        existing = _replay(idempotency_key, booking, items) if idempotency_key else None
+        if existing is None:
+            raise
+        return existing, False
+    return entry, True
+
+def _claim(entry_id, now):
+    """Take the entry for this worker; False when another worker holds it or it is not due."""
+    lease = now + timedelta(seconds=_config()['LEASE_SECONDS'])
+    due = Q(status='pending', next_attempt_at__lte=now) | Q(status='processing', locked_until__lt=now)
+    return FoodOrderOutbox.objects.filter(due, id=entry_id).update(status='processing', locked_until=lease) == 1
+
+def retry_delay(attempts):
+    config = _config()
+    return min(config['RETRY_BASE_SECONDS'] * 2 ** (attempts - 1), config['RETRY_MAX_SECONDS'])
+
+def deliver(entry):
+    """Create the CraveOn order for ``entry`` unless an earlier attempt already did."""
+    booking = entry.booking
+    with transaction.atomic(using='SystemInteg'):
+        delivered = CraveOnIntegration.find_order_by_idempotency_key(entry.idempotency_key)
+        if delivered:
+            order_id, craveon_user_id = delivered
+        else:
+            craveon_user_id = CraveOnIntegration.get_or_create_craveon_user(entry.user, booking)
+            order_id = CraveOnIntegration.create_craveon_order(
+                craveon_user_id,
+                float(entry.total_amount),
+                base64.b64encode(bytes(entry.payment_ss)).decode('utf-8'),
+                booking.id,
+                entry.user,
+                booking,
+                idempotency_key=entry.idempotency_key
+            )
+            CraveOnIntegration.add_order_items(order_id, entry.items)
+
+    with transaction.atomic():
+        FoodOrderOutbox.objects.filter(id=entry.id).update(
+            status='sent',
+            craveon_user_id=craveon_user_id,
+            craveon_order_id=order_id,
+            payment_ss=b'',
+            locked_until=None,
+            last_error=None,
+            sent_at=timezone.now(),
+        )
+        Bookings.objects.filter(id=booking.id).update(has_food_order=True)
+    return order_id
+
+def _record_failure(entry, error):
+    attempts = entry.attempts + 1
+    if attempts >= _config()['MAX_ATTEMPTS']:
+        logger.error(f"Giving up on food order {entry.idempotency_key} after {attempts} attempts: {error}")
+        changes = {'status': 'failed'}
+    else:
+        changes = {'status': 'pending', 'next_attempt_at': timezone.now() + timedelta(seconds=retry_delay(attempts))}
+    FoodOrderOutbox.objects.filter(id=entry.id).update(
+        attempts=attempts, locked_until=None, last_error=str(error), **changes
+    )
+    return changes['status']
+
+def _release(entry):
+    """Hand a claimed entry back untouched, as if this worker had never picked it up."""
+    FoodOrderOutbox.objects.filter(id=entry.id).update(status='pending', locked_until=None)
+
+def process_outbox(batch_size=50):
+    """
+    Deliver due outbox entries to CraveOn, oldest first. Safe to run from several
+    workers at once: each entry is claimed with a conditional UPDATE and the claim
+    lapses after LEASE_SECONDS should a worker die mid-delivery. Stops early while
+    the CraveOn circuit breaker is open, without spending the entries' attempts.
+    """
+    result = {'sent': 0, 'retrying': 0, 'failed': 0, 'skipped': 0}
+    now = timezone.now()
+    due_ids = list(FoodOrderOutbox.objects.filter(
+        Q(status='pending', next_attempt_at__lte=now) | Q(status='processing', locked_until__lt=now)
+    ).order_by('next_attempt_at', 'id').values_list('id', flat=True)[:batch_size])
+
+    for position, entry_id in enumerate(due_ids):
+        if not craveon_breaker.available():
+            result['skipped'] = len(due_ids) - position
+            break
+        if not _claim(entry_id, timezone.now()):
+            continue
+        entry = FoodOrderOutbox.objects.select_related(
+            'user', 'booking', 'booking__room', 'booking__area'
+        ).get(id=entry_id)
+        try:
+            deliver(entry)
+            result['sent'] += 1
+        except CraveOnUnavailable as e:
+            # The breaker opened during this batch; nothing reached CraveOn
+            logger.warning(f"Stopping food order delivery, CraveOn is unavailable: {str(e)}")
+            _release(entry)
+            result['skipped'] = len(due_ids) - position
+            break
+        except Exception as e:
+            logger.warning(f"Delivering food order {entry.idempotency_key} failed: {str(e)}")
+            status = _record_failure(entry, e)
+            result['retrying' if status == 'pending' else 'failed'] += 1
+    return result
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from django.db import transaction
+from .models import Bookings, RoomNightInventory
+from .availability import INACTIVE_STATUSES
+
+# One row per (live booking, date it occupies), so availability and calendar screens
+# are indexed (room, date) / (area, date) lookups instead of interval scans over
+# bookings. Rows belong to a single booking, so concurrent writes to different
+# bookings of one room never contend for the same row.
+
+def booking_nights(check_in_date, check_out_date):
+    """
+    Dates a booking occupies: check-in up to (not including) check-out.
+    Same-day venue bookings occupy their single day.
+    """
+    end = max(check_out_date, check_in_date + timedelta(days=1))
+    day = check_in_date
+    while day < end:
+        yield day
+        day += timedelta(days=1)
+
+def _unit_field(is_venue_booking):
+    return 'area_id' if is_venue_booking else 'room_id'
+
+def _night_rows(booking):
+    unit_id = booking.area_id if booking.is_venue_booking else booking.room_id
+    if booking.status in INACTIVE_STATUSES or unit_id is None or not (booking.check_in_date and booking.check_out_date):
+        return []
+    same_day = booking.check_in_date == booking.check_out_date
+    return [
+        RoomNightInventory(
+            booking_id=booking.id, date=night, status=booking.status, same_day=same_day,
+            **{_unit_field(booking.is_venue_booking): unit_id}
+        )
+        for night in booking_nights(booking.check_in_date, booking.check_out_date)
+    ]
+
+def sync_booking_nights(booking):
+    """Replace a saved booking's inventory rows with the dates it holds now."""
+    with transaction.atomic():
+        RoomNightInventory.objects.filter(booking_id=booking.id).delete()
+        RoomNightInventory.objects.bulk_create(_night_rows(booking), ignore_conflicts=True)
+
+def rebuild_all_nights(batch_size=500):
+    """Recompute the whole inventory table from the bookings table."""
+    bookings = Bookings.objects.exclude(status__in=INACTIVE_STATUSES).only(
+        'id', 'room_id', 'area_id', 'is_venue_booking', 'check_in_date', 'check_out_date', 'status'
+    )
+    with transaction.atomic():
+        RoomNightInventory.objects.all().delete()
+        rows = []
+        for booking in bookings.iterator(chunk_size=batch_size):
+            rows.extend(_night_rows(booking))
+            if len(rows) >= batch_size:
+                RoomNightInventory.objects.bulk_create(rows)
+                rows = []
+        RoomNightInventory.objects.bulk_create(rows)
+    return RoomNightInventory.objects.count()
+
+def occupied_ids_query(is_venue_booking, arrival, departure):
+    """
+    Ids of the rooms (or areas) with a live booking overlapping [arrival, departure),
+    with the same overlap rule as booking.availability.sql_booked_ids: a same-day
+    booking only counts when it falls after the arrival date.
+    """
+    unit_field = _unit_field(is_venue_booking)
+    return RoomNightInventory.objects.filter(
+        date__gte=arrival,
+        date__lt=departure,
+        **{f"{unit_field}__isnull": False}
+    ).exclude(same_day=True, date=arrival).values_list(unit_field, flat=True).distinct()
+
+def occupied_unit_ids(is_venue_booking, arrival, departure):
+    return set(occupied_ids_query(is_venue_booking, arrival, departure))
+
+def calendar_bookings(is_venue_booking, unit_id, start=None, end=None):
+    """
+    Live bookings of one room or area holding a date in [start, end], plus those
+    checking out on ``start``, which the calendar still marks. Either bound may be None.
+    """
+    nights = RoomNightInventory.objects.filter(**{_unit_field(is_venue_booking): unit_id})
+    if end is not None:
+        nights = nights.filter(date__lte=end)
+    if start is not None:
+        nights = nights.filter(date__gte=start - timedelta(days=1))
+    bookings = Bookings.objects.filter(id__in=nights.values('booking_id'))
+    if start is not None:
+        bookings = bookings.filter(check_out_date__gte=start)
+    return bookings.order_by('id')
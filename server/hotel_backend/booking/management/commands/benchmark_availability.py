@@ -0,0 +1,51 @@
+import random
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from booking.availability import AvailabilityIndex
+
+class Command(BaseCommand):
+    help = 'Benchmark availability index build and lookup time on synthetic bookings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, default=100000)
+        parser.add_argument('--rooms', type=int, default=200)
+        parser.add_argument('--areas', type=int, default=20)
+        parser.add_argument('--queries', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        start_day = date.today() - timedelta(days=5 * 365)
+        rows = []
+        for booking_id in range(1, options['bookings'] + 1):
+            is_venue_booking = random.random() < 0.1
+            check_in = start_day + timedelta(days=random.randint(0, 6 * 365))
+            check_out = check_in + timedelta(days=random.randint(1, 14))
+            rows.append((
+                booking_id,
+                None if is_venue_booking else random.randint(1, options['rooms']),
+                random.randint(1, options['areas']) if is_venue_booking else None,
+                is_venue_booking,
+                check_in,
+                check_out,
+                random.choice(['pending', 'reserved', 'confirmed', 'checked_in']),
+            ))
+
+        index = AvailabilityIndex()
+        began = time.perf_counter()
+        index.build(rows)
+        build_ms = (time.perf_counter() - began) * 1000
+
+        # The first lookup pays for sorting each unit's intervals
+        index.booked_ids(False, start_day, start_day + timedelta(days=1), refresh=False)
+        index.booked_ids(True, start_day, start_day + timedelta(days=1), refresh=False)
+
+        began = time.perf_counter()
+        for _ in range(options['queries']):
+            arrival = start_day + timedelta(days=random.randint(0, 6 * 365))
+            departure = arrival + timedelta(days=random.randint(1, 14))
+            index.booked_ids(False, arrival, departure, refresh=False)
+            index.booked_ids(True, arrival, departure, refresh=False)
+        query_ms = (time.perf_counter() - began) * 1000 / options['queries']
+
+        self.stdout.write(f"Indexed {len(rows)} bookings in {build_ms:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Average availability lookup (rooms + areas): {query_ms:.3f} ms"))
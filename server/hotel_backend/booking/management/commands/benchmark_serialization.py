@@ -0,0 +1,65 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from hotel_backend.renderers import FastJSONRenderer
+from property.models import Rooms, Areas
+from property.serializers import RoomSerializer, AreaSerializer
+from property.rows import room_rows, area_rows
+from booking.models import Bookings
+from booking.serializers import BookingSerializer
+from booking.rows import booking_rows
+
+class Command(BaseCommand):
+    help = 'Compare per-request serialization cost of the serializer + JSONRenderer path with the row builder + FastJSONRenderer path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--page-size', type=int, default=50, help='Bookings per rendered page')
+
+    def _time(self, build, renderer):
+        began = time.perf_counter()
+        for _ in range(self.iterations):
+            content = renderer.render({"data": build()})
+        return (time.perf_counter() - began) * 1000 / self.iterations, content
+
+    def handle(self, *args, **options):
+        self.iterations = options['iterations']
+        if self.iterations <= 0 or options['page_size'] <= 0:
+            raise CommandError("--iterations and --page-size must be positive")
+
+        # Bookings are loaded once so only the serialization is timed, as in the views
+        # where the page is fetched before it is serialized.
+        bookings = list(Bookings.objects.for_listing().order_by('-created_at')[:options['page_size']])
+        cases = [
+            (
+                'rooms',
+                lambda: RoomSerializer(Rooms.objects.filter(status='available'), many=True).data,
+                lambda: room_rows(Rooms.objects.filter(status='available')),
+            ),
+            (
+                'areas',
+                lambda: AreaSerializer(Areas.objects.filter(status='available'), many=True).data,
+                lambda: area_rows(Areas.objects.filter(status='available')),
+            ),
+            (
+                f'bookings ({len(bookings)} rows)',
+                lambda: BookingSerializer(bookings, many=True).data,
+                lambda: booking_rows(bookings),
+            ),
+        ]
+
+        mismatches = 0
+        for name, before, after in cases:
+            before_ms, before_content = self._time(before, JSONRenderer())
+            after_ms, after_content = self._time(after, FastJSONRenderer())
+            same = before_content == after_content
+            mismatches += not same
+            self.stdout.write(
+                f"{name}: {before_ms:.2f} ms -> {after_ms:.2f} ms "
+                f"({before_ms / after_ms if after_ms else 0:.1f}x, {len(after_content)} bytes, "
+                f"{'identical' if same else 'DIFFERENT'} output)"
+            )
+
+        if mismatches:
+            raise CommandError(f"{mismatches} endpoint(s) rendered different bytes")
+        self.stdout.write(self.style.SUCCESS("Successfully benchmarked serialization; output is byte-identical"))
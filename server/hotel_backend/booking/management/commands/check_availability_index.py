@@ -0,0 +1,40 @@
+import random
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from booking.availability import AvailabilityIndex, sql_booked_ids
+from booking.inventory import occupied_unit_ids
+
+class Command(BaseCommand):
+    help = 'Compare the in-memory availability index and the room-night inventory against the SQL availability query'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=200, help='Number of random date ranges to compare')
+        parser.add_argument('--days', type=int, default=365, help='Window around today to sample arrival dates from')
+
+    def handle(self, *args, **options):
+        index = AvailabilityIndex()
+        index.build()
+        today = timezone.now().date()
+        mismatches = 0
+
+        for _ in range(options['samples']):
+            arrival = today + timedelta(days=random.randint(-options['days'], options['days']))
+            departure = arrival + timedelta(days=random.randint(1, 30))
+            for is_venue_booking in (False, True):
+                expected = sql_booked_ids(is_venue_booking, arrival, departure)
+                for source, actual in (
+                    ('index', index.booked_ids(is_venue_booking, arrival, departure, refresh=False)),
+                    ('inventory', occupied_unit_ids(is_venue_booking, arrival, departure)),
+                ):
+                    if expected != actual:
+                        mismatches += 1
+                        kind = 'areas' if is_venue_booking else 'rooms'
+                        self.stdout.write(self.style.ERROR(
+                            f"{source} {kind} {arrival} -> {departure}: missing {sorted(expected - actual)}, extra {sorted(actual - expected)}"
+                        ))
+
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"Availability index or inventory disagrees with SQL on {mismatches} lookups"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Availability index and inventory match SQL on {options['samples'] * 2} lookups"))
@@ -0,0 +1,80 @@
+from datetime import datetime, time, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from booking.models import Bookings, RoomNightInventory
+from booking.inventory import occupied_ids_query, calendar_bookings
+from booking.validations.booking import guest_room_bookings_between, bookings_created_on
+from admin_dashboard.stats import dashboard_bookings, checked_in_room_ids
+
+def hot_queries():
+    """
+    The Bookings queries that run on every search, dashboard load and booking request,
+    built by the same helpers the views and validators call.
+    """
+    today = timezone.now().date()
+    arrival, departure = today, today + timedelta(days=3)
+    month_start = timezone.make_aware(datetime.combine(today.replace(day=1), time.min))
+    month_end = month_start + timedelta(days=31)
+
+    return {
+        'fetch_availability (rooms)': occupied_ids_query(False, arrival, departure),
+        'fetch_availability (areas)': occupied_ids_query(True, arrival, departure),
+        'room calendar': calendar_bookings(False, 1, arrival, departure),
+        'area calendar': calendar_bookings(True, 1, arrival, departure),
+        'dashboard_stats (bookings)': dashboard_bookings(month_start, month_end),
+        'dashboard_stats (checked-in rooms)': checked_in_room_ids(month_start, month_end),
+        'validate_email': guest_room_bookings_between('guest@example.com', arrival, departure),
+        'validate_max_bookings_per_day': bookings_created_on(1, today),
+        'room active bookings': Bookings.objects.occupying().filter(room_id=1),
+        'area active bookings': Bookings.objects.occupying().filter(area_id=1),
+    }
+
+# Backends whose EXPLAIN output full_scans can read
+EXPLAIN_VENDORS = ('mysql', 'sqlite', 'postgresql')
+
+def full_scans(queryset):
+    """Return the plan lines in which the bookings or room-night table is read without an index."""
+    connection = connections[queryset.db]
+    tables = (Bookings._meta.db_table, RoomNightInventory._meta.db_table)
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return [
+                f"table={row['table']} type={row['type']} rows={row['rows']}"
+                for row in rows if row['table'] in tables and row['type'] == 'ALL'
+            ]
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            details = [row[-1] for row in cursor.fetchall()]
+            return [
+                detail for detail in details
+                if any(detail.split(' ')[:2] == ['SCAN', table] for table in tables) and 'USING' not in detail
+            ]
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"EXPLAIN {sql}", params)
+            return [
+                row[0].strip() for row in cursor.fetchall()
+                if any(f"Seq Scan on {table} " in row[0] for table in tables)
+            ]
+    raise CommandError(f"EXPLAIN parsing is not supported for {connection.vendor}")
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN on the hot Bookings queries and fail if any of them falls back to a full table scan'
+
+    def handle(self, *args, **options):
+        regressions = []
+        for name, queryset in hot_queries().items():
+            scans = full_scans(queryset)
+            if scans:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}: {'; '.join(scans)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"indexed    {name}"))
+
+        if regressions:
+            raise CommandError(f"{len(regressions)} hot Bookings queries regressed to a full table scan")
@@ -0,0 +1,26 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from booking.food_order_outbox import process_outbox
+
+class Command(BaseCommand):
+    help = 'Deliver queued food orders from the outbox to CraveOn, retrying failed deliveries with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--loop', action='store_true', help='Keep polling the outbox instead of exiting after one pass')
+
+    def handle(self, *args, **options):
+        poll_seconds = getattr(settings, 'FOOD_ORDER_OUTBOX', {}).get('POLL_SECONDS', 2)
+        while True:
+            close_old_connections()
+            result = process_outbox(options['batch_size'])
+            if any(result.values()) or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Successfully delivered {result['sent']} food orders "
+                    f"({result['retrying']} retrying, {result['failed']} failed, {result['skipped']} waiting for CraveOn)"
+                ))
+            if not options['loop']:
+                break
+            time.sleep(poll_seconds)
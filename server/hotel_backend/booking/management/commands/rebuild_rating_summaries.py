@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from booking.ratings import rebuild_rating_summaries
+
+class Command(BaseCommand):
+    help = 'Recompute the stored rating count, sum and histogram of every room and area from the reviews table'
+
+    def handle(self, *args, **options):
+        count = rebuild_rating_summaries()
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rebuilt rating summaries for {count} reviewed rooms and areas")
+        )
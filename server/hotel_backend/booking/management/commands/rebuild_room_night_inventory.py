@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from booking.inventory import rebuild_all_nights
+
+class Command(BaseCommand):
+    help = 'Rebuild the room-night inventory table from existing bookings'
+
+    def handle(self, *args, **options):
+        count = rebuild_all_nights()
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rebuilt room-night inventory with {count} occupied nights")
+        )
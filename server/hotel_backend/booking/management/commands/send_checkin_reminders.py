@@ -4,8 +4,17 @@ from booking.tasks import send_checkin_reminders
 class Command(BaseCommand):
     help = 'Send check-in reminder notifications to guests with bookings for today'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
     def handle(self, *args, **options):
-        count = send_checkin_reminders()
+        run = send_checkin_reminders(options['batch_size'])
+        if run.error:
+            self.stderr.write(self.style.ERROR(f"Check-in reminder run stopped after {run.sent_count} notifications: {run.error}"))
+            return
         self.stdout.write(
-            self.style.SUCCESS(f"Successfully sent {count} check-in reminder notifications")
-        ) 
\ No newline at end of file
+            self.style.SUCCESS(
+                f"Successfully sent {run.sent_count} check-in reminder notifications "
+                f"({run.already_sent_count} already sent, {run.failed_count} failed)"
+            )
+        )
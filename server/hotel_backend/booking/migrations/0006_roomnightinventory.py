@@ -0,0 +1,32 @@
+# Generated by Django 5.2.2 on 2026-10-17 04:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0005_delete_craveoncategory_delete_craveonitem_and_more'),
+        ('property', '0002_roomimages'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomNightInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('reserved', 'Reserved'), ('confirmed', 'Confirmed'), ('checked_in', 'Checked In'), ('checked_out', 'Checked Out'), ('cancelled', 'Cancelled'), ('rejected', 'Rejected'), ('missed_reservation', 'Missed Reservation')], max_length=20)),
+                ('same_day', models.BooleanField(default=False)),
+                ('area', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='property.areas')),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='booking.bookings')),
+                ('room', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='property.rooms')),
+            ],
+            options={
+                'db_table': 'room_night_inventory',
+                'indexes': [models.Index(fields=['room', 'date'], name='inventory_room_date_idx'), models.Index(fields=['area', 'date'], name='inventory_area_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('booking', 'date'), name='unique_booking_night')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.2 on 2026-10-17 04:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0006_roomnightinventory'),
+        ('property', '0002_roomimages'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['status', 'is_venue_booking', 'check_in_date', 'check_out_date'], name='bookings_status_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['is_venue_booking', 'check_in_date', 'check_out_date'], name='bookings_venue_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['user', 'created_at'], name='bookings_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['room', 'status'], name='bookings_room_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['area', 'status'], name='bookings_area_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['status', 'created_at'], name='bookings_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['created_at'], name='bookings_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['updated_at'], name='bookings_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-17 04:40
+
+from django.db import migrations
+from django.db.models import Q, Sum, Count
+
+RATING_FIELDS = ['rating_count', 'rating_sum'] + [f"rating_{star}_count" for star in range(1, 6)]
+
+def backfill_rating_summaries(apps, schema_editor):
+    Reviews = apps.get_model('booking', 'Reviews')
+    for model_name, unit_field in (('Rooms', 'room'), ('Areas', 'area')):
+        model = apps.get_model('property', model_name)
+        rows = Reviews.objects.filter(**{f"{unit_field}__isnull": False}).values(unit_field).annotate(
+            rating_count=Count('id'),
+            rating_sum=Sum('rating'),
+            **{f"rating_{star}_count": Count('id', filter=Q(rating=star)) for star in range(1, 6)}
+        ).order_by()
+        for row in rows:
+            model.objects.filter(pk=row[unit_field]).update(**{field: row[field] for field in RATING_FIELDS})
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0007_bookings_composite_indexes'),
+        ('property', '0003_rating_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rating_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-17 04:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0008_backfill_rating_summaries'),
+        ('property', '0003_rating_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['room', 'created_at'], name='reviews_room_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['area', 'created_at'], name='reviews_area_created_idx'),
+        ),
+    ]
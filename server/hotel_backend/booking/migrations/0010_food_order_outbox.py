@@ -0,0 +1,42 @@
+# Generated by Django 5.2.2 on 2026-10-17 04:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0009_reviews_created_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FoodOrderOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(max_length=64, unique=True)),
+                ('items', models.JSONField()),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('payment_ss', models.BinaryField(blank=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('craveon_user_id', models.IntegerField(blank=True, null=True)),
+                ('craveon_order_id', models.IntegerField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='food_order_outbox', to='booking.bookings')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='food_order_outbox', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'food_order_outbox',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='food_outbox_due_idx')],
+            },
+        ),
+    ]
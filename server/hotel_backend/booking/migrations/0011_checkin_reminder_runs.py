@@ -0,0 +1,45 @@
+# Generated by Django 5.2.2 on 2026-10-17 05:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0010_food_order_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckinReminderRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reminder_date', models.DateField()),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('due_count', models.PositiveIntegerField(default=0)),
+                ('sent_count', models.PositiveIntegerField(default=0)),
+                ('already_sent_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'checkin_reminder_runs',
+                'indexes': [models.Index(fields=['reminder_date', 'started_at'], name='reminder_runs_date_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CheckinReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reminder_date', models.DateField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkin_reminders', to='booking.bookings')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='booking.checkinreminderrun')),
+            ],
+            options={
+                'db_table': 'checkin_reminders',
+                'constraints': [models.UniqueConstraint(fields=('booking', 'reminder_date'), name='unique_checkin_reminder')],
+            },
+        ),
+    ]
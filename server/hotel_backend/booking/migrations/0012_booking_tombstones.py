@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-17 05:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0011_checkin_reminder_runs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_id', models.IntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'booking_tombstones',
+            },
+        ),
+    ]
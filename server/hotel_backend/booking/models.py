@@ -1,4 +1,6 @@
 from django.db import models
+from django.utils import timezone
+from django.db.models import Sum, Prefetch, OuterRef, Subquery
 from property.models import Rooms, Areas
 from user_roles.models import CustomUsers
 from cloudinary.models import CloudinaryField
@@ -7,7 +9,33 @@ from property.models import Rooms, Areas
 
 User = get_user_model()
 
+# Statuses in which a booking holds its room or area
+OCCUPYING_STATUSES = ['reserved', 'confirmed', 'checked_in']
+
 # Create your models here.
+class BookingQuerySet(models.QuerySet):
+    def occupying(self):
+        """Bookings holding their room or area (OCCUPYING_STATUSES)."""
+        return self.filter(status__in=OCCUPYING_STATUSES)
+
+    def for_listing(self):
+        """
+        Everything BookingSerializer reads, loaded up front: the user, the completed
+        transaction total, and the room or area with its images, amenities and
+        stored rating summary. A page of bookings costs the same few queries at any size.
+        """
+        completed_total = Transactions.objects.filter(
+            booking=OuterRef('pk'),
+            status='completed'
+        ).values('booking').annotate(total=Sum('amount')).values('total')
+
+        return self.select_related('user').annotate(
+            total_amount=Subquery(completed_total, output_field=models.DecimalField(max_digits=10, decimal_places=2))
+        ).prefetch_related(
+            Prefetch('room', queryset=Rooms.objects.prefetch_related('images', 'amenities')),
+            Prefetch('area', queryset=Areas.objects.prefetch_related('images')),
+        )
+
 class Bookings(models.Model):
     BOOKING_STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -53,6 +81,15 @@ class Bookings(models.Model):
     is_discounted = models.BooleanField(default=False)
     has_food_order = models.BooleanField(default=False)
 
+    objects = BookingQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The row as loaded, so save signals can tell what changed without reading it again
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def apply_pwd_senior_discount(self):
         from user_roles.models import PWD_SENIOR_DISCOUNT_PERCENT
         if not self.is_discounted and self.total_price:
@@ -62,7 +99,17 @@ class Bookings(models.Model):
     
     class Meta:
         db_table = 'bookings'
-    
+        indexes = [
+            models.Index(fields=['status', 'is_venue_booking', 'check_in_date', 'check_out_date'], name='bookings_status_dates_idx'),
+            models.Index(fields=['is_venue_booking', 'check_in_date', 'check_out_date'], name='bookings_venue_dates_idx'),
+            models.Index(fields=['user', 'created_at'], name='bookings_user_created_idx'),
+            models.Index(fields=['room', 'status'], name='bookings_room_status_idx'),
+            models.Index(fields=['area', 'status'], name='bookings_area_status_idx'),
+            models.Index(fields=['status', 'created_at'], name='bookings_status_created_idx'),
+            models.Index(fields=['created_at'], name='bookings_created_idx'),
+            models.Index(fields=['updated_at'], name='bookings_updated_idx'),
+        ]
+
     def __str__(self):
         if self.is_venue_booking and self.area:
             return f"{self.user.email} - {self.area.area_name} - {self.status}"
@@ -132,6 +179,112 @@ class Reviews(models.Model):
 
     class Meta:
         db_table = 'reviews'
+        indexes = [
+            models.Index(fields=['room', 'created_at'], name='reviews_room_created_idx'),
+            models.Index(fields=['area', 'created_at'], name='reviews_area_created_idx'),
+        ]
+
+class RoomNightInventory(models.Model):
+    room = models.ForeignKey(Rooms, on_delete=models.CASCADE, related_name='nights', null=True, blank=True)
+    area = models.ForeignKey(Areas, on_delete=models.CASCADE, related_name='nights', null=True, blank=True)
+    date = models.DateField()
+    booking = models.ForeignKey(Bookings, on_delete=models.CASCADE, related_name='nights')
+    status = models.CharField(max_length=20, choices=Bookings.BOOKING_STATUS_CHOICES)
+    # Set for a booking that checks in and out on the same day (venue bookings)
+    same_day = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'room_night_inventory'
+        constraints = [
+            models.UniqueConstraint(fields=['booking', 'date'], name='unique_booking_night'),
+        ]
+        indexes = [
+            models.Index(fields=['room', 'date'], name='inventory_room_date_idx'),
+            models.Index(fields=['area', 'date'], name='inventory_area_date_idx'),
+        ]
+
+    def __str__(self):
+        unit = f"Room {self.room_id}" if self.room_id else f"Area {self.area_id}"
+        return f"{unit} - {self.date} - {self.status}"
+
+class BookingTombstone(models.Model):
+    """Record of a deleted booking, so other workers' availability indexes can drop it."""
+    booking_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'booking_tombstones'
+
+    def __str__(self):
+        return f"Booking {self.booking_id} deleted at {self.deleted_at}"
+
+class FoodOrderOutbox(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    idempotency_key = models.CharField(max_length=64, unique=True)
+    booking = models.ForeignKey(Bookings, on_delete=models.CASCADE, related_name='food_order_outbox')
+    user = models.ForeignKey(CustomUsers, on_delete=models.CASCADE, related_name='food_order_outbox')
+    items = models.JSONField()
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    payment_ss = models.BinaryField(blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    craveon_user_id = models.IntegerField(null=True, blank=True)
+    craveon_order_id = models.IntegerField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'food_order_outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='food_outbox_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Food order {self.idempotency_key} - Booking {self.booking_id} - {self.status}"
+
+class CheckinReminderRun(models.Model):
+    """One run of the check-in reminder job and what it did, kept by booking.tasks."""
+    reminder_date = models.DateField()
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    due_count = models.PositiveIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    already_sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'checkin_reminder_runs'
+        indexes = [
+            models.Index(fields=['reminder_date', 'started_at'], name='reminder_runs_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Check-in reminders for {self.reminder_date} - {self.sent_count}/{self.due_count} sent"
+
+class CheckinReminder(models.Model):
+    """Claim on a booking's reminder for one date, taken by the run that sends it."""
+    booking = models.ForeignKey(Bookings, on_delete=models.CASCADE, related_name='checkin_reminders')
+    reminder_date = models.DateField()
+    run = models.ForeignKey(CheckinReminderRun, on_delete=models.CASCADE, related_name='reminders')
+    
+    class Meta:
+        db_table = 'checkin_reminders'
+        constraints = [
+            models.UniqueConstraint(fields=['booking', 'reminder_date'], name='unique_checkin_reminder'),
+        ]
+    
+    def __str__(self):
+        return f"Check-in reminder for booking {self.booking_id} on {self.reminder_date}"
 
 # CraveOn Categories model
 class CraveOnCategory(models.Model):
@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models import F, Q, Sum, Count
+from property.models import Rooms, Areas
+from property.catalog import invalidate_catalog
+from .models import Reviews
+
+RATING_STARS = range(1, 6)
+
+def _summary_target(room_id, area_id):
+    if room_id is not None:
+        return Rooms.objects.filter(pk=room_id)
+    if area_id is not None:
+        return Areas.objects.filter(pk=area_id)
+    return None
+
+def adjust_rating_summary(room_id, area_id, rating, delta):
+    """Add (delta=1) or remove (delta=-1) one rating from a room's or area's stored summary."""
+    target = _summary_target(room_id, area_id)
+    if target is None or rating not in RATING_STARS:
+        return
+    star_field = f"rating_{rating}_count"
+    target.update(**{
+        'rating_count': F('rating_count') + delta,
+        'rating_sum': F('rating_sum') + delta * rating,
+        star_field: F(star_field) + delta,
+    })
+    # update() sends no post_save, so expire the catalog's average_rating here
+    transaction.on_commit(invalidate_catalog)
+
+def record_rating(review):
+    adjust_rating_summary(review.room_id, review.area_id, review.rating, 1)
+
+def forget_rating(review):
+    adjust_rating_summary(review.room_id, review.area_id, review.rating, -1)
+
+def _summaries(unit_field):
+    return Reviews.objects.filter(**{f"{unit_field}__isnull": False}).values(unit_field).annotate(
+        rating_count=Count('id'),
+        rating_sum=Sum('rating'),
+        **{f"rating_{star}_count": Count('id', filter=Q(rating=star)) for star in RATING_STARS}
+    ).order_by()
+
+def rebuild_rating_summaries():
+    """Recompute every room and area rating summary from the reviews table."""
+    fields = ['rating_count', 'rating_sum'] + [f"rating_{star}_count" for star in RATING_STARS]
+    updated = 0
+    with transaction.atomic():
+        for model, unit_field in ((Rooms, 'room'), (Areas, 'area')):
+            model.objects.update(**{field: 0 for field in fields})
+            units = []
+            for row in _summaries(unit_field):
+                unit = model(pk=row[unit_field])
+                for field in fields:
+                    setattr(unit, field, row[field])
+                units.append(unit)
+            model.objects.bulk_update(units, fields, batch_size=500)
+            updated += len(units)
+    invalidate_catalog()
+    return updated
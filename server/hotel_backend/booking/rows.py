@@ -0,0 +1,150 @@
+from rest_framework import serializers
+from property.rows import room_row_from_instance, area_row_from_instance
+from .serializers import BookingSerializer, apply_price_breakdown
+
+# Plain-dict builder producing exactly what BookingSerializer returns for bookings
+# loaded with Bookings.objects.for_listing(). Field formatting goes through DRF's own
+# field classes so dates, times and decimals come out the same.
+
+_date = serializers.DateField()
+_datetime = serializers.DateTimeField()
+_time = serializers.TimeField()
+_decimal = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+def _format(field, value):
+    return None if value is None else field.to_representation(value)
+
+def _url(value):
+    return value.url if value and hasattr(value, 'url') else None
+
+def user_row(user):
+    """CustomUserSerializer(user).data."""
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'role': user.role,
+        'profile_image': _url(user.profile_image),
+        'valid_id_type': user.valid_id_type,
+        'valid_id_type_display': user.get_valid_id_type_display(),
+        'valid_id_front': _url(user.valid_id_front),
+        'valid_id_back': _url(user.valid_id_back),
+        'is_verified': user.is_verified,
+        'valid_id_rejection_reason': user.valid_id_rejection_reason,
+        'last_booking_date': _format(_date, user.last_booking_date),
+        'is_senior_or_pwd': user.is_senior_or_pwd,
+    }
+
+def _payment_proof(booking):
+    if booking.payment_proof:
+        if isinstance(booking.payment_proof, str):
+            return booking.payment_proof
+        return booking.payment_proof.url
+    return None
+
+def booking_row(booking, users=None, units=None):
+    """
+    BookingSerializer(booking).data for a booking loaded with for_listing(). ``users``
+    and ``units`` memoize the nested user, room and area dicts across a page, since
+    building their Cloudinary URLs is most of the cost.
+    """
+    users = {} if users is None else users
+    units = {} if units is None else units
+    if booking.user_id not in users:
+        users[booking.user_id] = user_row(booking.user)
+    if booking.room and ('room', booking.room_id) not in units:
+        units['room', booking.room_id] = room_row_from_instance(booking.room)
+    if booking.area and ('area', booking.area_id) not in units:
+        units['area', booking.area_id] = area_row_from_instance(booking.area)
+
+    total_amount = booking.total_amount if hasattr(booking, 'total_amount') else None
+    row = {
+        'id': booking.id,
+        'user': users[booking.user_id],
+        'room': booking.room_id,
+        'room_details': units['room', booking.room_id] if booking.room else None,
+        'area': booking.area_id,
+        'area_details': units['area', booking.area_id] if booking.area else None,
+        'check_in_date': _format(_date, booking.check_in_date),
+        'check_out_date': _format(_date, booking.check_out_date),
+        'status': booking.status,
+        'special_request': booking.special_request,
+        'cancellation_date': _format(_datetime, booking.cancellation_date),
+        'cancellation_reason': booking.cancellation_reason,
+        'time_of_arrival': _format(_time, booking.time_of_arrival),
+        'is_venue_booking': booking.is_venue_booking,
+        'total_price': _format(_decimal, booking.total_price),
+        'number_of_guests': booking.number_of_guests,
+        'created_at': _format(_datetime, booking.created_at),
+        'updated_at': _format(_datetime, booking.updated_at),
+        'payment_method': booking.get_payment_method_display(),
+        'payment_proof': _payment_proof(booking),
+        'payment_date': _format(_datetime, booking.payment_date),
+        'down_payment': _format(_decimal, booking.down_payment),
+        'phone_number': booking.phone_number,
+        'total_amount': total_amount or 0.00,
+    }
+    return apply_price_breakdown(booking, row)
+
+# Model fields whose changes are streamed to admin screens, as booking_row keys
+STREAMED_FIELDS = (
+    'room', 'area', 'check_in_date', 'check_out_date', 'status', 'special_request',
+    'cancellation_date', 'cancellation_reason', 'time_of_arrival', 'is_venue_booking',
+    'total_price', 'number_of_guests', 'payment_method', 'payment_proof', 'payment_date',
+    'down_payment', 'phone_number',
+)
+_PRICED_FIELDS = {'room', 'area', 'check_in_date', 'check_out_date', 'total_price', 'down_payment'}
+
+def booking_delta(booking, changed):
+    """
+    The booking_row entries that change when the model fields in ``changed`` do, so
+    an admin list can patch a row in place instead of refetching it.
+    """
+    row = {'updated_at': _format(_datetime, booking.updated_at)}
+    for field in changed:
+        if field == 'room':
+            row['room'] = booking.room_id
+            row['room_details'] = room_row_from_instance(booking.room) if booking.room else None
+        elif field == 'area':
+            row['area'] = booking.area_id
+            row['area_details'] = area_row_from_instance(booking.area) if booking.area else None
+        elif field in ('check_in_date', 'check_out_date'):
+            row[field] = _format(_date, getattr(booking, field))
+        elif field in ('cancellation_date', 'payment_date'):
+            row[field] = _format(_datetime, getattr(booking, field))
+        elif field == 'time_of_arrival':
+            row[field] = _format(_time, booking.time_of_arrival)
+        elif field in ('total_price', 'down_payment'):
+            row[field] = _format(_decimal, getattr(booking, field))
+        elif field == 'payment_method':
+            row[field] = booking.get_payment_method_display()
+        elif field == 'payment_proof':
+            row[field] = _payment_proof(booking)
+        else:
+            row[field] = getattr(booking, field)
+    if _PRICED_FIELDS & set(changed):
+        row.update(apply_price_breakdown(booking, {
+            'total_price': _format(_decimal, booking.total_price),
+            'down_payment': _format(_decimal, booking.down_payment),
+        }))
+    return row
+
+def booking_rows(bookings):
+    users, units = {}, {}
+    return [booking_row(booking, users, units) for booking in bookings]
+
+def listing_data(bookings, fieldset=None):
+    """Booking list payload: plain rows unless a sparse fieldset was requested."""
+    if fieldset:
+        return BookingSerializer(bookings, many=True, **fieldset).data
+    return booking_rows(bookings)
+
+def inline_booked_unit(row):
+    """Replace the room/area id with its details, as the guest booking lists return them."""
+    if row['is_venue_booking'] and row['area_details']:
+        row['area'] = row['area_details']
+    elif row['room_details']:
+        row['room'] = row['room_details']
+    return row
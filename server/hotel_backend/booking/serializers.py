@@ -3,10 +3,12 @@ from .models import Bookings, Transactions, Reviews, CraveOnCategory, CraveOnIte
 from user_roles.models import CustomUsers
 from user_roles.serializers import CustomUserSerializer
 from property.models import Rooms, Areas
-from property.serializers import AreaSerializer, RoomSerializer
+from property.serializers import AreaSerializer, RoomSerializer, PWD_SENIOR_DISCOUNT_PERCENT
 from .validations.booking import validate_booking_request
+from .ratings import record_rating, forget_rating
 from django.utils import timezone
 from datetime import datetime
+from django.db import transaction
 from django.db.models import Sum
 from django.core.files.uploadedfile import InMemoryUploadedFile, UploadedFile
 import cloudinary.uploader
@@ -14,8 +16,6 @@ import cloudinary
 import uuid
 import base64
 
-PWD_SENIOR_DISCOUNT_PERCENT = 20
-
 # CraveOn Serializers
 class CraveOnCategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -41,7 +41,80 @@ class CraveOnItemSerializer(serializers.ModelSerializer):
                 return None
         return None
 
+def apply_price_breakdown(instance, representation):
+    """
+    Add original_price, discount_percent and discounted_price to a serialized booking
+    and turn total_price/down_payment into numbers. Shared by BookingSerializer and
+    booking.rows so both produce the same figures.
+    """
+    user = instance.user if hasattr(instance, 'user') else None
+    discount_percent = 0
+    
+    
+    # Apply PWD/Senior Discount if user is eligible
+    if user and getattr(user, 'is_senior_or_pwd', False):
+        discount_percent = PWD_SENIOR_DISCOUNT_PERCENT
+    
+    nights = (instance.check_out_date - instance.check_in_date).days if instance.check_in_date and instance.check_out_date else 1
+    
+    if instance.room:
+        try:
+            price_per_night = float(getattr(instance.room, 'price_per_night', None) or instance.room.room_price)
+            original_total = price_per_night * nights
+            
+            # Apply long stay discount if not PWD/Senior
+            if discount_percent == 0:
+                if nights >= 7:
+                    discount_percent = 10
+                elif nights >= 3:
+                    discount_percent = 5
+
+            discounted_price = original_total * (1 - discount_percent / 100)
+            representation['original_price'] = original_total
+            representation['discount_percent'] = discount_percent
+            representation['discounted_price'] = round(discounted_price, 2)
+            representation['total_price'] = float(instance.total_price)
+            
+            
+            if hasattr(instance, 'down_payment') and instance.down_payment is not None:
+                representation['down_payment'] = float(instance.down_payment)
+        except Exception as e:
+            representation['original_price'] = None
+            representation['discount_percent'] = 0
+            representation['discounted_price'] = None
+    elif instance.area:
+        try:
+            original_total = float(instance.total_price)
+            
+            discounted_price = original_total * (1 - discount_percent / 100)
+            representation['original_price'] = original_total
+            representation['discount_percent'] = discount_percent
+            representation['discounted_price'] = round(discounted_price, 2)
+            representation['total_price'] = float(instance.total_price)
+            
+        except Exception as e:
+            representation['original_price'] = None
+            representation['discount_percent'] = 0
+            representation['discounted_price'] = None
+    else:
+        representation['original_price'] = None
+        representation['discount_percent'] = 0
+        representation['discounted_price'] = None        
+    return representation
+
 class BookingSerializer(serializers.ModelSerializer):
+    """
+    Full booking representation by default. Passing ``fields`` and/or ``expand``
+    switches to a sparse row: only the listed fields (COMPACT_FIELDS when none are
+    listed), with nested user/room/area objects embedded only when expanded.
+    """
+    EXPANDABLE_FIELDS = ('user', 'room_details', 'area_details')
+    PRICE_FIELDS = ('original_price', 'discount_percent', 'discounted_price', 'total_price', 'down_payment')
+    COMPACT_FIELDS = (
+        'id', 'user', 'room', 'area', 'check_in_date', 'check_out_date', 'status',
+        'is_venue_booking', 'total_price', 'down_payment', 'total_amount', 'created_at',
+    )
+    
     user = CustomUserSerializer()
     room_details = RoomSerializer(source='room', read_only=True)
     area_details = AreaSerializer(source='area', read_only=True)
@@ -78,6 +151,32 @@ class BookingSerializer(serializers.ModelSerializer):
             'total_amount',
         ]
         
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._requested_fields = None
+        if fields is None and expand is None:
+            return
+        
+        self.check_fieldset(fields, expand)
+        requested = set(fields or self.COMPACT_FIELDS)
+        expand = set(expand or ())
+        
+        for name in list(self.fields):
+            if name in expand:
+                continue
+            if name == 'user' and name in requested:
+                self.fields['user'] = serializers.PrimaryKeyRelatedField(read_only=True)
+            elif name in self.EXPANDABLE_FIELDS or name not in requested:
+                self.fields.pop(name)
+        self._requested_fields = requested | expand
+    
+    @classmethod
+    def check_fieldset(cls, fields, expand):
+        unknown = (set(fields or ()) - set(cls.Meta.fields) - set(cls.PRICE_FIELDS)) | \
+            (set(expand or ()) - set(cls.EXPANDABLE_FIELDS))
+        if unknown:
+            raise ValueError(f"Unknown booking field(s): {', '.join(sorted(unknown))}")
+    
     def get_payment_proof(self, obj):
         if obj.payment_proof:
             if isinstance(obj.payment_proof, str):
@@ -86,6 +185,8 @@ class BookingSerializer(serializers.ModelSerializer):
         return None
     
     def get_total_amount(self, obj):
+        if hasattr(obj, 'total_amount'):
+            return obj.total_amount or 0.00
         return Transactions.objects.filter(
             booking=obj,
             status='completed'
@@ -112,60 +213,26 @@ class BookingSerializer(serializers.ModelSerializer):
     
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        user = instance.user if hasattr(instance, 'user') else None
-        discount_percent = 0
-        
-        
-        # Apply PWD/Senior Discount if user is eligible
-        if user and getattr(user, 'is_senior_or_pwd', False):
-            discount_percent = PWD_SENIOR_DISCOUNT_PERCENT
-        
-        nights = (instance.check_out_date - instance.check_in_date).days if instance.check_in_date and instance.check_out_date else 1
-        
-        if instance.room:
-            try:
-                price_per_night = float(getattr(instance.room, 'price_per_night', None) or instance.room.room_price)
-                original_total = price_per_night * nights
-                
-                # Apply long stay discount if not PWD/Senior
-                if discount_percent == 0:
-                    if nights >= 7:
-                        discount_percent = 10
-                    elif nights >= 3:
-                        discount_percent = 5
+        requested = self._requested_fields
+        if requested is not None:
+            if requested.isdisjoint(self.PRICE_FIELDS):
+                return representation
+            representation = apply_price_breakdown(instance, representation)
+            return {key: value for key, value in representation.items() if key in requested}
+        return apply_price_breakdown(instance, representation)
 
-                discounted_price = original_total * (1 - discount_percent / 100)
-                representation['original_price'] = original_total
-                representation['discount_percent'] = discount_percent
-                representation['discounted_price'] = round(discounted_price, 2)
-                representation['total_price'] = float(instance.total_price)
-                
-                
-                if hasattr(instance, 'down_payment') and instance.down_payment is not None:
-                    representation['down_payment'] = float(instance.down_payment)
-            except Exception as e:
-                representation['original_price'] = None
-                representation['discount_percent'] = 0
-                representation['discounted_price'] = None
-        elif instance.area:
-            try:
-                original_total = float(instance.total_price)
-                
-                discounted_price = original_total * (1 - discount_percent / 100)
-                representation['original_price'] = original_total
-                representation['discount_percent'] = discount_percent
-                representation['discounted_price'] = round(discounted_price, 2)
-                representation['total_price'] = float(instance.total_price)
-                
-            except Exception as e:
-                representation['original_price'] = None
-                representation['discount_percent'] = 0
-                representation['discounted_price'] = None
-        else:
-            representation['original_price'] = None
-            representation['discount_percent'] = 0
-            representation['discounted_price'] = None        
-        return representation
+def sparse_fieldset_options(query_params):
+    """
+    Read ``?fields=a,b`` and ``?expand=user,room_details`` into BookingSerializer
+    kwargs. Raises ValueError for names the serializer does not know.
+    """
+    options = {}
+    for param in ('fields', 'expand'):
+        if param in query_params:
+            options[param] = [name.strip() for name in query_params.get(param, '').split(',') if name.strip()]
+    if options:
+        BookingSerializer.check_fieldset(options.get('fields'), options.get('expand'))
+    return options
 
 class BookingRequestSerializer(serializers.Serializer):
     firstName = serializers.CharField(max_length=100)
@@ -437,8 +504,20 @@ class ReviewSerializer(serializers.ModelSerializer):
             validated_data['area'] = validated_data['booking'].area
         else:
             validated_data['room'] = validated_data['booking'].room
-            
-        return super().create(validated_data)
+        
+        with transaction.atomic():
+            review = super().create(validated_data)
+            record_rating(review)
+        return review
+    
+    def update(self, instance, validated_data):
+        previous = Reviews(room_id=instance.room_id, area_id=instance.area_id, rating=instance.rating)
+        with transaction.atomic():
+            review = super().update(instance, validated_data)
+            if review.rating != previous.rating:
+                forget_rating(previous)
+                record_rating(review)
+        return review
 
 # CraveOn Food Order Review Serializer
 class CraveOnReviewSerializer(serializers.ModelSerializer):
@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Bookings, Reviews
+from .availability import availability_index, record_deletion
+from .inventory import sync_booking_nights
+from .ratings import forget_rating
+
+@receiver(post_save, sender=Bookings)
+def index_booking_availability(sender, instance, **kwargs):
+    transaction.on_commit(lambda: availability_index.apply(instance))
+
+@receiver(post_delete, sender=Bookings)
+def unindex_booking_availability(sender, instance, **kwargs):
+    booking_id = instance.id
+    # In the deleting transaction, so other workers' indexes see it once it commits
+    record_deletion(booking_id)
+    transaction.on_commit(lambda: availability_index.discard(booking_id))
+
+@receiver(post_save, sender=Bookings)
+def sync_room_night_inventory(sender, instance, **kwargs):
+    # Deleted bookings lose their rows through the foreign key cascade
+    sync_booking_nights(instance)
+
+@receiver(post_delete, sender=Reviews)
+def remove_review_rating(sender, instance, **kwargs):
+    forget_rating(instance)
@@ -1,35 +1,139 @@
+import asyncio
+import logging
+from collections import Counter
+from django.db import transaction
 from django.utils import timezone
-from datetime import timedelta
-from booking.models import Bookings
-from user_roles.views import create_notification
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+from booking.models import Bookings, CheckinReminderRun, CheckinReminder
+from user_roles.models import Notification
+from user_roles.serializers import NotificationSerializer
+from user_roles.views import build_notification
+from user_roles.notification_counts import add_unread_counts, unread_counts
 
-def send_checkin_reminders():
+logger = logging.getLogger(__name__)
+
+def _property_name(booking):
+    if booking.is_venue_booking and booking.area:
+        return booking.area.area_name
+    elif booking.room:
+        return booking.room.room_name
+    return "your reservation"
+
+def _push_notifications(notifications):
+    """Send new notifications to their guests' websockets, all group_sends in one batch."""
+    counts = unread_counts({notification.user_id for notification in notifications})
+    messages = [
+        (f"notifications_{notification.user_id}", {
+            "type": "send_notification",
+            "notification": NotificationSerializer(notification).data,
+            "unread_count": counts.get(notification.user_id, 0),
+        })
+        for notification in notifications
+    ]
+    channel_layer = get_channel_layer()
+
+    async def send_all():
+        await asyncio.gather(*(channel_layer.group_send(group, message) for group, message in messages))
+
+    async_to_sync(send_all)()
+
+def _remind_batch(today, after_id, batch_size, run):
+    """
+    Remind the next ``batch_size`` due bookings after ``after_id``. Returns the
+    bookings looked at and the counts of reminders already sent, sent and failed.
+    """
+    with transaction.atomic():
+        bookings = list(
+            Bookings.objects.select_related('user', 'room', 'area')
+            .filter(check_in_date=today, status='reserved', id__gt=after_id)
+            .order_by('id')[:batch_size]
+        )
+        if not bookings:
+            return [], 0, 0, 0
+
+        # Claim each booking's reminder for today; a claim another run holds (or
+        # committed) is skipped, so every reminder is sent once however many run
+        CheckinReminder.objects.bulk_create([
+            CheckinReminder(booking_id=booking.id, reminder_date=today, run=run)
+            for booking in bookings
+        ], ignore_conflicts=True)
+        claimed = set(CheckinReminder.objects.filter(
+            run=run,
+            booking__in=[booking.id for booking in bookings]
+        ).values_list('booking_id', flat=True))
+
+        notifications = []
+        failed = []
+        for booking in bookings:
+            if booking.id not in claimed:
+                continue
+            try:
+                booking.property_name = _property_name(booking)
+                notifications.append(build_notification(booking.user, booking, 'checkin_reminder'))
+            except Exception as e:
+                logger.error(f"Error building check-in reminder for booking {booking.id}: {str(e)}")
+                failed.append(booking.id)
+        if failed:
+            # Let the next run try these again
+            CheckinReminder.objects.filter(run=run, booking__in=failed).delete()
+
+        Notification.objects.bulk_create(notifications, batch_size=batch_size)
+        add_unread_counts(Counter(notification.user_id for notification in notifications))
+
+        if notifications and notifications[0].pk is None:
+            # MySQL does not return the ids of bulk inserted rows; the websocket payload needs them
+            by_booking = {notification.booking_id: notification.booking for notification in notifications}
+            notifications = list(Notification.objects.filter(
+                booking__in=list(by_booking),
+                notification_type='checkin_reminder',
+                created_at__gte=run.started_at
+            ))
+            for notification in notifications:
+                notification.booking = by_booking[notification.booking_id]
+
+        transaction.on_commit(lambda: _push_notifications(notifications), robust=True)
+    return bookings, len(bookings) - len(claimed), len(notifications), len(failed)
+
+def send_checkin_reminders(batch_size=500):
     """
     Send reminder notifications to guests who have check-ins scheduled for today.
     This function should be scheduled to run daily.
+
+    Due bookings are handled in batches: one query with their room, area and guest,
+    one bulk insert of reminder claims and one of the notifications, one update of
+    the unread counts and one websocket fan-out per batch. A booking's reminder is
+    claimed through a unique (booking, date) row rather than by locking the booking,
+    so ordinary booking writes never make the job skip a guest, and repeated or
+    concurrent runs from several schedulers send each reminder once.
+    Returns the CheckinReminderRun recording what this run did.
     """
-    today = timezone.now().date()
-    
-    upcoming_checkins = Bookings.objects.filter(
-        check_in_date__date=today,
-        status='reserved'
+    today = timezone.localdate()
+    run = CheckinReminderRun.objects.create(
+        reminder_date=today,
+        due_count=Bookings.objects.filter(check_in_date=today, status='reserved').count()
+    )
+
+    after_id = 0
+    try:
+        while True:
+            bookings, already_sent, sent, failed = _remind_batch(today, after_id, batch_size, run)
+            if not bookings:
+                break
+            after_id = bookings[-1].id
+            run.already_sent_count += already_sent
+            run.sent_count += sent
+            run.failed_count += failed
+    except Exception as e:
+        # Whatever this run did not commit is picked up by the next one
+        logger.error(f"Check-in reminder run {run.id} stopped: {str(e)}")
+        run.error = str(e)
+    finally:
+        run.finished_at = timezone.now()
+        run.save()
+
+    logger.info(
+        f"Check-in reminders for {today}: {run.sent_count} sent, {run.already_sent_count} already sent, "
+        f"{run.failed_count} failed of {run.due_count} due"
     )
-    
-    notification_count = 0
-    for booking in upcoming_checkins:
-        try:
-            if booking.is_venue_booking and booking.area:
-                property_name = booking.area.area_name
-            elif booking.room:
-                property_name = booking.room.room_name
-            else:
-                property_name = "your reservation"
-                
-            booking.property_name = property_name
-            
-            create_notification(booking.user, booking, 'checkin_reminder')
-            notification_count += 1
-            
-        except Exception as e:
-            return f"Error: {e}"
-    return notification_count 
\ No newline at end of file
+    return run
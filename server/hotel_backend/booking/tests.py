@@ -1,3 +1,108 @@
-from django.test import TestCase
+from unittest import skipUnless
+from django.db import IntegrityError, OperationalError, connection
+from django.db.backends.sqlite3 import base as sqlite3_base
+from django.test import SimpleTestCase, TestCase, override_settings
+from .craveon_health import CircuitBreaker, CircuitBreakerDatabaseMixin, CraveOnUnavailable
+from .management.commands.check_query_plans import EXPLAIN_VENDORS, hot_queries, full_scans
 
-# Create your tests here.
+def _fail(breaker, error=None):
+    try:
+        with breaker.guard():
+            raise error or OperationalError("connection refused")
+    except (OperationalError, OSError):
+        pass
+
+def _succeed(breaker):
+    with breaker.guard():
+        pass
+
+@override_settings(CRAVEON_CIRCUIT_BREAKER={'FAILURE_THRESHOLD': 3, 'RESET_SECONDS': 60})
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker('test database')
+
+    def test_opens_after_consecutive_failures(self):
+        _fail(self.breaker)
+        _fail(self.breaker)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        _fail(self.breaker)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.available())
+        with self.assertRaises(CraveOnUnavailable):
+            _succeed(self.breaker)
+        self.assertEqual(self.breaker.metrics()['rejected'], 1)
+
+    def test_success_resets_failure_streak(self):
+        _fail(self.breaker)
+        _fail(self.breaker)
+        _succeed(self.breaker)
+        _fail(self.breaker)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.metrics()['consecutive_failures'], 1)
+
+    def test_os_errors_count_as_failures(self):
+        for _ in range(3):
+            _fail(self.breaker, TimeoutError("timed out"))
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_database_reported_errors_count_as_successes(self):
+        for _ in range(3):
+            with self.assertRaises(IntegrityError):
+                with self.breaker.guard():
+                    raise IntegrityError("duplicate entry")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.metrics()['successes'], 3)
+
+    @override_settings(CRAVEON_CIRCUIT_BREAKER={'FAILURE_THRESHOLD': 3, 'RESET_SECONDS': 0})
+    def test_half_open_trial_closes_or_reopens(self):
+        for _ in range(3):
+            _fail(self.breaker)
+        self.assertTrue(self.breaker.available())
+
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CraveOnUnavailable):
+            self.breaker.before_call()
+        self.breaker.record_failure(OperationalError("still down"))
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        _succeed(self.breaker)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.metrics()['times_opened'], 2)
+
+class _UnreachableWrapper(CircuitBreakerDatabaseMixin, sqlite3_base.DatabaseWrapper):
+    pass
+
+@override_settings(CRAVEON_CIRCUIT_BREAKER={'FAILURE_THRESHOLD': 3, 'RESET_SECONDS': 60})
+class CircuitBreakerConnectTests(SimpleTestCase):
+    def test_failed_connects_open_the_circuit(self):
+        breaker = CircuitBreaker('unreachable database')
+        wrapper = _UnreachableWrapper({
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': '/nonexistent/directory/craveon.sqlite3',
+            'OPTIONS': {},
+            'TIME_ZONE': None,
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False,
+            'AUTOCOMMIT': True,
+            'ATOMIC_REQUESTS': False,
+            'TEST': {},
+        }, alias='unreachable')
+        wrapper.breaker = breaker
+
+        for _ in range(3):
+            with self.assertRaises(OperationalError):
+                wrapper.ensure_connection()
+        metrics = breaker.metrics()
+        self.assertEqual(metrics['state'], CircuitBreaker.OPEN)
+        self.assertEqual(metrics['failures'], 3)
+        self.assertEqual(metrics['successes'], 0)
+        with self.assertRaises(CraveOnUnavailable):
+            wrapper.ensure_connection()
+
+@skipUnless(connection.vendor in EXPLAIN_VENDORS, f"EXPLAIN output is not parsed for {connection.vendor}")
+class HotQueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        for name, queryset in hot_queries().items():
+            with self.subTest(query=name):
+                self.assertEqual(full_scans(queryset), [])
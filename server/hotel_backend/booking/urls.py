@@ -24,6 +24,7 @@ urlpatterns = [
     
     # For Food Ordering (fetch the API from the other system) -> CraveOn
     path('fetch_foods', views.fetch_foods, name='fetch_foods'),
+    path('food_images/<int:item_id>', views.fetch_food_image, name='food_image'),
     path('place_food_order', views.place_food_order, name='place_food_order'),
     path('fetch_food_orders', views.fetch_food_orders, name='fetch_food_orders'),
     path('review_food_order', views.review_food_order, name='review_food_order'),
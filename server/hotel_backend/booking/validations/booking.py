@@ -1,5 +1,5 @@
 import re
-from datetime import datetime
+from datetime import datetime, time, timedelta
 from django.utils import timezone
 from rest_framework import serializers
 from booking.models import Bookings
@@ -17,6 +17,26 @@ def validate_guest_name(name):
     
     return name
 
+def guest_room_bookings_between(email, check_in_date, check_out_date):
+    """The guest's live room bookings overlapping [check_in_date, check_out_date)."""
+    return Bookings.objects.filter(
+        user__email=email,
+        check_in_date__lt=check_out_date,
+        check_out_date__gt=check_in_date,
+        status__in=['pending', 'reserved', 'confirmed', 'checked_in'],
+        is_venue_booking=False
+    )
+
+def bookings_created_on(user_id, day):
+    """The user's bookings created on ``day`` (a local date)."""
+    day_start = timezone.make_aware(datetime.combine(day, time.min))
+    # A created_at range (rather than created_at__date) lets the (user, created_at) index be used
+    return Bookings.objects.filter(
+        user_id=user_id,
+        created_at__gte=day_start,
+        created_at__lt=day_start + timedelta(days=1)
+    )
+
 def validate_email(email, check_in_date=None, check_out_date=None, is_venue_booking=False):
     """Validate email format and check for overlapping bookings"""
     if not email:
@@ -26,13 +46,7 @@ def validate_email(email, check_in_date=None, check_out_date=None, is_venue_book
         raise serializers.ValidationError("Invalid email format")
     
     if not is_venue_booking and check_in_date and check_out_date:
-        overlapping_bookings = Bookings.objects.filter(
-            user__email=email,
-            check_in_date__lt=check_out_date,
-            check_out_date__gt=check_in_date,
-            status__in=['pending', 'reserved', 'confirmed', 'checked_in'],
-            is_venue_booking=False
-        )
+        overlapping_bookings = guest_room_bookings_between(email, check_in_date, check_out_date)
         
         if overlapping_bookings.exists():
             raise serializers.ValidationError("You already have an active booking during this period")
@@ -44,12 +58,7 @@ def validate_max_bookings_per_day(user_id):
     if not user_id:
         return True
     
-    today = timezone.now().date()
-    
-    bookings_today = Bookings.objects.filter(
-        user_id=user_id,
-        created_at__date=today
-    )
+    bookings_today = bookings_created_on(user_id, timezone.now().date())
     
     total_bookings = bookings_today.count()
     
@@ -224,11 +233,10 @@ def validate_booking_request(data, room):
         check_in = data.get('checkIn')
         check_out = data.get('checkOut')
         
-        overlapping_bookings = Bookings.objects.filter(
+        overlapping_bookings = Bookings.objects.occupying().filter(
             room=room,
             check_in_date__lt=check_out,
-            check_out_date__gt=check_in,
-            status__in=['reserved', 'confirmed', 'checked_in']
+            check_out_date__gt=check_in
         )
         
         if overlapping_bookings.exists():
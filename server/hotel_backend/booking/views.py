@@ -2,13 +2,16 @@ import json
 import base64
 import logging
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.response import Response
 from .models import Bookings, Reviews, CraveOnItem
 from property.models import Rooms, Areas
 from property.serializers import AreaSerializer, RoomSerializer
+from property.catalog import catalog_snapshot, catalog_row, available_rows, catalog_etag, catalog_response
+from property.rows import is_senior
 from .serializers import (
     BookingSerializer, 
+    sparse_fieldset_options,
     BookingRequestSerializer,
     ReviewSerializer,
 )
@@ -16,9 +19,18 @@ from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
 from datetime import datetime
 from django.db import transaction, connections
-from django.db.models import Q
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from .craveon_integration import CraveOnIntegration
+from .craveon_health import CraveOnUnavailable
+from .food_order_outbox import enqueue_food_order, max_idempotency_key_length, IdempotencyKeyReused
+from .availability import availability_index
+from .inventory import occupied_unit_ids, calendar_bookings
+from .rows import listing_data, inline_booked_unit
+from .food_images import image_derivatives, derivative_sizes, cache_headers, EMPTY_IMAGE_HASH
+from hotel_backend.pagination import paginate_by_cursor
 from .serializers import CraveOnReviewSerializer
 import base64
 import imghdr
@@ -55,33 +67,25 @@ def fetch_availability(request):
             'error': "Departure date should be greater than arrival date"
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    rooms = Rooms.objects.filter(status='available')
-    
-    booked_room_ids = Bookings.objects.filter(
-        ~Q(status__in=['cancelled', 'rejected', 'checked_out', 'no_show']),
-        Q(check_in_date__lt=departure) & Q(check_out_date__gt=arrival),
-        is_venue_booking=False
-    ).values_list('room_id', flat=True)
-    
-    rooms = rooms.exclude(id__in=booked_room_ids)
-    
-    areas = Areas.objects.filter(status='available')
-    
-    booked_area_ids = Bookings.objects.filter(
-        ~Q(status__in=['cancelled', 'rejected', 'checked_out', 'no_show']),
-        Q(check_in_date__lt=departure) & Q(check_out_date__gt=arrival),
-        is_venue_booking=True
-    ).values_list('area_id', flat=True)
-    
-    areas = areas.exclude(id__in=booked_area_ids)
-    
-    room_serializer = RoomSerializer(rooms, many=True, context={'request': request})
-    area_serializer = AreaSerializer(areas, many=True)
-    
-    return Response({
-        "rooms": room_serializer.data,
-        "areas": area_serializer.data
-    }, status=status.HTTP_200_OK)
+    try:
+        booked_room_ids = availability_index.booked_room_ids(arrival, departure)
+        booked_area_ids = availability_index.booked_area_ids(arrival, departure)
+    except Exception as e:
+        logger.error(f"Availability index unavailable, falling back to the room-night inventory: {str(e)}")
+        booked_room_ids = occupied_unit_ids(False, arrival.date(), departure.date())
+        booked_area_ids = occupied_unit_ids(True, arrival.date(), departure.date())
+
+    catalog = catalog_snapshot()
+    booked_room_ids, booked_area_ids = set(booked_room_ids), set(booked_area_ids)
+    etag = catalog_etag(
+        catalog, 'availability', is_senior(request.user),
+        sorted(booked_room_ids & catalog['rooms'].keys()),
+        sorted(booked_area_ids & catalog['areas'].keys()),
+    )
+    return catalog_response(request, etag, lambda: {
+        "rooms": available_rows(catalog, 'rooms', request.user, exclude=booked_room_ids),
+        "areas": available_rows(catalog, 'areas', exclude=booked_area_ids)
+    })
 
 @api_view(['GET', 'POST'])
 def bookings_list(request):
@@ -95,7 +99,11 @@ def bookings_list(request):
             page = request.query_params.get('page', 1)
             page_size = request.query_params.get('page_size', 10)
             status_filter = request.query_params.get('status')
-            bookings = Bookings.objects.all().order_by('-created_at')
+            bookings = Bookings.objects.for_listing().order_by('-created_at')
+            try:
+                fieldset = sparse_fieldset_options(request.query_params)
+            except ValueError as ve:
+                return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
             
             if status_filter:
                 bookings = bookings.filter(status=status_filter)
@@ -103,6 +111,16 @@ def bookings_list(request):
             if request.user.role == 'guest':
                 bookings = bookings.filter(user=request.user)
             
+            if 'cursor' in request.query_params:
+                try:
+                    page_bookings, pagination = paginate_by_cursor(bookings, request.query_params, 10)
+                except ValueError as ve:
+                    return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+                return Response({
+                    "data": listing_data(page_bookings, fieldset),
+                    "pagination": pagination
+                }, status=status.HTTP_200_OK)
+            
             paginator = Paginator(bookings, page_size)
             try:
                 paginated_bookings = paginator.page(page)
@@ -111,10 +129,8 @@ def bookings_list(request):
             except EmptyPage:
                 paginated_bookings = paginator.page(paginator.num_pages)
             
-            serializer = BookingSerializer(paginated_bookings, many=True)
-            
             return Response({
-                "data": serializer.data,
+                "data": listing_data(paginated_bookings, fieldset),
                 "pagination": {
                     "total_pages": paginator.num_pages,
                     "current_page": int(page),
@@ -284,14 +300,15 @@ def area_reservations(request):
 @api_view(['GET'])
 def area_detail(request, area_id):
     try:
-        area = Areas.objects.get(id=area_id)
-        
-        serializer = AreaSerializer(area, context={'request': request})
-        serialized_data = serializer.data
+        catalog = catalog_snapshot()
+        area = catalog_row(catalog, 'areas', area_id, request.user)
+        if area is None:
+            raise Areas.DoesNotExist
         
-        return Response({
-            "data": serialized_data
-        }, status=status.HTTP_200_OK)
+        etag = catalog_etag(catalog, 'area', area_id, is_senior(request.user))
+        return catalog_response(request, etag, lambda: {
+            "data": area
+        })
     except Areas.DoesNotExist:
         return Response({"error": "Area not found"}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
@@ -300,11 +317,15 @@ def area_detail(request, area_id):
 @api_view(['GET'])
 def room_detail(request, room_id):
     try:
-        room = Rooms.objects.get(id=room_id)
-        serializer = RoomSerializer(room, context={'request': request})
-        return Response({
-            "data": serializer.data
-        }, status=status.HTTP_200_OK)
+        catalog = catalog_snapshot()
+        room = catalog_row(catalog, 'rooms', room_id, request.user)
+        if room is None:
+            raise Rooms.DoesNotExist
+        
+        etag = catalog_etag(catalog, 'room', room_id, is_senior(request.user))
+        return catalog_response(request, etag, lambda: {
+            "data": room
+        })
     except Rooms.DoesNotExist:
         return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
@@ -315,42 +336,45 @@ def room_detail(request, room_id):
 def user_bookings(request):
     try:
         user = request.user
-        bookings = Bookings.objects.filter(user=user).order_by('-created_at')
+        bookings = Bookings.objects.for_listing().filter(user=user).order_by('-created_at')
         
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 5)
         
-        paginator = Paginator(bookings, page_size)
-        
         try:
-            paginated_bookings = paginator.page(page)
-        except PageNotAnInteger:
-            paginated_bookings = paginator.page(1)
-        except EmptyPage:
-            paginated_bookings = paginator.page(paginator.num_pages)
-            
-        booking_data = []
-        for booking in paginated_bookings:
-            booking_serializer = BookingSerializer(booking)
-            data = booking_serializer.data
+            fieldset = sparse_fieldset_options(request.query_params)
+        except ValueError as ve:
+            return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if 'cursor' in request.query_params:
+            try:
+                paginated_bookings, pagination = paginate_by_cursor(bookings, request.query_params, 5)
+            except ValueError as ve:
+                return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            paginator = Paginator(bookings, page_size)
             
-            if booking.is_venue_booking and booking.area:
-                area_serializer = AreaSerializer(booking.area)
-                data['area'] = area_serializer.data
-            elif booking.room:
-                room_serializer = RoomSerializer(booking.room)
-                data['room'] = room_serializer.data
+            try:
+                paginated_bookings = paginator.page(page)
+            except PageNotAnInteger:
+                paginated_bookings = paginator.page(1)
+            except EmptyPage:
+                paginated_bookings = paginator.page(paginator.num_pages)
             
-            booking_data.append(data)
-        
-        return Response({
-            "data": booking_data,
-            "pagination": {
+            pagination = {
                 "total_pages": paginator.num_pages,
                 "current_page": int(page),
                 "total_items": paginator.count,
                 "page_size": int(page_size)
             }
+            
+        booking_data = listing_data(paginated_bookings, fieldset)
+        if not fieldset:
+            booking_data = [inline_booked_unit(row) for row in booking_data]
+        
+        return Response({
+            "data": booking_data,
+            "pagination": pagination
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -405,19 +429,18 @@ def fetch_room_bookings(request, room_id):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         
-        query = Q(room_id=room_id) & ~Q(status__in=['cancelled', 'rejected'])
+        start = end = None
 
         if start_date and end_date:
             try:
-                start = datetime.strptime(start_date, "%Y-%m-%d")
-                end = datetime.strptime(end_date, "%Y-%m-%d")
-                
-                query = query & Q(check_in_date__lte=end) & Q(check_out_date__gte=start)
+                start = datetime.strptime(start_date, "%Y-%m-%d").date()
+                end = datetime.strptime(end_date, "%Y-%m-%d").date()
             except ValueError:
                 return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, 
                                status=status.HTTP_400_BAD_REQUEST)
         
-        bookings = Bookings.objects.filter(query)
+        # Live bookings only, read through the room-night inventory's (room, date) index
+        bookings = calendar_bookings(False, room_id, start, end)
         
         booking_data = []
         for booking in bookings:
@@ -441,19 +464,18 @@ def fetch_area_bookings(request, area_id):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         
-        query = Q(area_id=area_id) & ~Q(status__in=['cancelled', 'rejected'])
+        start = end = None
         
         if start_date and end_date:
             try:
-                start = datetime.strptime(start_date, "%Y-%m-%d")
-                end = datetime.strptime(end_date, "%Y-%m-%d")
-                
-                query = query & Q(check_in_date__lte=end) & Q(check_out_date__gte=start)
+                start = datetime.strptime(start_date, "%Y-%m-%d").date()
+                end = datetime.strptime(end_date, "%Y-%m-%d").date()
             except ValueError:
                 return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, 
                                status=status.HTTP_400_BAD_REQUEST)
         
-        bookings = Bookings.objects.filter(query)
+        # Live bookings only, read through the room-night inventory's (area, date) index
+        bookings = calendar_bookings(True, area_id, start, end)
         
         booking_data = []
         for booking in bookings:
@@ -558,10 +580,22 @@ def review_detail(request, review_id):
 @api_view(['GET'])
 def room_reviews(request, room_id):
     try:
+        reviews = Reviews.objects.select_related('user', 'booking__room', 'booking__area').filter(room_id=room_id).order_by('-created_at')
+        
+        if 'cursor' in request.query_params:
+            try:
+                page_reviews, pagination = paginate_by_cursor(reviews, request.query_params, 10)
+            except ValueError as ve:
+                return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = ReviewSerializer(page_reviews, many=True)
+            return Response({
+                "data": serializer.data,
+                **pagination
+            }, status=status.HTTP_200_OK)
+        
         page = int(request.query_params.get('page'))
         page_size = int(request.query_params.get('page_size'))
         
-        reviews = Reviews.objects.filter(room_id=room_id).order_by('-created_at')
         paginator = Paginator(reviews, page_size)
         
         try:
@@ -585,10 +619,22 @@ def room_reviews(request, room_id):
 @api_view(['GET'])
 def area_reviews(request, area_id):
     try:
+        reviews = Reviews.objects.select_related('user', 'booking__room', 'booking__area').filter(area_id=area_id).order_by('-created_at')
+        
+        if 'cursor' in request.query_params:
+            try:
+                page_reviews, pagination = paginate_by_cursor(reviews, request.query_params, 10)
+            except ValueError as ve:
+                return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = ReviewSerializer(page_reviews, many=True)
+            return Response({
+                "data": serializer.data,
+                **pagination
+            }, status=status.HTTP_200_OK)
+        
         page = int(request.query_params.get('page'))
         page_size = int(request.query_params.get('page_size'))
         
-        reviews = Reviews.objects.filter(area_id=area_id).order_by('-created_at')
         paginator = Paginator(reviews, page_size)
         
         try:
@@ -705,32 +751,68 @@ def generate_checkout_e_receipt(request, booking_id):
 @permission_classes([IsAuthenticated])
 def fetch_foods(request):
     try:
-        items = CraveOnItem.objects.using('SystemInteg').filter(
-            is_archived=False
-        ).select_related('category')
+        menu = CraveOnIntegration.get_menu()
         data = []
-        for item in items:
-            image_type = imghdr.what(None, h=item.image)
-            mime_type = f"image/{image_type}"
-            image_base64 = ""
-            if item.image:
-                image_base64 = base64.b64encode(item.image).decode('utf-8')
+        for item in menu['items']:
             data.append({
-                "item_id": item.item_id,
-                "name": item.item_name,
-                "price": float(item.price),
-                "image": image_base64,
-                "image_mime": mime_type,
-                "category_id": item.category.category_id if item.category else None,
-                "category_name": item.category.category_name if item.category else "",
+                "item_id": item['item_id'],
+                "name": item['item_name'],
+                "price": item['price'],
+                "image": food_image_url(request, item['item_id'], item['image_hash'], 'thumb'),
+                "image_full": food_image_url(request, item['item_id'], item['image_hash'], 'full'),
+                "category_id": item['category_id'],
+                "category_name": item['category_name'],
             })
         return Response({
-            "message": "Food items fetched successfully.",
+            "message": "Food items fetched from cache." if menu['stale'] else "Food items fetched successfully.",
             "data": data
         }, status=status.HTTP_200_OK)
+    except CraveOnUnavailable as e:
+        return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def food_image_url(request, item_id, content_hash, size):
+    """Absolute, versioned URL of a food image derivative ("" when the item has no image)."""
+    if not content_hash or content_hash == EMPTY_IMAGE_HASH:
+        return ""
+    path = reverse('food_image', args=[item_id])
+    return request.build_absolute_uri(f"{path}?size={size}&v={content_hash}")
+
+@api_view(['GET'])
+@authentication_classes([])
+def fetch_food_image(request, item_id):
+    size = request.query_params.get('size', 'full')
+    if size not in derivative_sizes():
+        return Response({"error": f"Unknown image size '{size}'"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # A versioned URL is content-addressed: a cache hit needs no CraveOn round trip
+    version = request.query_params.get('v')
+    if version:
+        etag = f'"{version}-{size}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return cache_headers(not_modified, version, size)
+        cached = image_derivatives.get(item_id, version, size)
+        if cached is not None:
+            content, mime = cached
+            return cache_headers(HttpResponse(content, content_type=mime), version, size)
+    
+    try:
+        data = CraveOnItem.objects.using('SystemInteg').filter(
+            item_id=item_id
+        ).values_list('image', flat=True).first()
+    except CraveOnUnavailable as e:
+        return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    if not data:
+        return Response({"error": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+    
+    content_hash, (content, mime) = image_derivatives.get_or_create(item_id, bytes(data), size)
+    response = HttpResponse(content, content_type=mime)
+    return cache_headers(response, content_hash, size, immutable=version == content_hash)
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def place_food_order(request):
@@ -764,6 +846,13 @@ def place_food_order(request):
 
         hotel_user = request.user
 
+        idempotency_key = request.headers.get('Idempotency-Key')
+        max_key_length = max_idempotency_key_length(hotel_user.id)
+        if idempotency_key and len(idempotency_key) > max_key_length:
+            return Response({
+                "error": f"Idempotency-Key must be at most {max_key_length} characters"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
         validation_result = CraveOnIntegration.validate_cart_items(cart_items)
         if not validation_result['valid']:
             return Response({"error": validation_result['error']}, status=status.HTTP_400_BAD_REQUEST)
@@ -771,33 +860,28 @@ def place_food_order(request):
         total_amount = validation_result['total_amount']
 
         try:
-            payment_ss_data = base64.b64encode(payment_ss.read()).decode('utf-8')
+            payment_ss_data = payment_ss.read()
         except Exception as e:
             return Response({
                 "error": f"Failed to process payment screenshot: {str(e)}"
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic(using='SystemInteg'):
-            craveon_user_id = CraveOnIntegration.get_or_create_craveon_user(hotel_user, booking)
-            order_id = CraveOnIntegration.create_craveon_order(
-                craveon_user_id, 
-                total_amount, 
-                payment_ss_data, 
-                booking.id,
-                hotel_user,
-                booking
-            )
-            CraveOnIntegration.add_order_items(order_id, cart_items)
-
-        booking.has_food_order = True
-        booking.save()
+        # Delivery to CraveOn happens in the process_food_order_outbox worker
+        entry, _ = enqueue_food_order(
+            hotel_user,
+            booking,
+            validation_result['items'],
+            total_amount,
+            payment_ss_data,
+            idempotency_key
+        )
 
         return Response({
             "message": "Food order placed successfully!",
             "success": True,
-            "user_id": craveon_user_id,
-            "order_id": order_id,
-            "total_amount": total_amount,
+            "order_reference": entry.idempotency_key,
+            "order_id": entry.craveon_order_id,
+            "total_amount": float(entry.total_amount),
             "hotel_booking_info": {
                 "hotel_booking_id": booking.id,
                 "hotel_user_id": hotel_user.id,
@@ -808,12 +892,15 @@ def place_food_order(request):
                 "check_out_date": str(booking.check_out_date),
             },
             "craveon_order_info": {
-                "craveon_user_id": craveon_user_id,
-                "craveon_order_id": order_id,
-                "items_count": len(cart_items),
-                "status": "Pending"
+                "craveon_order_id": entry.craveon_order_id,
+                "items_count": len(entry.items),
+                "status": "Pending" if entry.status == 'sent' else "Queued"
             }
-        }, status=status.HTTP_201_CREATED)
+        }, status=status.HTTP_202_ACCEPTED)
+    except IdempotencyKeyReused as e:
+        return Response({"error": str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    except CraveOnUnavailable as e:
+        return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
     except Exception as e:
         return Response({"error": f"Unexpected error: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -833,67 +920,72 @@ def fetch_food_orders(request):
                 has_food_order=True
             )
 
-        all_orders = []
-        for booking in user_bookings:
-            with connections['SystemInteg'].cursor() as cursor:
+        user_bookings = {booking.id: booking for booking in user_bookings.select_related('room', 'area')}
+        if not user_bookings:
+            return Response({"data": []}, status=status.HTTP_200_OK)
+
+        # One query for every order of these bookings, one for every item of those orders
+        with connections['SystemInteg'].cursor() as cursor:
+            booking_placeholders = ', '.join(['%s'] * len(user_bookings))
+            cursor.execute(
+                f"SELECT * FROM orders WHERE booking_id IN ({booking_placeholders}) ORDER BY ordered_at DESC",
+                list(user_bookings)
+            )
+            columns = [col[0] for col in cursor.description]
+            orders = [dict(zip(columns, order_row)) for order_row in cursor.fetchall()]
+
+            item_rows = []
+            if orders:
+                order_placeholders = ', '.join(['%s'] * len(orders))
                 cursor.execute(
-                    "SELECT * FROM orders WHERE booking_id = %s ORDER BY ordered_at DESC",
-                    [booking.id]
+                    f"""
+                    SELECT oi.order_item_id, oi.order_id, oi.item_id, oi.quantity, 
+                            i.item_name AS name, i.price, MD5(i.image) AS image_hash, c.category_id, c.category_name
+                            FROM order_items oi
+                            JOIN items i ON oi.item_id = i.item_id
+                            LEFT JOIN categories c ON i.category_id = c.category_id
+                            WHERE oi.order_id IN ({order_placeholders})
+                            ORDER BY oi.order_item_id
+                    """,
+                    [order['order_id'] for order in orders]
                 )
-                order_rows = cursor.fetchall()
-                columns = [col[0] for col in cursor.description]
-                for order_row in order_rows:
-                    order = dict(zip(columns, order_row))
+                item_rows = cursor.fetchall()
 
-                    cursor.execute(
-                        """
-                        SELECT oi.order_item_id, oi.order_id, oi.item_id, oi.quantity, 
-                                i.item_name AS name, i.price, i.image, c.category_id, c.category_name
-                                FROM order_items oi
-                                JOIN items i ON oi.item_id = i.item_id
-                                LEFT JOIN categories c ON i.category_id = c.category_id
-                                WHERE oi.order_id = %s
-                        """,
-                        [order['order_id']]
-                    )
-                    item_rows = cursor.fetchall()
-                    
-                    items = []
-                    for item_row in item_rows:
-                        image_base64 = ""
-                        image_mime = "image/jpeg"
-                        if item_row[6]:
-                            image_type = imghdr.what(None, h=item_row[6])
-                            if image_type:
-                                image_mime = f"image/{image_type}"
-                            image_base64 = base64.b64encode(item_row[6]).decode('utf-8')
-                        
-                        items.append({
-                            "order_item_id": item_row[0],
-                            "order_id": item_row[1], 
-                            "item_id": item_row[2],
-                            "quantity": item_row[3],
-                            "name": item_row[4],
-                            "price": float(item_row[5]),
-                            "image": image_base64,
-                            "image_mime": image_mime,
-                            "category_id": item_row[7] if item_row[7] else None,
-                            "category_name": item_row[8] if item_row[8] else ""
-                        })                    
-                    order['items'] = items
-                    order['booking_info'] = {
-                        'id': booking.id,
-                        'room_name': booking.room.room_name if booking.room else None,
-                        'area_name': booking.area.area_name if booking.area else None,
-                        'check_in_date': booking.check_in_date,
-                        'check_out_date': booking.check_out_date,
-                        'is_venue_booking': booking.is_venue_booking
-                    }
-                    order['id'] = order['order_id']
-                    order['total_amount'] = float(order['total_amount'])
-                    order['created_at'] = order['ordered_at']
-                    order['updated_at'] = order.get('updated_at', order['ordered_at'])
-                    all_orders.append(order)
+        items_by_order = {}
+        for item_row in item_rows:
+            items_by_order.setdefault(item_row[1], []).append({
+                "order_item_id": item_row[0],
+                "order_id": item_row[1], 
+                "item_id": item_row[2],
+                "quantity": item_row[3],
+                "name": item_row[4],
+                "price": float(item_row[5]),
+                "image": food_image_url(request, item_row[2], item_row[6], 'thumb'),
+                "category_id": item_row[7] if item_row[7] else None,
+                "category_name": item_row[8] if item_row[8] else ""
+            })
+
+        orders_by_booking = {}
+        for order in orders:
+            orders_by_booking.setdefault(order['booking_id'], []).append(order)
+
+        all_orders = []
+        for booking in user_bookings.values():
+            for order in orders_by_booking.get(booking.id, []):
+                order['items'] = items_by_order.get(order['order_id'], [])
+                order['booking_info'] = {
+                    'id': booking.id,
+                    'room_name': booking.room.room_name if booking.room else None,
+                    'area_name': booking.area.area_name if booking.area else None,
+                    'check_in_date': booking.check_in_date,
+                    'check_out_date': booking.check_out_date,
+                    'is_venue_booking': booking.is_venue_booking
+                }
+                order['id'] = order['order_id']
+                order['total_amount'] = float(order['total_amount'])
+                order['created_at'] = order['ordered_at']
+                order['updated_at'] = order.get('updated_at', order['ordered_at'])
+                all_orders.append(order)
         return Response({
             "data": all_orders,
         }, status=status.HTTP_200_OK)
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import random
+import sqlite3
+import string
+import threading
+import time
+import weakref
+from collections import Counter
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+from django.core.serializers.json import DjangoJSONEncoder
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_messages (
+    id INTEGER PRIMARY KEY,
+    channel TEXT NOT NULL,
+    expires REAL NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channel_messages_channel_idx ON channel_messages (channel, id);
+CREATE TABLE IF NOT EXISTS channel_groups (
+    group_name TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (group_name, channel)
+);
+"""
+
+class _LoopReceiver:
+    """Per event loop buffers for this process's specific channels and their poller."""
+
+    def __init__(self):
+        self.buffers = {}
+        self.receiving = Counter()
+        self.waiting = 0
+        self.poller = None
+        self.next_prune = 0
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    """
+    Channel layer shared by every process on one host through a SQLite database in
+    WAL mode, so a group_send from any Daphne worker, management command or Django
+    view reaches websocket consumers in every other worker.
+
+    Messages are rows keyed by channel; groups are (group, channel) rows, and a
+    group_send is one INSERT ... SELECT over the group's members. Each process reads
+    its own specific channels (``specific.<process>!<id>``, which is what consumers
+    get) with a single poller per event loop that drains them in one query and
+    hands the messages to the waiting receive() calls; it polls every
+    ``poll_interval`` seconds while busy and backs off to ``max_poll_interval``
+    while idle. Database work runs in the default executor so the event loop never
+    waits on a SQLite lock. Messages must be JSON serializable.
+    """
+    extensions = ["groups", "flush"]
+
+    def __init__(
+        self,
+        path,
+        expiry=60,
+        group_expiry=86400,
+        capacity=100,
+        channel_capacity=None,
+        poll_interval=0.005,
+        max_poll_interval=0.05,
+        **kwargs
+    ):
+        super().__init__(
+            expiry=expiry,
+            capacity=capacity,
+            channel_capacity=channel_capacity,
+            **kwargs
+        )
+        self.channel_capacity = self.compile_capacities(self.channel_capacity)
+        self.path = str(path)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.client_prefix = "".join(random.choice(string.ascii_letters) for i in range(12))
+        self._local = threading.local()
+        self._receivers = weakref.WeakKeyDictionary()
+        self._next_cleanup = 0
+
+    # SQLite access, always from an executor thread
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    def _serialize(self, message):
+        return json.dumps(message, cls=DjangoJSONEncoder)
+
+    def _insert(self, channel, body, capacity):
+        cursor = self._connection().execute(
+            """INSERT INTO channel_messages (channel, expires, body)
+               SELECT ?, ?, ? WHERE (SELECT COUNT(*) FROM channel_messages WHERE channel = ?) < ?""",
+            [channel, time.time() + self.expiry, body, channel, capacity]
+        )
+        return cursor.rowcount == 1
+
+    def _insert_group(self, group, body):
+        now = time.time()
+        self._connection().execute(
+            """INSERT INTO channel_messages (channel, expires, body)
+               SELECT g.channel, ?, ? FROM channel_groups g
+               WHERE g.group_name = ? AND g.expires > ?
+               AND (SELECT COUNT(*) FROM channel_messages m WHERE m.channel = g.channel) < ?""",
+            [now + self.expiry, body, group, now, self.capacity]
+        )
+
+    def _pop(self, channel):
+        """The oldest unexpired message on a general channel, or None."""
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT id, expires, body FROM channel_messages WHERE channel = ? ORDER BY id LIMIT 1",
+                [channel]
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute("DELETE FROM channel_messages WHERE id = ?", [row[0]])
+        return row[2] if row[1] > time.time() else None
+
+    def _pop_local(self, limit=500):
+        """Drain the messages waiting on this process's specific channels, oldest first."""
+        prefix = f"specific.{self.client_prefix}!"
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                """SELECT id, channel, expires, body FROM channel_messages
+                   WHERE channel >= ? AND channel < ? ORDER BY id LIMIT ?""",
+                [prefix, prefix + '\x7f', limit]
+            ).fetchall()
+            if rows:
+                connection.execute(
+                    "DELETE FROM channel_messages WHERE channel >= ? AND channel < ? AND id <= ?",
+                    [prefix, prefix + '\x7f', rows[-1][0]]
+                )
+        now = time.time()
+        return [(channel, expires, body) for _, channel, expires, body in rows if expires > now]
+
+    def _clean_expired(self):
+        now = time.time()
+        connection = self._connection()
+        connection.execute("DELETE FROM channel_messages WHERE expires < ?", [now])
+        connection.execute("DELETE FROM channel_groups WHERE expires < ?", [now])
+
+    def _maybe_clean_expired(self):
+        if time.time() >= self._next_cleanup:
+            self._next_cleanup = time.time() + min(self.expiry, 10)
+            self._clean_expired()
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        """
+        Send a message onto a (general or specific) channel.
+        """
+        assert isinstance(message, dict), "message is not a dict"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        assert "__asgi_channel__" not in message
+
+        if not await self._run(self._insert, channel, self._serialize(message), self.get_capacity(channel)):
+            raise ChannelFull(channel)
+
+    async def receive(self, channel):
+        """
+        Receive the first message that arrives on the channel.
+        """
+        assert self.valid_channel_name(channel)
+        if not channel.startswith(f"specific.{self.client_prefix}!"):
+            interval = self.poll_interval
+            while True:
+                body = await self._run(self._pop, channel)
+                if body is not None:
+                    return json.loads(body)
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, self.max_poll_interval)
+
+        state = self._receivers.setdefault(asyncio.get_running_loop(), _LoopReceiver())
+        queue = state.buffers.setdefault(channel, asyncio.Queue())
+        state.waiting += 1
+        state.receiving[channel] += 1
+        try:
+            if state.poller is None or state.poller.done():
+                state.poller = asyncio.ensure_future(self._poll(state))
+            while True:
+                expires, body = await queue.get()
+                if expires > time.time():
+                    return json.loads(body)
+        finally:
+            state.waiting -= 1
+            state.receiving[channel] -= 1
+            if not state.receiving[channel]:
+                del state.receiving[channel]
+            if queue.empty() and state.buffers.get(channel) is queue:
+                del state.buffers[channel]
+
+    def _prune_buffers(self, state):
+        """
+        Drop expired messages buffered for channels nobody is receiving on, such as
+        those of consumers that disconnected, and the buffers left empty.
+        """
+        now = time.time()
+        for channel, queue in list(state.buffers.items()):
+            if state.receiving[channel]:
+                continue
+            kept = [item for item in (queue.get_nowait() for _ in range(queue.qsize())) if item[0] > now]
+            if kept:
+                for item in kept:
+                    queue.put_nowait(item)
+            else:
+                del state.buffers[channel]
+
+    async def _poll(self, state):
+        interval = self.poll_interval
+        while state.waiting:
+            if time.time() >= state.next_prune:
+                state.next_prune = time.time() + min(self.expiry, 10)
+                self._prune_buffers(state)
+            messages = await self._run(self._pop_local)
+            if messages:
+                for channel, expires, body in messages:
+                    queue = state.buffers.setdefault(channel, asyncio.Queue())
+                    if queue.qsize() < self.get_capacity(channel):
+                        queue.put_nowait((expires, body))
+                interval = self.poll_interval
+                continue
+            await self._run(self._maybe_clean_expired)
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    async def new_channel(self, prefix="specific"):
+        """
+        Returns a new channel name that can be used by something in our
+        process as a specific channel.
+        """
+        return "%s.%s!%s" % (
+            prefix,
+            self.client_prefix,
+            "".join(random.choice(string.ascii_letters) for i in range(12)),
+        )
+
+    # Flush extension
+
+    async def flush(self):
+        def flush():
+            connection = self._connection()
+            connection.execute("DELETE FROM channel_messages")
+            connection.execute("DELETE FROM channel_groups")
+        await self._run(flush)
+        self._receivers = weakref.WeakKeyDictionary()
+
+    async def close(self):
+        # Executor threads keep their connection until the process exits
+        pass
+
+    # Groups extension
+
+    async def group_add(self, group, channel):
+        """
+        Adds the channel name to a group.
+        """
+        assert self.valid_group_name(group), "Group name not valid"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+
+        def add():
+            self._connection().execute(
+                "INSERT OR REPLACE INTO channel_groups (group_name, channel, expires) VALUES (?, ?, ?)",
+                [group, channel, time.time() + self.group_expiry]
+            )
+        await self._run(add)
+
+    async def group_discard(self, group, channel):
+        assert self.valid_channel_name(channel), "Invalid channel name"
+        assert self.valid_group_name(group), "Invalid group name"
+
+        def discard():
+            self._connection().execute(
+                "DELETE FROM channel_groups WHERE group_name = ? AND channel = ?",
+                [group, channel]
+            )
+        await self._run(discard)
+
+    async def group_send(self, group, message):
+        """
+        Send a message to every channel in the group; channels that are at capacity
+        miss it, as with the other channel layers.
+        """
+        assert isinstance(message, dict), "Message is not a dict"
+        assert self.valid_group_name(group), "Invalid group name"
+        await self._run(self._insert_group, group, self._serialize(message))
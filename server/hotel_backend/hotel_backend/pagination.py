@@ -0,0 +1,68 @@
+import base64
+import hashlib
+from datetime import datetime
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+def _config():
+    config = getattr(settings, 'CURSOR_PAGINATION', {})
+    return config.get('MAX_PAGE_SIZE', 100), config.get('COUNT_CACHE_SECONDS', 60)
+
+def encode_cursor(value, pk):
+    return base64.urlsafe_b64encode(f"{value.isoformat()}|{pk}".encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Return the (datetime, id) a cursor points after. Raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        value, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(value), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+def cached_count(queryset):
+    """COUNT(*) of a queryset, cached for COUNT_CACHE_SECONDS under a key derived from its SQL."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = 'cursor_count:' + hashlib.md5(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, _config()[1])
+    return count
+
+def paginate_by_cursor(queryset, query_params, default_page_size, field='created_at', descending=True):
+    """
+    Keyset pagination over (``field``, id). Reads ``cursor`` (empty for the first page),
+    ``page_size`` and ``include_total`` from the query parameters and returns the rows
+    of the page plus its pagination metadata. Each page is a single indexed range scan
+    no matter how deep it is; the total is only counted (and cached) when asked for.
+    """
+    max_page_size, _ = _config()
+    page_size = int(query_params.get('page_size') or default_page_size)
+    if page_size <= 0:
+        raise ValueError("page_size must be a positive integer")
+    page_size = min(page_size, max_page_size)
+
+    rows = queryset
+    cursor = query_params.get('cursor')
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        if descending:
+            rows = rows.filter(Q(**{f"{field}__lt": value}) | Q(**{field: value, 'id__lt': pk}))
+        else:
+            rows = rows.filter(Q(**{f"{field}__gt": value}) | Q(**{field: value, 'id__gt': pk}))
+
+    ordering = [f"-{field}", '-id'] if descending else [field, 'id']
+    rows = list(rows.order_by(*ordering)[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    pagination = {
+        "next_cursor": encode_cursor(getattr(rows[-1], field), rows[-1].pk) if has_more else None,
+        "has_more": has_more,
+        "page_size": page_size,
+    }
+    if query_params.get('include_total', '').lower() in ('1', 'true', 'yes'):
+        pagination["total_items"] = cached_count(queryset)
+    return rows, pagination
@@ -0,0 +1,46 @@
+import re
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stock renderer
+    orjson = None
+
+# Floats the stdlib writes in exponent form (abs >= 1e16 or < 1e-4) come out differently
+# from orjson ("1e16" vs "1e+16", "0.00001" vs "1e-05"). A number token directly follows
+# one of these delimiters in compact output, so a match can only be a false positive
+# inside a string, which just costs a fallback.
+_EXPONENT_FLOAT = re.compile(rb'[:,\[]-?(?:0\.0000|[0-9][0-9.]*e)')
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Output matches the stock renderer byte for byte for the compact, unicode settings
+    this project uses: dates, times and datetimes, decimals and lazy strings are handed
+    to DRF's own JSONEncoder. Anything orjson cannot encode the same way (indented
+    output, oversized integers, exponent-form floats) goes through the stock path.
+    NaN and infinity render as null instead of raising.
+    """
+    _encoder = encoders.JSONEncoder()
+
+    def _default(self, obj):
+        return self._encoder.default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self._default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if _EXPONENT_FLOAT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
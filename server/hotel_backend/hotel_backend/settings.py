@@ -89,6 +89,7 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
     'connection',
     'upgrade',
     'sec-websocket-extensions',
@@ -122,7 +123,11 @@ TEMPLATES = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'user_roles.authentication.CookieJWTAuthentication',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'hotel_backend.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -138,9 +143,13 @@ PASSWORD_HASHERS = [
 WSGI_APPLICATION = 'hotel_backend.wsgi.application'
 ASGI_APPLICATION = 'hotel_backend.asgi.application'
 
+# Shared by every Daphne worker on this host through one SQLite file
 CHANNEL_LAYERS = {
     'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        'BACKEND': 'hotel_backend.channel_layers.SQLiteChannelLayer',
+        'CONFIG': {
+            'path': os.getenv('CHANNEL_LAYER_PATH', str(BASE_DIR / 'channel_layer.sqlite3')),
+        },
     },
 }
 
@@ -157,12 +166,20 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT'),
     },
     'SystemInteg': {
-        "ENGINE": "django.db.backends.mysql",
+        "ENGINE": "booking.craveon_backend",
         "NAME": os.getenv('CRAVEON_DB_NAME'),
         "USER": os.getenv('CRAVEON_DB_USER'),
         "PASSWORD": os.getenv('CRAVEON_DB_PASSWORD'),
         "HOST": os.getenv('CRAVEON_DB_HOST'),
         "PORT": os.getenv('CRAVEON_DB_PORT'),
+        # Keep one connection per worker thread and ping it before reuse
+        "CONN_MAX_AGE": int(os.getenv('CRAVEON_DB_CONN_MAX_AGE', 300)),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "connect_timeout": int(os.getenv('CRAVEON_DB_CONNECT_TIMEOUT', 3)),
+            "read_timeout": int(os.getenv('CRAVEON_DB_READ_TIMEOUT', 10)),
+            "write_timeout": int(os.getenv('CRAVEON_DB_WRITE_TIMEOUT', 10)),
+        },
     }
 }
 
@@ -255,4 +272,63 @@ CACHES = {
 
 CACHE_MIDDLEWARE_ALIAS = 'default'
 CACHE_MIDDLEWARE_SECONDS = 600
-CACHE_MIDDLEWARE_KEY_PREFIX = 'azurea'
\ No newline at end of file
+CACHE_MIDDLEWARE_KEY_PREFIX = 'azurea'
+
+# In-memory availability index (booking.availability)
+AVAILABILITY_INDEX = {
+    'SYNC_SECONDS': 5,
+    'REBUILD_SECONDS': 600,
+    'SYNC_OVERLAP_SECONDS': 60,
+}
+
+# Lifetime of the cached admin dashboard_stats snapshot; booking/transaction writes expire it sooner
+DASHBOARD_STATS_CACHE_SECONDS = 30
+
+# In-process per-status booking counter behind an unfiltered booking_status_counts
+BOOKING_STATUS_COUNTER = {
+    'ENABLED': True,
+    'REBUILD_SECONDS': 10,
+}
+
+# Keyset (?cursor=) pagination on list endpoints (hotel_backend.pagination)
+CURSOR_PAGINATION = {
+    'MAX_PAGE_SIZE': 100,
+    'COUNT_CACHE_SECONDS': 60,
+}
+
+# Lifetime of the cached room/area catalog snapshot (property.catalog); room, area, image and amenity writes expire it sooner
+CATALOG_SNAPSHOT_CACHE_SECONDS = 60
+
+# Resized CraveOn food image derivatives served by booking.views.fetch_food_image (booking.food_images)
+FOOD_IMAGE_CACHE = {
+    'MAX_BYTES': 64 * 1024 * 1024,
+    'SIZES': {'thumb': 320, 'full': 1280},
+    'MAX_AGE': 60 * 60 * 24 * 365,
+}
+
+# Circuit breaker around the SystemInteg (CraveOn) database (booking.craveon_health)
+CRAVEON_CIRCUIT_BREAKER = {
+    'FAILURE_THRESHOLD': 5,
+    'RESET_SECONDS': 30,
+    'MENU_CACHE_SECONDS': 60 * 60 * 24,
+}
+
+# Food order outbox drained into CraveOn by the process_food_order_outbox worker (booking.food_order_outbox)
+FOOD_ORDER_OUTBOX = {
+    'MAX_ATTEMPTS': 8,
+    'RETRY_BASE_SECONDS': 5,
+    'RETRY_MAX_SECONDS': 15 * 60,
+    'LEASE_SECONDS': 2 * 60,
+    'POLL_SECONDS': 2,
+}
+
+# Window in which Bookings saves are coalesced into one admin active-count broadcast (admin_dashboard.broadcasts)
+ACTIVE_COUNT_BROADCAST_SECONDS = 0.25
+
+# Row-level booking deltas pushed to the admin websocket (admin_dashboard.broadcasts); screens resume from a sequence number
+BOOKING_CHANGE_STREAM = {
+    'WINDOW_SECONDS': 0.1,
+    'REPLAY_LIMIT': 500,
+    'RETENTION_HOURS': 24,
+    'RESUME_LOOKBACK_SECONDS': 30,
+}
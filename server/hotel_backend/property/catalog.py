@@ -0,0 +1,94 @@
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+from rest_framework.response import Response
+from .models import Rooms, Areas
+from .rows import (
+    ROOM_VALUES, AREA_VALUES, room_row, area_row, is_senior,
+    room_images_by_room, area_images_by_area, amenities_by_room,
+)
+
+VERSION_KEY = 'catalog:version'
+
+def _snapshot_ttl():
+    return getattr(settings, 'CATALOG_SNAPSHOT_CACHE_SECONDS', 60)
+
+def _version():
+    return cache.get_or_set(VERSION_KEY, 1, None)
+
+def invalidate_catalog():
+    """Drop the cached catalog snapshot by moving to a new version."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+def build_catalog():
+    """
+    Every room and area as RoomSerializer/AreaSerializer rows, both as seen by a
+    regular guest and by a senior/PWD guest, plus a digest of the whole content
+    that the ETags are derived from.
+    """
+    rooms = list(Rooms.objects.order_by('id').values(*ROOM_VALUES))
+    areas = list(Areas.objects.order_by('id').values(*AREA_VALUES))
+    room_ids = [row['id'] for row in rooms]
+    room_images = room_images_by_room(room_ids)
+    amenities = amenities_by_room(room_ids)
+    area_images = area_images_by_area([row['id'] for row in areas])
+
+    catalog = {
+        'rooms': {
+            row['id']: tuple(room_row(row, room_images[row['id']], amenities[row['id']], senior) for senior in (False, True))
+            for row in rooms
+        },
+        'areas': {
+            row['id']: tuple(area_row(row, area_images[row['id']], senior) for senior in (False, True))
+            for row in areas
+        },
+    }
+    content = json.dumps([list(catalog['rooms'].items()), list(catalog['areas'].items())], sort_keys=True)
+    catalog['digest'] = hashlib.sha1(content.encode()).hexdigest()
+    return catalog
+
+def catalog_snapshot():
+    """The current catalog, rebuilt only after a room, area, image or amenity change."""
+    key = f"catalog:{_version()}"
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = build_catalog()
+        cache.set(key, catalog, _snapshot_ttl())
+    return catalog
+
+def catalog_row(catalog, kind, unit_id, user=None):
+    """One room or area row by id (None when it does not exist)."""
+    variants = catalog[kind].get(int(unit_id))
+    return variants[is_senior(user)] if variants else None
+
+def available_rows(catalog, kind, user=None, exclude=()):
+    """Rows of the available rooms or areas, skipping the ids in ``exclude``."""
+    senior = is_senior(user)
+    return [
+        variants[senior] for unit_id, variants in catalog[kind].items()
+        if variants[0]['status'] == 'available' and unit_id not in exclude
+    ]
+
+def catalog_etag(catalog, *parts):
+    """Strong ETag for a response fully determined by the catalog content and ``parts``."""
+    key = ':'.join([catalog['digest'], *map(str, parts)])
+    return f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+def catalog_response(request, etag, payload):
+    """
+    304 when the client's If-None-Match already has ``etag``, otherwise a 200 with
+    ``payload()``. The payload is only built when it has to be sent.
+    """
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+    response = Response(payload(), status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    return response
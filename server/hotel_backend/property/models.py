@@ -8,7 +8,28 @@ class Amenities(models.Model):
     class Meta:
         db_table = 'amenities'
 
-class Rooms(models.Model):
+class RatingSummary(models.Model):
+    """Running totals of the guest reviews of a room or area, kept by booking.ratings."""
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else 0
+
+    @property
+    def rating_histogram(self):
+        return {star: getattr(self, f"rating_{star}_count") for star in range(1, 6)}
+
+class Rooms(RatingSummary):
     ROOM_STATUS_CHOICES = [
         ('available', 'Available'),
         ('maintenance', 'Maintenance'),
@@ -56,7 +77,7 @@ class RoomImages(models.Model):
     class Meta:
         db_table = 'room_images'
 
-class Areas(models.Model):
+class Areas(RatingSummary):
     AREA_STATUS_CHOICES = [
         ('available', 'Available'),
         ('maintenance', 'Maintenance'),
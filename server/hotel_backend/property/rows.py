@@ -0,0 +1,121 @@
+from collections import defaultdict
+from .models import Rooms, Areas, RoomImages, AreaImages
+from .serializers import price_breakdown
+
+# Plain-dict builders producing exactly what RoomSerializer and AreaSerializer return,
+# from a handful of values() queries instead of one serializer instance per row.
+
+ROOM_VALUES = (
+    'id', 'room_name', 'room_type', 'bed_type', 'status', 'room_price',
+    'discount_percent', 'description', 'max_guests', 'rating_sum', 'rating_count',
+)
+AREA_VALUES = (
+    'id', 'area_name', 'description', 'status', 'capacity', 'price_per_hour',
+    'discount_percent', 'rating_sum', 'rating_count',
+)
+
+def _peso(value):
+    return f"₱{value:,.2f}"
+
+def is_senior(user):
+    return bool(user and getattr(user, 'is_senior_or_pwd', False))
+
+def _average_rating(values):
+    return values['rating_sum'] / values['rating_count'] if values['rating_count'] else 0
+
+def _image_url(image):
+    return image.url if image else None
+
+def room_row(values, images, amenities, senior=False):
+    """One RoomSerializer-shaped dict from room values, its images and its amenities."""
+    price = float(values['room_price'])
+    pricing = price_breakdown(price, values['discount_percent'], senior)
+    return {
+        'id': values['id'],
+        'room_name': values['room_name'],
+        'room_type': values['room_type'],
+        'images': images,
+        'bed_type': values['bed_type'],
+        'status': values['status'],
+        'room_price': _peso(price),
+        'discount_percent': pricing['discount_percent'],
+        'discounted_price': pricing['discounted_price'],
+        'senior_discounted_price': pricing['senior_discounted_price'],
+        'description': values['description'],
+        'max_guests': values['max_guests'],
+        'amenities': amenities,
+        'average_rating': _average_rating(values),
+        'price_per_night': price,
+        'discounted_price_numeric': pricing['discounted_price_numeric'],
+    }
+
+def area_row(values, images, senior=False):
+    """One AreaSerializer-shaped dict from area values and its images."""
+    price = float(values['price_per_hour'])
+    pricing = price_breakdown(price, values['discount_percent'], senior)
+    return {
+        'id': values['id'],
+        'area_name': values['area_name'],
+        'description': values['description'],
+        'images': images,
+        'status': values['status'],
+        'capacity': values['capacity'],
+        'price_per_hour': _peso(price),
+        'discounted_price': pricing['discounted_price'],
+        'discount_percent': pricing['discount_percent'],
+        'senior_discounted_price': pricing['senior_discounted_price'],
+        'average_rating': _average_rating(values),
+        'price_per_hour_numeric': price,
+        'discounted_price_numeric': pricing['discounted_price_numeric'],
+    }
+
+def room_images_by_room(room_ids):
+    images = defaultdict(list)
+    for room_id, image_id, image in RoomImages.objects.filter(
+        room_id__in=room_ids
+    ).order_by('room_id', 'id').values_list('room_id', 'id', 'room_image'):
+        images[room_id].append({'id': image_id, 'room_image': _image_url(image)})
+    return images
+
+def area_images_by_area(area_ids):
+    images = defaultdict(list)
+    for area_id, image_id, image in AreaImages.objects.filter(
+        area_id__in=area_ids
+    ).order_by('area_id', 'id').values_list('area_id', 'id', 'area_image'):
+        images[area_id].append({'id': image_id, 'area_image': _image_url(image)})
+    return images
+
+def amenities_by_room(room_ids):
+    amenities = defaultdict(list)
+    for room_id, amenity_id, description in Rooms.amenities.through.objects.filter(
+        rooms_id__in=room_ids
+    ).order_by('rooms_id', 'amenities_id').values_list('rooms_id', 'amenities_id', 'amenities__description'):
+        amenities[room_id].append({'id': amenity_id, 'description': description})
+    return amenities
+
+def room_rows(rooms, user=None):
+    """RoomSerializer(rooms, many=True).data for a Rooms queryset, in three queries."""
+    values = list(rooms.values(*ROOM_VALUES))
+    room_ids = [row['id'] for row in values]
+    images = room_images_by_room(room_ids)
+    amenities = amenities_by_room(room_ids)
+    return [room_row(row, images[row['id']], amenities[row['id']], is_senior(user)) for row in values]
+
+def area_rows(areas, user=None):
+    """AreaSerializer(areas, many=True).data for an Areas queryset, in two queries."""
+    values = list(areas.values(*AREA_VALUES))
+    images = area_images_by_area([row['id'] for row in values])
+    return [area_row(row, images[row['id']], is_senior(user)) for row in values]
+
+def room_row_from_instance(room, user=None):
+    """RoomSerializer(room).data for a loaded room, using its prefetched images and amenities."""
+    values = {field: getattr(room, field) for field in ROOM_VALUES}
+    images = [{'id': image.id, 'room_image': _image_url(image.room_image)} for image in room.images.all()]
+    amenities = [{'id': amenity.id, 'description': amenity.description} for amenity in room.amenities.all()]
+    return room_row(values, images, amenities, is_senior(user))
+
+def area_row_from_instance(area, user=None):
+    """AreaSerializer(area).data for a loaded area, using its prefetched images."""
+    values = {field: getattr(area, field) for field in AREA_VALUES}
+    images = [{'id': image.id, 'area_image': _image_url(image.area_image)} for image in area.images.all()]
+    return area_row(values, images, is_senior(user))
@@ -1,7 +1,27 @@
 from rest_framework import serializers
-from django.db.models import Avg
 from .models import Amenities, Rooms, Areas, RoomImages, AreaImages
 
+# PWD/senior discount in the prices shown to guests and charged when they book
+PWD_SENIOR_DISCOUNT_PERCENT = 20
+
+def senior_discounted_price(price):
+    return price * (100 - PWD_SENIOR_DISCOUNT_PERCENT) / 100
+
+def price_breakdown(price, discount_percent, senior):
+    """
+    The discount fields of a serialized room or area priced at ``price``: the better
+    of its own discount and the PWD/senior one. Shared by RoomSerializer, AreaSerializer
+    and property.rows so both produce the same figures.
+    """
+    best_discount = max(int(discount_percent or 0), PWD_SENIOR_DISCOUNT_PERCENT if senior else 0)
+    discounted = price * (100 - best_discount) / 100 if best_discount > 0 else None
+    return {
+        'discount_percent': best_discount,
+        'discounted_price': f"₱{discounted:,.2f}" if discounted is not None else None,
+        'discounted_price_numeric': discounted,
+        'senior_discounted_price': senior_discounted_price(price),
+    }
+
 class AmenitySerializer(serializers.ModelSerializer):
     class Meta:
         model = Amenities
@@ -57,26 +77,16 @@ class RoomSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         request = self.context.get('request', None)
         user = getattr(request, 'user', None)
-        admin_discount = int(instance.discount_percent or 0)
-        senior_discount = 20 if user and getattr(user, 'is_senior_or_pwd', False) else 0
-        best_discount = max(admin_discount, senior_discount)
+        senior = bool(user and getattr(user, 'is_senior_or_pwd', False))
         
         if instance.room_price is not None:
             representation['room_price'] = f"₱{float(instance.room_price):,.2f}"
             representation['price_per_night'] = float(instance.room_price)  # Add numeric field for frontend calculations
-            if best_discount > 0:
-                discounted = float(instance.room_price) * (100 - best_discount) / 100
-                representation['discounted_price'] = f"₱{discounted:,.2f}"
-                representation['discounted_price_numeric'] = discounted  # Add numeric field
-                representation['discount_percent'] = best_discount
-            else:
-                representation['discounted_price'] = None
-                representation['discounted_price_numeric'] = None
-                representation['discount_percent'] = 0
+            representation.update(price_breakdown(float(instance.room_price), instance.discount_percent, senior))
         return representation
 
     def get_average_rating(self, obj):
-        return obj.reviews.aggregate(Avg('rating'))['rating__avg'] or 0
+        return obj.average_rating
 
     def get_discounted_price(self, obj):
         try:
@@ -91,10 +101,7 @@ class RoomSerializer(serializers.ModelSerializer):
     
     def get_senior_discounted_price(self, obj):
         try:
-            price = float(obj.room_price)
-            senior_discount = 20
-            discounted = price * (100 - senior_discount) / 100
-            return discounted  # Return numeric value instead of formatted string
+            return senior_discounted_price(float(obj.room_price))  # Return numeric value instead of formatted string
         except Exception:
             return None
 
@@ -124,26 +131,16 @@ class AreaSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         request = self.context.get('request', None)
         user = getattr(request, 'user', None)
-        admin_discount = int(instance.discount_percent or 0)
-        senior_discount = 20 if user and getattr(user, 'is_senior_or_pwd', False) else 0
-        best_discount = max(admin_discount, senior_discount)
+        senior = bool(user and getattr(user, 'is_senior_or_pwd', False))
         
         if instance.price_per_hour is not None:
             representation['price_per_hour'] = f"₱{float(instance.price_per_hour):,.2f}"
             representation['price_per_hour_numeric'] = float(instance.price_per_hour)  # Add numeric field
-            if best_discount > 0:
-                discounted = float(instance.price_per_hour) * (100 - best_discount) / 100
-                representation['discounted_price'] = f"₱{discounted:,.2f}"
-                representation['discounted_price_numeric'] = discounted  # Add numeric field
-                representation['discount_percent'] = best_discount
-            else:
-                representation['discounted_price'] = None
-                representation['discounted_price_numeric'] = None
-                representation['discount_percent'] = 0
+            representation.update(price_breakdown(float(instance.price_per_hour), instance.discount_percent, senior))
         return representation
 
     def get_average_rating(self, obj):
-        return obj.reviews.aggregate(Avg('rating'))['rating__avg'] or 0
+        return obj.average_rating
     
     def get_discounted_price(self, obj):
         try:
@@ -158,9 +155,6 @@ class AreaSerializer(serializers.ModelSerializer):
 
     def get_senior_discounted_price(self, obj):
         try:
-            price = float(obj.price_per_hour)
-            senior_discount = 20
-            discounted = price * (100 - senior_discount) / 100
-            return discounted  # Return numeric value instead of formatted string
+            return senior_discounted_price(float(obj.price_per_hour))  # Return numeric value instead of formatted string
         except Exception:
             return None
\ No newline at end of file
@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Rooms, Areas, RoomImages, AreaImages, Amenities
+from .catalog import invalidate_catalog
+
+@receiver(post_save, sender=Rooms)
+@receiver(post_delete, sender=Rooms)
+@receiver(post_save, sender=Areas)
+@receiver(post_delete, sender=Areas)
+@receiver(post_save, sender=RoomImages)
+@receiver(post_delete, sender=RoomImages)
+@receiver(post_save, sender=AreaImages)
+@receiver(post_delete, sender=AreaImages)
+@receiver(post_save, sender=Amenities)
+@receiver(post_delete, sender=Amenities)
+@receiver(m2m_changed, sender=Rooms.amenities.through)
+def expire_catalog(sender, **kwargs):
+    transaction.on_commit(invalidate_catalog)
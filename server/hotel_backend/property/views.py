@@ -2,28 +2,30 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from .models import Rooms, Areas, Amenities
-from .serializers import RoomSerializer, AreaSerializer, AmenitySerializer
+from .serializers import AmenitySerializer
+from .catalog import catalog_snapshot, catalog_row, available_rows, catalog_etag, catalog_response
 
 # Create your views here.
 @api_view(['GET'])
 def fetch_rooms(request):
     try:
-        rooms = Rooms.objects.filter(status='available')
-        serializer = RoomSerializer(rooms, many=True)
-        return Response({
-            "data": serializer.data
-        }, status=status.HTTP_200_OK)
+        catalog = catalog_snapshot()
+        return catalog_response(request, catalog_etag(catalog, 'rooms'), lambda: {
+            "data": available_rows(catalog, 'rooms')
+        })
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
 def fetch_room_detail(request, id):
     try:
-        room = Rooms.objects.get(id=id)
-        serializer = RoomSerializer(room)
-        return Response({
-            "data": serializer.data
-        }, status=status.HTTP_200_OK)
+        catalog = catalog_snapshot()
+        room = catalog_row(catalog, 'rooms', id)
+        if room is None:
+            raise Rooms.DoesNotExist("Rooms matching query does not exist.")
+        return catalog_response(request, catalog_etag(catalog, 'room', id), lambda: {
+            "data": room
+        })
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -41,19 +43,20 @@ def fetch_amenities(request):
 @api_view(['GET'])
 def fetch_areas(request):
     try:
-        areas = Areas.objects.filter(status='available')
-        serializer = AreaSerializer(areas, many=True)
-        return Response({
-            "data": serializer.data
-        }, status=status.HTTP_200_OK)
+        catalog = catalog_snapshot()
+        return catalog_response(request, catalog_etag(catalog, 'areas'), lambda: {
+            "data": available_rows(catalog, 'areas')
+        })
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
 def fetch_area_detail(request, id):
     try:
-        area = Areas.objects.get(id=id)
-        serializer = AreaSerializer(area)
-        return Response({"data": serializer.data}, status=status.HTTP_200_OK)
+        catalog = catalog_snapshot()
+        area = catalog_row(catalog, 'areas', id)
+        if area is None:
+            raise Areas.DoesNotExist("Areas matching query does not exist.")
+        return catalog_response(request, catalog_etag(catalog, 'area', id), lambda: {"data": area})
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -1,7 +1,7 @@
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
-from .models import Notification
+from .notification_counts import unread_count, mark_read
 import json
 import logging
 import traceback
@@ -128,9 +128,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_unread_count(self):
-        return Notification.objects.filter(user=self.user, is_read=False).count()
+        return unread_count(self.user.id)
 
     @database_sync_to_async
     def mark_notifications_read(self):
-        Notification.objects.filter(user=self.user, is_read=False).update(is_read=True)
-        return 0
\ No newline at end of file
+        return mark_read(self.user.id)
\ No newline at end of file
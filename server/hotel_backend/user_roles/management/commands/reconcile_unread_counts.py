@@ -0,0 +1,20 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from user_roles.notification_counts import reconcile_unread_counts
+
+class Command(BaseCommand):
+    help = "Correct every guest's stored unread notification count that no longer matches the notifications table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep reconciling instead of exiting after one pass')
+        parser.add_argument('--interval', type=int, default=300, help='Seconds between passes with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            corrected = reconcile_unread_counts()
+            self.stdout.write(self.style.SUCCESS(f"Successfully reconciled unread counts; corrected {corrected} users"))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.2 on 2026-10-17 04:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('booking', '0009_reviews_created_indexes'),
+        ('user_roles', '0003_delete_customer'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customusers',
+            index=models.Index(fields=['role', 'is_archived', 'date_joined'], name='users_role_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'created_at'], name='notifications_user_created_idx'),
+        ),
+    ]
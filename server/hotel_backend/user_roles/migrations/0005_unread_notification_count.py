@@ -0,0 +1,26 @@
+# Generated by Django 5.2.2 on 2026-10-17 05:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+def backfill_unread_notification_counts(apps, schema_editor):
+    CustomUsers = apps.get_model('user_roles', 'CustomUsers')
+    Notification = apps.get_model('user_roles', 'Notification')
+    rows = Notification.objects.filter(is_read=False).values('user').annotate(unread=Count('id')).order_by()
+    for row in rows:
+        CustomUsers.objects.filter(pk=row['user']).update(unread_notification_count=row['unread'])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_roles', '0004_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customusers',
+            name='unread_notification_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_unread_notification_counts, migrations.RunPython.noop),
+    ]
@@ -44,9 +44,14 @@ class CustomUsers(AbstractUser):
     is_verified = models.CharField(max_length=60, null=True, blank=True, choices=VALID_ID_STATUS, default='unverified')
     valid_id_rejection_reason = models.TextField(null=True, blank=True)
     is_senior_or_pwd = models.BooleanField(default=False)
+    # Kept by user_roles.notification_counts
+    unread_notification_count = models.PositiveIntegerField(default=0)
 
     class Meta: 
         db_table = 'users'
+        indexes = [
+            models.Index(fields=['role', 'is_archived', 'date_joined'], name='users_role_joined_idx'),
+        ]
 
 class Notification(models.Model):
     TYPE_CHOICES = [
@@ -68,6 +73,9 @@ class Notification(models.Model):
     
     class Meta:
         db_table = 'notifications'
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='notifications_user_created_idx'),
+        ]
 
 class CraveOnUser(models.Model):
     user_id = models.AutoField(primary_key=True)
@@ -0,0 +1,80 @@
+from django.db import transaction
+from django.db.models import F, Count
+from django.db.models.functions import Greatest
+from .models import CustomUsers, Notification
+
+# Every guest's unread notification count is stored on their user row, so the
+# notification bell, the websocket and the notifications list read one column
+# instead of counting the notifications table. Creation, deletion and marking as
+# read adjust it with a single UPDATE ... SET count = count +/- n in the same
+# transaction as the notifications they change; reconcile_unread_counts repairs any
+# drift left by writes that bypass these helpers.
+
+def adjust_unread_count(user_id, delta):
+    """
+    Add ``delta`` (negative to subtract) to a user's stored unread count. A count that
+    drifted low stops at 0 instead of failing the write; reconcile_unread_counts fixes it.
+    """
+    if delta > 0:
+        count = F('unread_notification_count') + delta
+    elif delta < 0:
+        # max(count, n) - n never goes below 0, so no negative intermediate reaches the
+        # unsigned column (MySQL rejects those even inside GREATEST)
+        count = Greatest(F('unread_notification_count'), -delta) + delta
+    else:
+        return
+    CustomUsers.objects.filter(pk=user_id).update(unread_notification_count=count)
+
+def add_unread_counts(user_counts):
+    """Add to several users' unread counts at once; ``user_counts`` maps user id to the number to add."""
+    users_by_count = {}
+    for user_id, count in user_counts.items():
+        users_by_count.setdefault(count, []).append(user_id)
+    for count, user_ids in users_by_count.items():
+        CustomUsers.objects.filter(pk__in=user_ids).update(
+            unread_notification_count=F('unread_notification_count') + count
+        )
+
+def unread_counts(user_ids):
+    return dict(CustomUsers.objects.filter(pk__in=user_ids).values_list('id', 'unread_notification_count'))
+
+def unread_count(user_id):
+    return CustomUsers.objects.filter(pk=user_id).values_list('unread_notification_count', flat=True).first() or 0
+
+def mark_read(user_id, notification_id=None):
+    """
+    Mark one notification, or all of them, as read for a user and return the new
+    unread count. Only rows that were unread are counted, so repeating a request
+    cannot take the count below the real one.
+    """
+    notifications = Notification.objects.filter(user_id=user_id, is_read=False)
+    if notification_id is not None:
+        notifications = notifications.filter(id=notification_id)
+    with transaction.atomic():
+        adjust_unread_count(user_id, -notifications.update(is_read=True))
+    return unread_count(user_id)
+
+def reconcile_unread_counts():
+    """
+    Compare every stored unread count with the notifications table and correct the
+    ones that drifted; returns how many were corrected. Each correction recounts its
+    user under a lock on the user row, which the increments also take, so a
+    notification created meanwhile is neither lost nor counted twice.
+    """
+    actual = dict(
+        Notification.objects.filter(is_read=False).values('user').annotate(unread=Count('id')).values_list('user', 'unread').order_by()
+    )
+    stored = dict(CustomUsers.objects.filter(unread_notification_count__gt=0).values_list('id', 'unread_notification_count'))
+    drifted = [user_id for user_id in stored.keys() | actual.keys() if stored.get(user_id, 0) != actual.get(user_id, 0)]
+
+    corrected = 0
+    for user_id in drifted:
+        with transaction.atomic():
+            user = CustomUsers.objects.select_for_update().filter(pk=user_id).only('unread_notification_count').first()
+            if user is None:
+                continue
+            count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+            if user.unread_notification_count != count:
+                CustomUsers.objects.filter(pk=user_id).update(unread_notification_count=count)
+                corrected += 1
+    return corrected
@@ -1,23 +1,30 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from .models import Notification
 from .serializers import NotificationSerializer
+from .notification_counts import adjust_unread_count, unread_count
 
 @receiver(post_save, sender=Notification)
 def send_notification(sender, instance, created, **args):
     if created:
+        if not instance.is_read:
+            adjust_unread_count(instance.user_id, 1)
         channel_layer = get_channel_layer()
-        unread_count = Notification.objects.filter(user=instance.user, is_read=False).count()
         
         notification_data = NotificationSerializer(instance).data
         
         async_to_sync(channel_layer.group_send)(
-            f"notifications_{instance.user.id}",
+            f"notifications_{instance.user_id}",
             {
                 "type": "send_notification",
                 "notification": notification_data,
-                "unread_count": unread_count,
+                "unread_count": unread_count(instance.user_id),
             }
-        )
\ No newline at end of file
+        )
+
+@receiver(post_delete, sender=Notification)
+def forget_unread_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread_count(instance.user_id, -1)
@@ -7,14 +7,16 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import CustomUsers, Notification
 from .serializers import CustomUserSerializer, NotificationSerializer
+from .notification_counts import unread_count, mark_read
 from .email.email import send_otp_to_email, send_reset_password
 from django.core.cache import cache
 from .validation.validation import RegistrationForm
 from datetime import timedelta
 from booking.models import Bookings
-from booking.serializers import BookingSerializer
+from booking.serializers import sparse_fieldset_options
+from booking.rows import listing_data
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from property.serializers import AreaSerializer
+from hotel_backend.pagination import paginate_by_cursor
 from .google.oauth import google_auth as google_oauth_util
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
@@ -46,29 +48,34 @@ def save_google_profile_image_to_cloudinary(image_url):
     except Exception as e:
         return None
 
+def build_notification(user, booking, notification_type):
+    """An unsaved notification of ``notification_type`` about ``booking``, or None for an unknown type."""
+    messages = {
+        'reserved': f"Your booking for {booking.property_name} has been confirmed!",
+        'no_show': f"You did not show up for your booking at {booking.property_name}.",
+        'rejected': f"Your booking for {booking.property_name} has been rejected. Click to see booking details.",
+        'checkin_reminder': f"Reminder: You have a booking at {booking.property_name} today. Click to see booking details.",
+        'checked_in': f"You have been checked in to {booking.property_name}. Welcome!",
+        'checked_out': f"You have been checked out from {booking.property_name}. Thank you for staying with us!",
+        'cancelled': f"Your booking for {booking.property_name} has been cancelled. Click to see details."
+    }
+    
+    message = messages.get(notification_type)
+    if not message:
+        return None
+    
+    return Notification(
+        user=user,
+        message=message,
+        notification_type=notification_type,
+        booking=booking
+    )
+
 def create_notification(user, booking, notification_type):
-    try:        
-        messages = {
-            'reserved': f"Your booking for {booking.property_name} has been confirmed!",
-            'no_show': f"You did not show up for your booking at {booking.property_name}.",
-            'rejected': f"Your booking for {booking.property_name} has been rejected. Click to see booking details.",
-            'checkin_reminder': f"Reminder: You have a booking at {booking.property_name} today. Click to see booking details.",
-            'checked_in': f"You have been checked in to {booking.property_name}. Welcome!",
-            'checked_out': f"You have been checked out from {booking.property_name}. Thank you for staying with us!",
-            'cancelled': f"Your booking for {booking.property_name} has been cancelled. Click to see details."
-        }
-        
-        message = messages.get(notification_type)
-        if not message:
-            return None
-            
-        notification = Notification.objects.create(
-            user=user,
-            message=message,
-            notification_type=notification_type,
-            booking=booking
-        )
-        
+    try:
+        notification = build_notification(user, booking, notification_type)
+        if notification:
+            notification.save()
         return notification
     except Exception:
         return None
@@ -102,7 +109,7 @@ def create_booking_notification(user, notification_type, booking_id, message):
                 {
                     "type": "send_notification",
                     "notification": notification_data,
-                    "unread_count": Notification.objects.filter(user=user, is_read=False).count()
+                    "unread_count": unread_count(user.id)
                 }
             )
             
@@ -775,7 +782,11 @@ def update_user_details(request, id):
 def get_guest_bookings(request):
     try:
         user = request.user
-        bookings = Bookings.objects.filter(user=user).exclude(status='cancelled').order_by('-created_at')
+        bookings = Bookings.objects.for_listing().filter(user=user).exclude(status='cancelled').order_by('-created_at')
+        try:
+            fieldset = sparse_fieldset_options(request.query_params)
+        except ValueError as ve:
+            return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
 
         status_filter = request.query_params.get('status', '')
         
@@ -794,23 +805,8 @@ def get_guest_bookings(request):
         except EmptyPage:
             paginated_bookings = paginator.page(paginator.num_pages)
             
-        booking_data = []
-        for booking in paginated_bookings:
-            booking_serializer = BookingSerializer(booking)
-            data = booking_serializer.data
-            
-            if booking.is_venue_booking and booking.area:
-                area_serializer = AreaSerializer(booking.area)
-                data['area_details'] = area_serializer.data
-            elif booking.room:
-                from property.serializers import RoomSerializer
-                room_serializer = RoomSerializer(booking.room)
-                data['room_details'] = room_serializer.data
-            
-            booking_data.append(data)
-        
         return Response({
-            "data": booking_data,
+            "data": listing_data(paginated_bookings, fieldset),
             "pagination": {
                 "total_pages": paginator.num_pages,
                 "current_page": int(page),
@@ -871,12 +867,27 @@ def get_notifications(request):
         offset = int(request.query_params.get('offset', 0))
         
         all_notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
+        
+        if 'cursor' in request.query_params:
+            params = request.query_params.copy()
+            params.setdefault('page_size', limit)
+            try:
+                notifications, pagination = paginate_by_cursor(all_notifications, params, 10)
+            except ValueError as ve:
+                return Response({"error": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = NotificationSerializer(notifications, many=True)
+            return Response({
+                'notifications': serializer.data,
+                'unread_count': unread_count(request.user.id),
+                **pagination
+            }, status=status.HTTP_200_OK)
+        
         notifications = all_notifications[offset:offset + limit]
         
         serializer = NotificationSerializer(notifications, many=True)
         return Response({
             'notifications': serializer.data,
-            'unread_count': all_notifications.filter(is_read=False).count(),
+            'unread_count': unread_count(request.user.id),
             'has_more': all_notifications.count() > (offset + limit)
         }, status=status.HTTP_200_OK)
     except Exception as e:
@@ -888,15 +899,14 @@ def get_notifications(request):
 @permission_classes([IsAuthenticated])
 def mark_notification_read(request, id):
     notification = get_object_or_404(Notification, id=id, user=request.user)
-    notification.is_read = True
-    notification.save()
+    count = mark_read(request.user.id, notification.id)
     
     channel_layer = get_channel_layer()
     async_to_sync(channel_layer.group_send)(
         f"notifications_{request.user.id}",
         {
             'type': 'update_unread_count',
-            'count': Notification.objects.filter(user=request.user, is_read=False).count()
+            'count': count
         }
     )
     
@@ -908,14 +918,14 @@ def mark_notification_read(request, id):
 @permission_classes([IsAuthenticated])
 def mark_all_notifications_read(request):
     try:
-        Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        count = mark_read(request.user.id)
         
         channel_layer = get_channel_layer()
         async_to_sync(channel_layer.group_send)(
             f"notifications_{request.user.id}",
             {
                 'type': 'update_unread_count',
-                'count': 0
+                'count': count
             }
         )
         return Response({